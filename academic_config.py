@@ -92,4 +92,7 @@ LISTA_MESES = [
     "Agosto",
     "Septiembre",
     "Octubre",
-]
\ No newline at end of file
+]
+
+# Promedio mínimo para aprobar una materia
+NOTA_APROBACION = 5.0
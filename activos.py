@@ -0,0 +1,191 @@
+import base64
+import io
+import os
+
+from functools import lru_cache
+
+import streamlit as st
+from PIL import Image
+
+
+# ==========================================
+# IMÁGENES INSTITUCIONALES
+# ==========================================
+#
+# logo.png (1254×1254, 1.6 MB) y sello.png se muestran a 40-80 px
+# de alto. Cada variante se reduce una sola vez por proceso al
+# tamaño en que se usa, se cuantiza a 256 colores (conservando
+# la transparencia) y se guarda en memoria junto con su data URI.
+# La fecha de modificación del archivo forma parte de la llave,
+# así un logo reemplazado se vuelve a procesar.
+#
+# Con server.enableStaticServing (.streamlit/config.toml) las
+# variantes se escriben en static/generado/ y los documentos las
+# enlazan por URL: el navegador las descarga una vez y las valida
+# con ETag, y cada impresión solo transfiere los datos. Sin
+# servicio estático se incrustan como data URI.
+
+LOGO = "logo.png"
+SELLO = "sello.png"
+
+CARPETA_ESTATICA = "static"
+CARPETA_GENERADA = os.path.join(CARPETA_ESTATICA, "generado")
+HOJA_IMPRESION = os.path.join(CARPETA_ESTATICA, "impresion.css")
+
+# Ruta relativa con la que Streamlit publica la carpeta static/
+URL_ESTATICA = "app/static"
+
+# Píxeles reales por píxel CSS: ~290 ppp al imprimir, pantallas HiDPI
+ESCALA_IMPRESION = 3
+ESCALA_PANTALLA = 2
+
+
+def _version(ruta):
+    try:
+        return os.path.getmtime(ruta)
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=32)
+def _imagen_optimizada(ruta, alto, escala, version):
+    if version is None:
+        return b""
+
+    with Image.open(ruta) as imagen:
+        imagen = imagen.convert("RGBA")
+
+        alto_px = min(alto * escala, imagen.height)
+        ancho_px = max(1, round(imagen.width * alto_px / imagen.height))
+
+        imagen = imagen.resize((ancho_px, alto_px), Image.LANCZOS)
+        imagen = imagen.quantize(256, method=Image.Quantize.FASTOCTREE)
+
+        salida = io.BytesIO()
+        imagen.save(salida, format="PNG", optimize=True)
+
+    return salida.getvalue()
+
+
+@lru_cache(maxsize=32)
+def _data_uri(ruta, alto, escala, version):
+    contenido = _imagen_optimizada(ruta, alto, escala, version)
+
+    if not contenido:
+        return ""
+
+    return "data:image/png;base64," + base64.b64encode(contenido).decode()
+
+
+def imagen_optimizada(ruta, alto, escala=ESCALA_PANTALLA):
+    """
+    PNG reducido para mostrarse a `alto` píxeles CSS
+    (por ejemplo con st.image). b"" si el archivo no existe.
+    """
+
+    return _imagen_optimizada(ruta, alto, escala, _version(ruta))
+
+
+def data_uri(ruta, alto, escala=ESCALA_IMPRESION):
+    """
+    Data URI de la variante impresa de una imagen, o ""
+    si el archivo no existe.
+    """
+
+    return _data_uri(ruta, alto, escala, _version(ruta))
+
+
+def servicio_estatico():
+    try:
+        activo = st.get_option("server.enableStaticServing")
+    except Exception:
+        return False
+
+    return bool(activo) and os.path.isdir(CARPETA_ESTATICA)
+
+
+@lru_cache(maxsize=32)
+def _url_estatica(ruta, alto, version):
+    """
+    Escribe la variante en static/generado/ y devuelve su URL,
+    o "" si no se pudo escribir.
+    """
+
+    contenido = _imagen_optimizada(ruta, alto, ESCALA_IMPRESION, version)
+
+    if not contenido:
+        return ""
+
+    base = os.path.splitext(os.path.basename(ruta))[0]
+    nombre = f"{base}_{alto}.png"
+    destino = os.path.join(CARPETA_GENERADA, nombre)
+
+    try:
+        os.makedirs(CARPETA_GENERADA, exist_ok=True)
+
+        temporal = f"{destino}.{os.getpid()}.tmp"
+
+        with open(temporal, "wb") as archivo:
+            archivo.write(contenido)
+
+        os.replace(temporal, destino)
+
+    except OSError:
+        return ""
+
+    # La versión en la URL evita que el navegador use un logo anterior
+    return f"{URL_ESTATICA}/generado/{nombre}?v={int(version)}"
+
+
+def url_imagen(ruta, alto):
+    """
+    URL de la variante impresa de una imagen: la ruta
+    estática si está disponible o, si no, su data URI.
+    """
+
+    version = _version(ruta)
+
+    if version is not None and servicio_estatico():
+        url = _url_estatica(ruta, alto, version)
+
+        if url:
+            return url
+
+    return _data_uri(ruta, alto, ESCALA_IMPRESION, version)
+
+
+def etiqueta_imagen(ruta, alto):
+    """
+    <img> listo para incrustar en documentos imprimibles,
+    o "" si el archivo no existe.
+    """
+
+    url = url_imagen(ruta, alto)
+
+    return f'<img src="{url}" height="{alto}">' if url else ""
+
+
+@lru_cache(maxsize=4)
+def _hoja_impresion(version, estatica):
+    if version is None:
+        return ""
+
+    if estatica:
+        return (
+            f'<link rel="stylesheet" '
+            f'href="{URL_ESTATICA}/impresion.css?v={int(version)}">'
+        )
+
+    with open(HOJA_IMPRESION, encoding="utf-8") as archivo:
+        return f"<style>{archivo.read()}</style>"
+
+
+def documento_impresion(cuerpo):
+    """
+    Página completa para components.html con la hoja de
+    estilos compartida de impresión.
+    """
+
+    hoja = _hoja_impresion(_version(HOJA_IMPRESION), servicio_estatico())
+
+    return f"<html><head>{hoja}</head><body>{cuerpo}</body></html>"
@@ -0,0 +1,99 @@
+from firebase_admin import firestore
+from google.cloud.firestore_v1.field_path import FieldPath
+
+
+# ==========================================
+# ÍNDICE INVERSO NIE → DOCUMENTOS
+# ==========================================
+#
+# notas_mensuales y asistencia guardan un arreglo "nies" con los
+# alumnos presentes en "detalles"/"registros". Firestore indexa
+# automáticamente los arreglos, por lo que array_contains devuelve
+# solo los documentos que mencionan a un alumno.
+
+COLECCIONES_INDEXADAS = {
+    "notas_mensuales": ["detalles"],
+    "asistencia": ["registros", "observaciones"],
+}
+
+
+def quitar_alumno_de_registros(db, nie):
+    """
+    Elimina las entradas de un alumno dentro de
+    notas_mensuales y asistencia usando el índice
+    "nies" y borrados de campo en lotes.
+
+    Devuelve la cantidad de documentos modificados.
+    """
+
+    batch = db.batch()
+    pendientes = 0
+    modificados = 0
+
+    for coleccion, mapas in COLECCIONES_INDEXADAS.items():
+        docs = (
+            db.collection(coleccion)
+            .where("nies", "array_contains", nie)
+            .stream()
+        )
+
+        for doc in docs:
+            cambios = {
+                FieldPath(mapa, nie).to_api_repr(): (
+                    firestore.DELETE_FIELD
+                )
+                for mapa in mapas
+            }
+
+            cambios["nies"] = firestore.ArrayRemove([nie])
+
+            batch.update(doc.reference, cambios)
+            pendientes += 1
+            modificados += 1
+
+            if pendientes == 500:
+                batch.commit()
+                batch = db.batch()
+                pendientes = 0
+
+    if pendientes:
+        batch.commit()
+
+    return modificados
+
+
+def indexar_nies_existentes(db):
+    """
+    Completa el arreglo "nies" en los documentos
+    guardados antes de existir el índice.
+
+    Devuelve la cantidad de documentos actualizados.
+    """
+
+    batch = db.batch()
+    pendientes = 0
+    actualizados = 0
+
+    for coleccion, mapas in COLECCIONES_INDEXADAS.items():
+        for doc in db.collection(coleccion).stream():
+            data = doc.to_dict()
+
+            if "nies" in data:
+                continue
+
+            batch.update(
+                doc.reference,
+                {"nies": sorted(data.get(mapas[0], {}))}
+            )
+            pendientes += 1
+            actualizados += 1
+
+            if pendientes == 500:
+                batch.commit()
+                batch = db.batch()
+                pendientes = 0
+
+    if pendientes:
+        batch.commit()
+
+    return actualizados
@@ -0,0 +1,417 @@
+from datetime import date, datetime, timedelta
+
+from firebase_admin import firestore
+from google.cloud.firestore_v1.field_path import FieldPath
+
+from config import CICLO_LECTIVO
+
+
+# ==========================================
+# CONFIGURACIÓN
+# ==========================================
+
+COLECCION_RESUMEN = "asistencia_resumen"
+
+ESTADOS_ASISTENCIA = ["Presente", "Ausente", "Tardanza", "Permiso"]
+
+
+def _id_asistencia(fecha, grado, ciclo_lectivo):
+    return f"{ciclo_lectivo}_{fecha}_{grado}"
+
+
+def _id_resumen(grado, fecha, ciclo_lectivo):
+    return f"{ciclo_lectivo}_{grado}_{fecha.strftime('%Y-%m')}"
+
+
+# ==========================================
+# GUARDAR TOMA DE ASISTENCIA
+# ==========================================
+
+@firestore.transactional
+def _guardar_en_transaccion(
+    transaccion,
+    doc_ref,
+    resumen_ref,
+    datos,
+    fecha,
+):
+    """
+    Escribe la toma del día y aplica al resumen mensual
+    solo la diferencia contra lo que ya estaba guardado.
+    """
+
+    snap = doc_ref.get(transaction=transaccion)
+    anterior = snap.to_dict() if snap.exists else {}
+
+    registros_previos = anterior.get("registros", {})
+    observaciones_previas = anterior.get("observaciones", {})
+
+    registros = datos["registros"]
+    observaciones = datos["observaciones"]
+
+    conteos = {}
+
+    for nie in set(registros) | set(registros_previos):
+        previo = registros_previos.get(nie)
+        actual = registros.get(nie)
+
+        if previo == actual:
+            continue
+
+        if previo in ESTADOS_ASISTENCIA:
+            conteos.setdefault(nie, {})[previo] = firestore.Increment(-1)
+
+        if actual in ESTADOS_ASISTENCIA:
+            conteos.setdefault(nie, {})[actual] = firestore.Increment(1)
+
+    notas = {}
+    clave_dia = fecha.isoformat()
+
+    for nie in set(registros) | set(registros_previos):
+        texto = observaciones.get(nie)
+
+        if registros.get(nie) == "Ausente" and texto:
+            notas[nie] = {clave_dia: texto}
+
+        elif (
+            registros_previos.get(nie) == "Ausente"
+            and observaciones_previas.get(nie)
+        ):
+            notas[nie] = {clave_dia: firestore.DELETE_FIELD}
+
+    resumen = {
+        "ciclo_lectivo": datos["ciclo_lectivo"],
+        "grado": datos["grado"],
+        "mes": fecha.strftime("%Y-%m"),
+    }
+
+    # Un mapa vacío con merge=True reemplazaría el mapa completo
+    if conteos:
+        resumen["conteos"] = conteos
+
+    if notas:
+        resumen["observaciones"] = notas
+
+    if not snap.exists:
+        resumen["dias"] = firestore.Increment(1)
+
+    transaccion.set(doc_ref, datos)
+    transaccion.set(resumen_ref, resumen, merge=True)
+
+
+def guardar_asistencia(
+    db,
+    fecha,
+    grado,
+    registros,
+    observaciones,
+    ciclo_lectivo=CICLO_LECTIVO,
+):
+    """
+    Guarda la asistencia de un grado para un día y
+    mantiene, en la misma transacción, los contadores
+    mensuales por NIE de asistencia_resumen.
+    """
+
+    doc_ref = db.collection("asistencia").document(
+        _id_asistencia(fecha, grado, ciclo_lectivo)
+    )
+
+    resumen_ref = db.collection(COLECCION_RESUMEN).document(
+        _id_resumen(grado, fecha, ciclo_lectivo)
+    )
+
+    datos = {
+        "fecha": datetime.combine(fecha, datetime.min.time()),
+        "ciclo_lectivo": ciclo_lectivo,
+        "grado": grado,
+        "registros": registros,
+        "observaciones": observaciones,
+        "nies": sorted(registros),
+    }
+
+    _guardar_en_transaccion(
+        db.transaction(),
+        doc_ref,
+        resumen_ref,
+        datos,
+        fecha,
+    )
+
+
+# ==========================================
+# REPORTE DE ASISTENCIA GLOBAL
+# ==========================================
+
+def _acumular(conteos, nie, estado, cantidad=1):
+    por_nie = conteos.setdefault(nie, {})
+    por_nie[estado] = por_nie.get(estado, 0) + cantidad
+
+
+def resumen_asistencia_periodo(
+    db,
+    grado,
+    inicio,
+    fin,
+    ciclo_lectivo=CICLO_LECTIVO,
+):
+    """
+    Combina los resúmenes de los meses completos del
+    rango con las tomas diarias de los días sueltos
+    de los extremos.
+
+    Devuelve (total_dias, conteos, observaciones), donde
+    conteos[nie][estado] es un entero y observaciones[nie]
+    es una lista de (fecha, texto) de las ausencias.
+    """
+
+    referencias_mes = []
+    referencias_dia = []
+    actual = inicio
+
+    while actual <= fin:
+        siguiente_mes = (
+            actual.replace(day=28) + timedelta(days=4)
+        ).replace(day=1)
+
+        if actual.day == 1 and siguiente_mes - timedelta(days=1) <= fin:
+            referencias_mes.append(
+                db.collection(COLECCION_RESUMEN).document(
+                    _id_resumen(grado, actual, ciclo_lectivo)
+                )
+            )
+            actual = siguiente_mes
+        else:
+            referencias_dia.append(
+                db.collection("asistencia").document(
+                    _id_asistencia(actual, grado, ciclo_lectivo)
+                )
+            )
+            actual += timedelta(days=1)
+
+    total_dias = 0
+    conteos = {}
+    observaciones = {}
+
+    for snap in db.get_all(referencias_mes):
+        if not snap.exists:
+            continue
+
+        data = snap.to_dict()
+        total_dias += data.get("dias", 0)
+
+        for nie, por_estado in data.get("conteos", {}).items():
+            for estado, cantidad in por_estado.items():
+                _acumular(conteos, nie, estado, cantidad)
+
+        for nie, por_dia in data.get("observaciones", {}).items():
+            for clave_dia, texto in por_dia.items():
+                observaciones.setdefault(nie, []).append(
+                    (date.fromisoformat(clave_dia), texto)
+                )
+
+    for snap in db.get_all(referencias_dia):
+        if not snap.exists:
+            continue
+
+        data = snap.to_dict()
+        total_dias += 1
+
+        dia = date.fromisoformat(snap.id.split("_")[1])
+        notas_dia = data.get("observaciones", {})
+
+        for nie, estado in data.get("registros", {}).items():
+            _acumular(conteos, nie, estado)
+
+            if estado == "Ausente" and notas_dia.get(nie):
+                observaciones.setdefault(nie, []).append(
+                    (dia, notas_dia[nie])
+                )
+
+    for lista in observaciones.values():
+        lista.sort()
+
+    return total_dias, conteos, observaciones
+
+
+def asistencia_dia(db, fecha, grados, ciclo_lectivo=CICLO_LECTIVO):
+    """
+    Tomas de asistencia de un día para varios grados,
+    leídas por ID en una sola llamada.
+
+    Devuelve (grados_tomados, conteos), donde conteos
+    es {estado: cantidad} sumando todos los grados.
+    """
+
+    referencias = [
+        db.collection("asistencia").document(
+            _id_asistencia(fecha, grado, ciclo_lectivo)
+        )
+        for grado in grados
+    ]
+
+    tomados = 0
+    conteos = {}
+
+    for snap in db.get_all(referencias):
+        if not snap.exists:
+            continue
+
+        tomados += 1
+
+        for estado in snap.to_dict().get("registros", {}).values():
+            conteos[estado] = conteos.get(estado, 0) + 1
+
+    return tomados, conteos
+
+
+# ==========================================
+# ELIMINACIÓN DE ALUMNOS
+# ==========================================
+
+def quitar_alumno_de_resumen(db, nie):
+    """
+    Borra los contadores y observaciones de un alumno en
+    asistencia_resumen. Los meses salen de sus tomas de
+    asistencia (índice "nies"), así que debe llamarse antes
+    de quitar al alumno de "asistencia".
+
+    Devuelve la cantidad de resúmenes modificados.
+    """
+
+    ids = set()
+
+    docs = (
+        db.collection("asistencia")
+        .where("nies", "array_contains", nie)
+        .stream()
+    )
+
+    for doc in docs:
+        partes = doc.id.split("_", 2)
+
+        if len(partes) != 3:
+            continue
+
+        data = doc.to_dict()
+
+        ids.add(
+            _id_resumen(
+                data.get("grado", partes[2]),
+                date.fromisoformat(partes[1]),
+                data.get("ciclo_lectivo", int(partes[0]))
+            )
+        )
+
+    if not ids:
+        return 0
+
+    referencias = [
+        db.collection(COLECCION_RESUMEN).document(doc_id)
+        for doc_id in sorted(ids)
+    ]
+
+    batch = db.batch()
+    pendientes = 0
+    modificados = 0
+
+    for snap in db.get_all(referencias):
+        if not snap.exists:
+            continue
+
+        data = snap.to_dict()
+
+        cambios = {
+            FieldPath(mapa, nie).to_api_repr(): firestore.DELETE_FIELD
+            for mapa in ("conteos", "observaciones")
+            if nie in data.get(mapa, {})
+        }
+
+        if not cambios:
+            continue
+
+        batch.update(snap.reference, cambios)
+        pendientes += 1
+        modificados += 1
+
+        if pendientes == 500:
+            batch.commit()
+            batch = db.batch()
+            pendientes = 0
+
+    if pendientes:
+        batch.commit()
+
+    return modificados
+
+
+# ==========================================
+# RECONSTRUCCIÓN
+# ==========================================
+
+def reconstruir_resumen_asistencia(db, ciclo_lectivo=CICLO_LECTIVO):
+    """
+    Recalcula desde cero asistencia_resumen para un
+    ciclo a partir de las tomas diarias guardadas.
+    """
+
+    resumenes = {}
+    procesados = 0
+
+    docs = (
+        db.collection("asistencia")
+        .where("ciclo_lectivo", "==", ciclo_lectivo)
+        .stream()
+    )
+
+    for doc in docs:
+        partes = doc.id.split("_", 2)
+
+        if len(partes) != 3:
+            continue
+
+        data = doc.to_dict()
+        dia = date.fromisoformat(partes[1])
+        grado = data.get("grado", partes[2])
+        procesados += 1
+
+        resumen = resumenes.setdefault(
+            _id_resumen(grado, dia, ciclo_lectivo),
+            {
+                "ciclo_lectivo": ciclo_lectivo,
+                "grado": grado,
+                "mes": dia.strftime("%Y-%m"),
+                "dias": 0,
+                "conteos": {},
+                "observaciones": {},
+            }
+        )
+
+        resumen["dias"] += 1
+        notas_dia = data.get("observaciones", {})
+
+        for nie, estado in data.get("registros", {}).items():
+            if estado in ESTADOS_ASISTENCIA:
+                _acumular(resumen["conteos"], nie, estado)
+
+            if estado == "Ausente" and notas_dia.get(nie):
+                resumen["observaciones"].setdefault(nie, {})[
+                    dia.isoformat()
+                ] = notas_dia[nie]
+
+    batch = db.batch()
+    pendientes = 0
+
+    for doc_id, resumen in resumenes.items():
+        batch.set(db.collection(COLECCION_RESUMEN).document(doc_id), resumen)
+        pendientes += 1
+
+        if pendientes == 500:
+            batch.commit()
+            batch = db.batch()
+            pendientes = 0
+
+    if pendientes:
+        batch.commit()
+
+    return procesados, len(resumenes)
@@ -0,0 +1,167 @@
+import json
+import subprocess
+import sys
+import time
+
+
+# ============================================================
+# CONFIGURACIÓN
+# ============================================================
+
+REPETICIONES = 3
+
+# Módulos que se cargan al arrancar app.py o al abrir una página
+MODULOS = [
+    "streamlit",
+    "firebase_service",
+    "paginas",
+    "activos",
+    "pandas",
+    "views.inicio",
+    "views.docente",
+    "views.notas",
+    "views.finanzas",
+    "views.promocion",
+    "boletas_pdf",
+]
+
+# Módulos que una sesión docente nunca debe cargar
+SOLO_ADMIN = [
+    "views.finanzas",
+    "views.promocion",
+    "views.docentes",
+    "views.alumnos",
+    "boletas_pdf",
+    "reportlab",
+]
+
+ESCENARIOS = {
+    "Login": None,
+    "Inicio (admin)": ("admin", "Inicio"),
+    "Inicio (docente)": ("docente", "Inicio"),
+    "Mis Listados (docente)": ("docente", "Mis Listados"),
+}
+
+
+# ============================================================
+# MEDICIONES (CADA UNA EN UN PROCESO NUEVO)
+# ============================================================
+
+def _importar(modulo):
+    inicio = time.perf_counter()
+    __import__(modulo)
+
+    return {"segundos": time.perf_counter() - inicio}
+
+
+def _primer_pintado(escenario):
+    """
+    Ejecuta app.py con AppTest hasta el final del primer
+    script run. Sin credenciales de Firebase, db es None.
+    """
+
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file("app.py", default_timeout=120)
+
+    sesion = ESCENARIOS[escenario]
+
+    if sesion:
+        rol, pagina = sesion
+        app.session_state["logged_in"] = True
+        app.session_state["user_role"] = rol
+        app.session_state["user_name"] = "Benchmark"
+        app.session_state["user_id"] = "benchmark"
+        app.session_state["menu_actual"] = pagina
+
+    inicio = time.perf_counter()
+    app.run()
+    transcurrido = time.perf_counter() - inicio
+
+    return {
+        "segundos": transcurrido,
+        "excepciones": [e.message for e in app.exception],
+        "solo_admin": [m for m in SOLO_ADMIN if m in sys.modules],
+    }
+
+
+def medir_en_proceso(tipo, nombre):
+    resultados = []
+
+    for _ in range(REPETICIONES):
+        salida = subprocess.run(
+            [sys.executable, __file__, "--medir", tipo, nombre],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        resultados.append(json.loads(salida.stdout.strip().splitlines()[-1]))
+
+    mejor = min(resultados, key=lambda r: r["segundos"])
+
+    return mejor
+
+
+# ============================================================
+# PROGRAMA PRINCIPAL
+# ============================================================
+
+def main():
+
+    print()
+    print("=" * 60)
+    print("BENCHMARK DE ARRANQUE")
+    print("=" * 60)
+    print(f"Mejor de {REPETICIONES} procesos nuevos por medición")
+    print()
+
+    print("TIEMPO DE IMPORTACIÓN")
+    print("-" * 60)
+
+    for modulo in MODULOS:
+        resultado = medir_en_proceso("importar", modulo)
+        print(f"{modulo:<40} {resultado['segundos'] * 1000:8.0f} ms")
+
+    print()
+    print("PRIMER PINTADO (app.py completo)")
+    print("-" * 60)
+
+    advertencias = []
+
+    for escenario in ESCENARIOS:
+        resultado = medir_en_proceso("pintar", escenario)
+        print(f"{escenario:<40} {resultado['segundos'] * 1000:8.0f} ms")
+
+        for error in resultado["excepciones"]:
+            advertencias.append(f"{escenario}: excepción {error}")
+
+        if "docente" in escenario and resultado["solo_admin"]:
+            advertencias.append(
+                f"{escenario}: cargó módulos de administración "
+                f"{', '.join(resultado['solo_admin'])}"
+            )
+
+    print("=" * 60)
+
+    if advertencias:
+        for advertencia in advertencias:
+            print(f"⚠️ {advertencia}")
+
+        sys.exit(1)
+
+    print("✅ Las sesiones docentes no cargan módulos de administración")
+
+
+# ============================================================
+# EJECUCIÓN
+# ============================================================
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--medir":
+        if sys.argv[2] == "importar":
+            print(json.dumps(_importar(sys.argv[3])))
+        else:
+            print(json.dumps(_primer_pintado(sys.argv[3])))
+    else:
+        main()
@@ -0,0 +1,126 @@
+import random
+import time
+
+from datetime import date
+
+from academic_config import LISTA_MESES, MAPA_CURRICULAR
+from notas_service import calcular_cubo, filas_alumno
+from reportes_html import render_cuadro_anual, render_reporte_financiero
+
+
+# ============================================================
+# CONFIGURACIÓN
+# ============================================================
+
+ALUMNOS_POR_GRADO = 40
+MOVIMIENTOS = 5000
+REPETICIONES = 20
+
+
+# ============================================================
+# DATOS DE PRUEBA
+# ============================================================
+
+def datos_cuadro():
+    materias = MAPA_CURRICULAR["Séptimo Grado"]
+
+    alumnos = [
+        {"nie": str(100000 + i), "nombre": f"Apellido{i} Nombre{i}"}
+        for i in range(ALUMNOS_POR_GRADO)
+    ]
+
+    registros = [
+        {
+            "nie": alumno["nie"],
+            "materia": materia,
+            "mes": mes,
+            "promedio_final": float(random.randint(4, 10)),
+        }
+        for alumno in alumnos
+        for materia in materias
+        for mes in LISTA_MESES
+    ]
+
+    cubo = calcular_cubo(
+        registros,
+        [alumno["nie"] for alumno in alumnos],
+        materias
+    )
+
+    return alumnos, cubo
+
+
+def datos_financieros():
+    return [
+        {
+            "tipo": random.choice(["ingreso", "egreso"]),
+            "fecha_legible": "15/03/2026 10:30",
+            "grado_reporte": "Primer Grado",
+            "nombre_persona": f"Persona {i}",
+            "descripcion": "Mensualidad - Marzo",
+            "monto": random.uniform(5, 60),
+        }
+        for i in range(MOVIMIENTOS)
+    ]
+
+
+def medir(nombre, funcion):
+    funcion()
+
+    inicio = time.perf_counter()
+
+    for _ in range(REPETICIONES):
+        resultado = funcion()
+
+    transcurrido = (time.perf_counter() - inicio) / REPETICIONES
+
+    print(
+        f"{nombre:<40} {transcurrido * 1000:8.2f} ms "
+        f"({len(resultado) / 1024:,.0f} KB)"
+    )
+
+
+# ============================================================
+# PROGRAMA PRINCIPAL
+# ============================================================
+
+def main():
+
+    print()
+    print("=" * 60)
+    print("BENCHMARK DE REPORTES HTML")
+    print("=" * 60)
+
+    alumnos, cubo = datos_cuadro()
+    movimientos = datos_financieros()
+
+    medir(
+        f"Cuadro anual ({ALUMNOS_POR_GRADO} alumnos)",
+        lambda: render_cuadro_anual(
+            "Séptimo Grado",
+            alumnos,
+            lambda nie: filas_alumno(cubo, nie)
+        )
+    )
+
+    medir(
+        f"Reporte financiero ({MOVIMIENTOS} filas)",
+        lambda: render_reporte_financiero(
+            movimientos,
+            "REPORTE FINANCIERO (Este Año)",
+            date(2026, 1, 1),
+            date(2026, 12, 31),
+            1000.0,
+            500.0
+        )
+    )
+
+    print("=" * 60)
+
+
+# ============================================================
+# EJECUCIÓN
+# ============================================================
+
+if __name__ == "__main__":
+    main()
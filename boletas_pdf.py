@@ -0,0 +1,414 @@
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import zipfile
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from PIL import Image
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import cm
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Table, TableStyle
+
+from config import CICLO_LECTIVO, COLEGIO_NOMBRE
+
+
+# ==========================================
+# BOLETAS EN PDF
+# ==========================================
+#
+# Reproduce el formato de "Impresión Masiva": hoja carta,
+# margen de 0.5 cm, dos boletas por página separadas por
+# una línea de corte punteada.
+
+# Los flujos binarios ya van comprimidos; codificarlos en ASCII85
+# solo agranda el archivo y cuesta tiempo de CPU.
+rl_config.useA85 = 0
+
+ANCHO_PAGINA, ALTO_PAGINA = letter
+MARGEN = 0.5 * cm
+
+# .boleta-container ocupa el 46% de la hoja y .cut-line el 2%
+ALTO_BOLETA = (ALTO_PAGINA - 2 * MARGEN) * 0.46
+ALTO_CORTE = (ALTO_PAGINA - 2 * MARGEN) * 0.02
+RELLENO = 15
+
+AZUL_TRIMESTRE = colors.HexColor("#e3f2fd")
+GRIS_TRIMESTRE = colors.HexColor("#f8f9fa")
+GRIS_ENCABEZADO = colors.HexColor("#f2f2f2")
+AZUL_FINAL = colors.HexColor("#1e3a8a")
+
+ENCABEZADO_TABLA = [
+    "ASIGNATURA",
+    "FEB", "MAR", "ABR", "T1",
+    "MAY", "JUN", "JUL", "T2",
+    "AGO", "SEP", "OCT", "T3",
+    "PF",
+]
+
+# Columnas de trimestre y promedio final dentro de la tabla
+COLUMNAS_TRIMESTRE = [4, 8, 12]
+COLUMNA_FINAL = 13
+
+
+@lru_cache(maxsize=4)
+def _cargar_logo(ruta):
+    """
+    Lee el logo una vez por proceso, reducido a la
+    resolución necesaria para imprimirlo.
+    """
+
+    if not ruta or not os.path.exists(ruta):
+        return None
+
+    with Image.open(ruta) as imagen:
+        imagen = imagen.convert("RGBA")
+        imagen.thumbnail((300, 300))
+
+        salida = io.BytesIO()
+        imagen.save(salida, format="PNG", optimize=True)
+
+    return ImageReader(io.BytesIO(salida.getvalue()))
+
+
+def _tabla_notas(filas, ancho):
+    datos = [ENCABEZADO_TABLA]
+
+    for fila in filas:
+        meses = [str(nota) for nota in fila["meses"]]
+        t1, t2, t3 = [str(t) for t in fila["trimestres"]]
+
+        datos.append(
+            [fila["materia"]]
+            + meses[0:3] + [t1]
+            + meses[3:6] + [t2]
+            + meses[6:9] + [t3]
+            + [str(fila["final"])]
+        )
+
+    ancho_materia = ancho * 0.25
+    ancho_celda = (ancho - ancho_materia) / (len(ENCABEZADO_TABLA) - 1)
+
+    tabla = Table(
+        datos,
+        colWidths=[ancho_materia] + [ancho_celda] * (len(ENCABEZADO_TABLA) - 1),
+    )
+
+    estilo = [
+        ("FONT", (0, 0), (-1, -1), "Helvetica", 7.5),
+        ("FONT", (0, 0), (-1, 0), "Helvetica-Bold", 7.5),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+        ("ALIGN", (1, 0), (-1, -1), "CENTER"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("BACKGROUND", (0, 0), (-1, 0), GRIS_ENCABEZADO),
+        ("TOPPADDING", (0, 0), (-1, -1), 1.5),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 1.5),
+        ("BACKGROUND", (COLUMNA_FINAL, 0), (COLUMNA_FINAL, -1), AZUL_FINAL),
+        ("TEXTCOLOR", (COLUMNA_FINAL, 0), (COLUMNA_FINAL, -1), colors.white),
+        ("FONT", (COLUMNA_FINAL, 1), (COLUMNA_FINAL, -1), "Helvetica-Bold", 7.5),
+    ]
+
+    for columna in COLUMNAS_TRIMESTRE:
+        estilo.extend(
+            [
+                ("BACKGROUND", (columna, 0), (columna, 0), AZUL_TRIMESTRE),
+                ("BACKGROUND", (columna, 1), (columna, -1), GRIS_TRIMESTRE),
+                ("FONT", (columna, 1), (columna, -1), "Helvetica-Bold", 7.5),
+            ]
+        )
+
+    tabla.setStyle(TableStyle(estilo))
+
+    return tabla
+
+
+def _dibujar_boleta(pdf, boleta, grado, guia, ciclo_lectivo, logo, y_superior):
+    """
+    Dibuja una boleta cuyo borde superior está en y_superior.
+    """
+
+    x = MARGEN + RELLENO
+    ancho = ANCHO_PAGINA - 2 * (MARGEN + RELLENO)
+    y = y_superior - RELLENO
+
+    # Encabezado: logo, nombre del colegio y línea inferior
+    alto_logo = 34
+    x_texto = x
+
+    if logo is not None:
+        ancho_logo, alto_original = logo.getSize()
+        ancho_dibujo = alto_logo * ancho_logo / alto_original
+
+        pdf.drawImage(
+            logo,
+            x,
+            y - alto_logo,
+            width=ancho_dibujo,
+            height=alto_logo,
+            mask="auto",
+        )
+
+        x_texto = x + ancho_dibujo + 11
+
+    pdf.setFillColor(colors.black)
+    pdf.setFont("Helvetica-Bold", 12)
+    pdf.drawString(x_texto, y - 14, COLEGIO_NOMBRE.upper())
+
+    pdf.setFillColor(colors.HexColor("#444444"))
+    pdf.setFont("Helvetica-Bold", 9)
+    pdf.drawString(
+        x_texto,
+        y - 27,
+        f"INFORME DE RENDIMIENTO ACADÉMICO - {ciclo_lectivo}"
+    )
+
+    y -= alto_logo + 4
+
+    pdf.setStrokeColor(colors.black)
+    pdf.setLineWidth(0.75)
+    pdf.line(x, y, x + ancho, y)
+
+    # Datos del alumno
+    pdf.setFillColor(colors.black)
+    y -= 12
+
+    pdf.setFont("Helvetica-Bold", 8)
+    pdf.drawString(x, y, "ALUMNO:")
+    pdf.drawRightString(x + ancho, y, f"GRADO: {grado}")
+    pdf.setFont("Helvetica", 8)
+    pdf.drawString(x + 40, y, boleta["nombre"])
+
+    y -= 11
+
+    pdf.setFont("Helvetica-Bold", 8)
+    pdf.drawString(x, y, "NIE:")
+    pdf.drawRightString(x + ancho, y, f"GUÍA: {guia}")
+    pdf.setFont("Helvetica", 8)
+    pdf.drawString(x + 40, y, str(boleta["nie"]))
+
+    # Tabla de notas
+    y -= 8
+
+    tabla = _tabla_notas(boleta["filas"], ancho)
+    _, alto_tabla = tabla.wrapOn(pdf, ancho, y)
+    tabla.drawOn(pdf, x, y - alto_tabla)
+
+    # Firmas al pie de la boleta
+    y_firmas = y_superior - ALTO_BOLETA + RELLENO + 10
+    ancho_firma = ancho * 0.40
+
+    pdf.setFont("Helvetica", 7.5)
+    pdf.setLineWidth(0.5)
+
+    for centro, texto in (
+        (x + ancho * 0.25, "F. Maestro Orientador"),
+        (x + ancho * 0.75, "F. Dirección / Sello"),
+    ):
+        pdf.line(
+            centro - ancho_firma / 2,
+            y_firmas,
+            centro + ancho_firma / 2,
+            y_firmas
+        )
+        pdf.drawCentredString(centro, y_firmas - 10, texto)
+
+
+def _dibujar_corte(pdf, y_superior):
+    y = y_superior - ALTO_CORTE / 2
+
+    pdf.saveState()
+    pdf.setStrokeColor(colors.black)
+    pdf.setDash(3, 3)
+    pdf.setLineWidth(0.5)
+    pdf.line(MARGEN, y, ANCHO_PAGINA - MARGEN, y)
+    pdf.restoreState()
+
+
+def generar_pdf_boletas(
+    grado,
+    guia,
+    boletas,
+    ciclo_lectivo=CICLO_LECTIVO,
+    ruta_logo="logo.png",
+):
+    """
+    Devuelve los bytes del PDF con las boletas del grado,
+    dos por página.
+
+    Cada boleta es un diccionario con "nombre", "nie" y
+    "filas" (las filas de notas_service.filas_alumno).
+    """
+
+    salida = io.BytesIO()
+
+    pdf = canvas.Canvas(salida, pagesize=letter, pageCompression=1)
+    pdf.setTitle(f"Boletas {grado} {ciclo_lectivo}")
+
+    logo = _cargar_logo(ruta_logo)
+
+    for i, boleta in enumerate(boletas):
+        if i and i % 2 == 0:
+            pdf.showPage()
+
+        y_superior = ALTO_PAGINA - MARGEN
+
+        if i % 2:
+            y_superior -= ALTO_BOLETA + ALTO_CORTE
+
+        _dibujar_boleta(pdf, boleta, grado, guia, ciclo_lectivo, logo, y_superior)
+        _dibujar_corte(pdf, y_superior - ALTO_BOLETA)
+
+    pdf.showPage()
+    pdf.save()
+
+    return salida.getvalue()
+
+
+def _generar_trabajo(trabajo):
+    return trabajo["grado"], generar_pdf_boletas(**trabajo)
+
+
+def generar_pdfs_grados(trabajos, max_procesos=None):
+    """
+    Genera un PDF por trabajo (argumentos de
+    generar_pdf_boletas) y devuelve {grado: bytes}.
+
+    Varios grados se reparten entre procesos; un solo
+    grado se genera en el proceso actual, donde iniciar
+    el pool costaría más que dibujarlo.
+    """
+
+    if len(trabajos) <= 1:
+        return dict(map(_generar_trabajo, trabajos))
+
+    procesos = min(len(trabajos), max_procesos or os.cpu_count() or 1)
+
+    # "spawn" evita duplicar los hilos del servidor de Streamlit
+    with ProcessPoolExecutor(
+        max_workers=procesos,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        return dict(pool.map(_generar_trabajo, trabajos))
+
+
+# ==========================================
+# LOTE INSTITUCIONAL CON CACHÉ
+# ==========================================
+#
+# Cada PDF de grado se guarda en disco bajo la huella de todo
+# lo que se imprime (nómina, notas, materias, guía, ciclo).
+# Si nada cambió desde la última ejecución se reutiliza.
+
+CARPETA_CACHE = os.path.join(tempfile.gettempdir(), "edumanager_boletas")
+
+# Cambiar al modificar el dibujo para invalidar la caché
+VERSION_FORMATO = 1
+
+
+def _prefijo_grado(grado):
+    return grado.replace(" ", "_") + "__"
+
+
+def huella_trabajo(trabajo):
+    """
+    Hash del contenido de un trabajo de generar_pdf_boletas.
+    """
+
+    contenido = json.dumps(
+        [VERSION_FORMATO, trabajo],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+
+def generar_pdfs_con_cache(trabajos, carpeta=CARPETA_CACHE):
+    """
+    Igual que generar_pdfs_grados, pero solo dibuja los
+    grados cuyo contenido cambió desde la última vez.
+
+    Devuelve ({grado: bytes}, grados regenerados).
+    """
+
+    os.makedirs(carpeta, exist_ok=True)
+
+    pdfs = {}
+    rutas = {}
+    pendientes = []
+
+    for trabajo in trabajos:
+        grado = trabajo["grado"]
+        ruta = os.path.join(
+            carpeta,
+            f"{_prefijo_grado(grado)}{huella_trabajo(trabajo)}.pdf"
+        )
+
+        # Otra sesión puede borrar la versión entre la búsqueda y la lectura
+        try:
+            with open(ruta, "rb") as archivo:
+                pdfs[grado] = archivo.read()
+        except FileNotFoundError:
+            rutas[grado] = ruta
+            pendientes.append(trabajo)
+
+    nuevos = generar_pdfs_grados(pendientes)
+
+    for grado, pdf in nuevos.items():
+        ruta = rutas[grado]
+
+        # Se descartan las versiones anteriores del grado. Los
+        # temporales de otras sesiones no se tocan y un archivo que
+        # otra sesión ya borró se ignora.
+        for nombre in os.listdir(carpeta):
+            if (
+                nombre.startswith(_prefijo_grado(grado))
+                and not nombre.endswith(".tmp")
+                and nombre != os.path.basename(ruta)
+            ):
+                try:
+                    os.remove(os.path.join(carpeta, nombre))
+                except FileNotFoundError:
+                    pass
+
+        # Nombre temporal único por escritura
+        with tempfile.NamedTemporaryFile(
+            dir=carpeta,
+            suffix=".tmp",
+            delete=False,
+        ) as archivo:
+            archivo.write(pdf)
+
+        os.replace(archivo.name, ruta)
+        pdfs[grado] = pdf
+
+    ordenados = {trabajo["grado"]: pdfs[trabajo["grado"]] for trabajo in trabajos}
+
+    return ordenados, list(nuevos)
+
+
+def empaquetar_zip(pdfs, ciclo_lectivo=CICLO_LECTIVO):
+    """
+    Un archivo zip con un PDF por grado. Los PDF ya van
+    comprimidos, por lo que se guardan sin recomprimir.
+    """
+
+    salida = io.BytesIO()
+
+    with zipfile.ZipFile(salida, "w", zipfile.ZIP_STORED) as archivo_zip:
+        for grado, pdf in pdfs.items():
+            archivo_zip.writestr(
+                f"Boletas_{grado.replace(' ', '_')}_{ciclo_lectivo}.pdf",
+                pdf
+            )
+
+    return salida.getvalue()
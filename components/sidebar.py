@@ -1,5 +1,7 @@
 import streamlit as st
 
+from activos import LOGO, imagen_optimizada
+
 def mostrar_sidebar(nombre_usuario, rol_usuario):
     """
     Sidebar principal de EduManager.
@@ -19,7 +21,7 @@ def mostrar_sidebar(nombre_usuario, rol_usuario):
         # IDENTIDAD
         # ==========================================
         try:
-            st.image("logo.png", width=85)
+            st.image(imagen_optimizada(LOGO, 85), width=85)
         except Exception:
             pass
 
@@ -114,6 +116,12 @@ def mostrar_sidebar(nombre_usuario, rol_usuario):
                 "menu_notas"
             )
 
+            opcion_menu(
+                "📈  Analítica",
+                "Analítica",
+                "menu_analitica"
+            )
+
             st.markdown(
                 "<div class='menu-section-title'>ADMINISTRACIÓN</div>",
                 unsafe_allow_html=True
@@ -10,4 +10,10 @@ COLEGIO_NOMBRE = "Colegio Profa. Blanca Elena de Hernández"
 
 CICLO_LECTIVO = 2026
 
-TZ_SV = pytz.timezone("America/El_Salvador")
\ No newline at end of file
+TZ_SV = pytz.timezone("America/El_Salvador")
+
+# Espejos en memoria (espejo_service): listeners en tiempo real
+# o, si se desactivan, recarga por sondeo cada N segundos
+ESPEJOS_TIEMPO_REAL = True
+
+INTERVALO_SONDEO_ESPEJOS = 60
@@ -0,0 +1,260 @@
+import threading
+import time
+
+from config import ESPEJOS_TIEMPO_REAL, INTERVALO_SONDEO_ESPEJOS
+
+
+# ==========================================
+# ESPEJOS EN MEMORIA DE COLECCIONES PEQUEÑAS
+# ==========================================
+#
+# maestros_perfil y carga_academica cambian poco y se leen en
+# casi todas las pantallas. Cada colección se refleja una sola
+# vez por proceso: un listener on_snapshot de Firestore aplica
+# los cambios en cuanto ocurren, y las vistas leen de memoria
+# sin consultas. Las nóminas de alumnos activos no se reflejan:
+# se sirven por grado desde roster_service.
+#
+# Si el listener no puede iniciarse (o se desactiva con
+# ESPEJOS_TIEMPO_REAL) el espejo se recarga por sondeo cada
+# INTERVALO_SONDEO_ESPEJOS segundos.
+
+# nombre del espejo -> (colección, filtros where)
+ESPEJOS = {
+    "carga_academica": ("carga_academica", []),
+    "maestros_perfil": ("maestros_perfil", []),
+}
+
+# Segundos de espera por el primer snapshot del listener
+ESPERA_PRIMER_SNAPSHOT = 10
+
+_espejos = {}
+_candado_espejos = threading.Lock()
+
+
+class EspejoColeccion:
+    """
+    Copia en memoria de una consulta de Firestore.
+
+    Los documentos se guardan como {id: datos}. Cada cambio
+    reemplaza el diccionario completo en lugar de modificarlo,
+    así quien lo está leyendo nunca ve un estado a medias.
+    version aumenta con cada cambio aplicado.
+    """
+
+    def __init__(self, db, coleccion, filtros):
+        self.db = db
+        self.coleccion = coleccion
+        self.filtros = filtros
+        self.version = 0
+        self.modo = None
+
+        self._documentos = {}
+        self._candado = threading.Lock()
+        self._candado_inicio = threading.Lock()
+        self._candado_recarga = threading.Lock()
+        self._primer_snapshot = threading.Event()
+        self._snapshot_completo = True
+        self._vigilancia = None
+        self._ultima_carga = 0.0
+        self._desactualizado = False
+
+    def _consulta(self):
+        consulta = self.db.collection(self.coleccion)
+
+        for campo, operador, valor in self.filtros:
+            consulta = consulta.where(campo, operador, valor)
+
+        return consulta
+
+    def iniciar(self):
+        # modo se asigna solo cuando ya hay documentos cargados:
+        # asegurar_iniciado lo consulta sin candado
+        if ESPEJOS_TIEMPO_REAL:
+            try:
+                self._primer_snapshot.clear()
+                self._snapshot_completo = True
+                self._vigilancia = self._consulta().on_snapshot(
+                    self._al_cambiar
+                )
+
+                if self._primer_snapshot.wait(ESPERA_PRIMER_SNAPSHOT):
+                    self.modo = "escucha"
+                    return
+
+                self._vigilancia.unsubscribe()
+
+            except Exception:
+                pass
+
+            self._vigilancia = None
+
+        self.recargar()
+        self.modo = "sondeo"
+
+    def asegurar_iniciado(self):
+        """
+        Inicia el espejo si todavía no se inició. Solo un hilo
+        lo inicia; los demás lectores del mismo espejo esperan
+        sin bloquear a los otros espejos.
+        """
+
+        if self.modo is not None:
+            return
+
+        with self._candado_inicio:
+            if self.modo is None:
+                self.iniciar()
+
+    def _al_cambiar(self, documentos, cambios, hora_lectura):
+        # Se ejecuta en el hilo del listener
+        with self._candado:
+            if self._snapshot_completo:
+                # El primer snapshot tras iniciar() trae la consulta
+                # completa: reemplaza la copia, que puede conservar
+                # documentos borrados mientras el listener estuvo caído
+                nuevos = {doc.id: doc.to_dict() for doc in documentos}
+                self._snapshot_completo = False
+            else:
+                nuevos = dict(self._documentos)
+
+                for cambio in cambios:
+                    if cambio.type.name == "REMOVED":
+                        nuevos.pop(cambio.document.id, None)
+                    else:
+                        nuevos[cambio.document.id] = cambio.document.to_dict()
+
+            self._documentos = nuevos
+            self.version += 1
+
+        self._primer_snapshot.set()
+
+    def recargar(self):
+        nuevos = {doc.id: doc.to_dict() for doc in self._consulta().stream()}
+
+        with self._candado:
+            if nuevos != self._documentos:
+                self._documentos = nuevos
+                self.version += 1
+
+            self._ultima_carga = time.monotonic()
+            self._desactualizado = False
+
+    def marcar_desactualizado(self):
+        self._desactualizado = True
+
+    def documentos(self):
+        """
+        Devuelve {id: datos}. El diccionario no debe
+        modificarse.
+        """
+
+        vigilancia_cerrada = self.modo == "escucha" and not getattr(
+            self._vigilancia, "is_active", True
+        )
+        vencido = self._desactualizado or (
+            self.modo == "sondeo"
+            and time.monotonic() - self._ultima_carga
+            >= INTERVALO_SONDEO_ESPEJOS
+        )
+
+        # Si otra sesión ya está recargando se usa la copia actual
+        if (vigilancia_cerrada or vencido) and self._candado_recarga.acquire(
+            blocking=False
+        ):
+            try:
+                if vigilancia_cerrada:
+                    # El listener se cerró (red, credenciales): reiniciar
+                    self.iniciar()
+                else:
+                    self.recargar()
+            finally:
+                self._candado_recarga.release()
+
+        return self._documentos
+
+
+def obtener_espejo(db, nombre):
+    """
+    Devuelve el espejo del proceso para uno de los nombres
+    de ESPEJOS, iniciándolo la primera vez.
+    """
+
+    # El candado global solo protege el registro: la carga
+    # inicial se hace fuera de él, con el candado del espejo
+    with _candado_espejos:
+        espejo = _espejos.get(nombre)
+
+        if espejo is None:
+            coleccion, filtros = ESPEJOS[nombre]
+            espejo = EspejoColeccion(db, coleccion, filtros)
+            _espejos[nombre] = espejo
+
+    espejo.asegurar_iniciado()
+
+    return espejo
+
+
+def documentos_espejo(db, nombre):
+    """
+    {id: datos} de la colección reflejada, o {} sin conexión.
+    """
+
+    if not db:
+        return {}
+
+    return obtener_espejo(db, nombre).documentos()
+
+
+def invalidar_espejo(*nombres):
+    """
+    Fuerza una recarga en la próxima lectura. Se llama
+    después de escribir para que la misma sesión vea su
+    cambio aunque el listener aún no lo haya entregado.
+    """
+
+    for nombre in nombres:
+        espejo = _espejos.get(nombre)
+
+        if espejo:
+            espejo.marcar_desactualizado()
+
+
+# ------------------------------------------
+# CONSULTAS FRECUENTES
+# ------------------------------------------
+
+def maestros(db):
+    """
+    [(id, datos), ...] de todos los perfiles docentes.
+    """
+
+    return list(documentos_espejo(db, "maestros_perfil").items())
+
+
+def cargas_academicas(db, **criterios):
+    """
+    [(id, datos), ...] de carga_academica cuyos campos
+    coinciden con los criterios (p. ej. grado=..., es_guia=True).
+    """
+
+    return [
+        (id_doc, datos)
+        for id_doc, datos in documentos_espejo(db, "carga_academica").items()
+        if all(datos.get(campo) == valor for campo, valor in criterios.items())
+    ]
+
+
+def guias_por_grado(db):
+    """
+    {grado: nombre del maestro guía}.
+    """
+
+    return {
+        datos.get("grado"): datos.get("nombre_docente")
+        for _, datos in cargas_academicas(db, es_guia=True)
+    }
+
+
+def maestro_guia(db, grado, predeterminado="No Asignado"):
+    return guias_por_grado(db).get(grado, predeterminado)
@@ -0,0 +1,605 @@
+from datetime import datetime, timedelta
+
+from firebase_admin import firestore
+
+from config import TZ_SV
+
+
+# ==========================================
+# RANGOS DE FECHA (HORA DE EL SALVADOR)
+# ==========================================
+
+def limites_dia_sv(fecha):
+    """
+    Devuelve el inicio (incluido) y el fin (excluido)
+    de un día calendario en hora de El Salvador,
+    listos para comparar contra el campo "fecha".
+    """
+
+    inicio = TZ_SV.localize(
+        datetime.combine(fecha, datetime.min.time())
+    )
+
+    fin = TZ_SV.localize(
+        datetime.combine(
+            fecha + timedelta(days=1),
+            datetime.min.time()
+        )
+    )
+
+    return inicio, fin
+
+
+# ==========================================
+# CORTE DE CAJA
+# ==========================================
+
+def obtener_movimientos_dia(db, fecha):
+    """
+    Consulta únicamente las transacciones de un día
+    mediante un rango sobre el timestamp "fecha".
+
+    La consulta usa el índice automático de campo
+    único de "fecha"; no requiere índice compuesto.
+    """
+
+    inicio, fin = limites_dia_sv(fecha)
+
+    docs = (
+        db.collection("finanzas")
+        .where("fecha", ">=", inicio)
+        .where("fecha", "<", fin)
+        .order_by("fecha")
+        .stream()
+    )
+
+    return [doc.to_dict() for doc in docs]
+
+
+# ==========================================
+# RESUMEN INCREMENTAL (finanzas_resumen)
+# ==========================================
+
+COLECCION_RESUMEN = "finanzas_resumen"
+
+TIPOS_MOVIMIENTO = ["ingreso", "egreso", "interno"]
+
+# Documento de control dentro de finanzas_resumen. Existe solo
+# cuando los resúmenes cubren todas las transacciones (después
+# de reconstruir_resumen o de vaciar "finanzas"); antes de eso
+# los días anteriores a los resúmenes faltarían en los totales.
+ID_CONTROL_RESUMEN = "control"
+
+
+def _id_resumen_dia(fecha):
+    return f"dia_{fecha.isoformat()}"
+
+
+def _id_resumen_mes(fecha):
+    return f"mes_{fecha.strftime('%Y-%m')}"
+
+
+def _fecha_sv(fecha_db):
+    """
+    Convierte el timestamp almacenado en Firestore
+    a una fecha calendario de El Salvador.
+    """
+
+    if isinstance(fecha_db, datetime):
+        return fecha_db.astimezone(TZ_SV).date()
+
+    return datetime.fromtimestamp(fecha_db.timestamp(), TZ_SV).date()
+
+
+def registrar_movimiento(db, datos):
+    """
+    Guarda una transacción en "finanzas" y, en el mismo
+    lote atómico, incrementa los resúmenes del día y del
+    mes (totales por tipo y por grado).
+
+    El resumen se elige con la misma hora que queda en
+    "fecha": un SERVER_TIMESTAMP se reemplaza por la hora
+    local, así un cobro cerca de la medianoche no cae en
+    un día distinto al de la transacción.
+
+    Devuelve la referencia del documento creado.
+    """
+
+    tipo = datos["tipo"]
+    monto = datos["monto"]
+    grado = datos.get("grado")
+
+    if isinstance(datos.get("fecha"), datetime):
+        hoy = _fecha_sv(datos["fecha"])
+    else:
+        datos = {**datos, "fecha": datetime.now(TZ_SV)}
+        hoy = datos["fecha"].date()
+
+    ref = db.collection("finanzas").document()
+
+    batch = db.batch()
+    batch.set(ref, datos)
+
+    for periodo, clave, doc_id in (
+        ("dia", hoy.isoformat(), _id_resumen_dia(hoy)),
+        ("mes", hoy.strftime("%Y-%m"), _id_resumen_mes(hoy)),
+    ):
+        incremento = {
+            "periodo": periodo,
+            "clave": clave,
+            "total": {tipo: firestore.Increment(monto)},
+            "cantidad": {tipo: firestore.Increment(1)},
+        }
+
+        if grado:
+            incremento["grados"] = {
+                grado: {tipo: firestore.Increment(monto)}
+            }
+
+        batch.set(
+            db.collection(COLECCION_RESUMEN).document(doc_id),
+            incremento,
+            merge=True
+        )
+
+    batch.commit()
+
+    return ref
+
+
+# Movimientos por lote: un borrado cada uno más, como máximo,
+# dos resúmenes (día y mes) por movimiento
+TAM_BLOQUE_ELIMINACION = 150
+
+
+def eliminar_movimientos(db, consulta, grado_predeterminado=None):
+    """
+    Elimina las transacciones de una consulta y descuenta
+    sus montos de finanzas_resumen en el mismo lote, para
+    que el corte de caja y los reportes no sigan contando
+    dinero de movimientos borrados.
+
+    Solo se descuenta de los resúmenes que existen: los
+    movimientos anteriores a finanzas_resumen no tienen
+    uno. grado_predeterminado se usa para los movimientos
+    sin campo "grado" (reconstruir_resumen los asigna al
+    grado del alumno).
+
+    Devuelve la cantidad de movimientos eliminados.
+    """
+
+    docs = list(consulta.stream())
+    coleccion = db.collection(COLECCION_RESUMEN)
+    eliminados = 0
+
+    for inicio in range(0, len(docs), TAM_BLOQUE_ELIMINACION):
+        bloque = docs[inicio:inicio + TAM_BLOQUE_ELIMINACION]
+        descuentos = {}
+
+        for doc in bloque:
+            data = doc.to_dict()
+            tipo = data.get("tipo")
+
+            if not data.get("fecha") or tipo not in TIPOS_MOVIMIENTO:
+                continue
+
+            fecha = _fecha_sv(data["fecha"])
+            monto = data.get("monto", 0.0)
+            grado = data.get("grado") or grado_predeterminado
+
+            for doc_id in (_id_resumen_dia(fecha), _id_resumen_mes(fecha)):
+                descuento = descuentos.setdefault(
+                    doc_id,
+                    {"total": {}, "cantidad": {}, "grados": {}}
+                )
+
+                descuento["total"][tipo] = (
+                    descuento["total"].get(tipo, 0.0) + monto
+                )
+                descuento["cantidad"][tipo] = (
+                    descuento["cantidad"].get(tipo, 0) + 1
+                )
+
+                if grado:
+                    por_grado = descuento["grados"].setdefault(grado, {})
+                    por_grado[tipo] = por_grado.get(tipo, 0.0) + monto
+
+        existentes = {
+            snap.id
+            for snap in db.get_all(
+                [coleccion.document(doc_id) for doc_id in descuentos]
+            )
+            if snap.exists
+        }
+
+        batch = db.batch()
+
+        for doc in bloque:
+            batch.delete(doc.reference)
+
+        for doc_id, descuento in descuentos.items():
+            if doc_id not in existentes:
+                continue
+
+            cambios = {
+                "total": {
+                    tipo: firestore.Increment(-monto)
+                    for tipo, monto in descuento["total"].items()
+                },
+                "cantidad": {
+                    tipo: firestore.Increment(-cantidad)
+                    for tipo, cantidad in descuento["cantidad"].items()
+                },
+            }
+
+            # Un mapa vacío con merge=True reemplazaría el mapa completo
+            if descuento["grados"]:
+                cambios["grados"] = {
+                    grado: {
+                        tipo: firestore.Increment(-monto)
+                        for tipo, monto in por_tipo.items()
+                    }
+                    for grado, por_tipo in descuento["grados"].items()
+                }
+
+            batch.set(coleccion.document(doc_id), cambios, merge=True)
+
+        batch.commit()
+        eliminados += len(bloque)
+
+    return eliminados
+
+
+def obtener_resumen_dia(db, fecha):
+    """
+    Devuelve el resumen de un día (una sola lectura)
+    o None si ese día no tiene resumen.
+    """
+
+    snap = (
+        db.collection(COLECCION_RESUMEN)
+        .document(_id_resumen_dia(fecha))
+        .get()
+    )
+
+    return snap.to_dict() if snap.exists else None
+
+
+def resumen_completo(db):
+    """
+    True si finanzas_resumen cubre todas las transacciones
+    y los reportes pueden leer sus totales.
+    """
+
+    snap = (
+        db.collection(COLECCION_RESUMEN)
+        .document(ID_CONTROL_RESUMEN)
+        .get()
+    )
+
+    return snap.exists and bool(snap.to_dict().get("completo"))
+
+
+def marcar_resumen_completo(db):
+    db.collection(COLECCION_RESUMEN).document(ID_CONTROL_RESUMEN).set(
+        {
+            "completo": True,
+            "actualizado": firestore.SERVER_TIMESTAMP,
+        }
+    )
+
+
+def _referencias_periodo(db, inicio, fin):
+    """
+    Cubre el rango [inicio, fin] con la menor cantidad
+    de resúmenes: meses completos y días sueltos en
+    los extremos.
+    """
+
+    coleccion = db.collection(COLECCION_RESUMEN)
+    referencias = []
+    actual = inicio
+
+    while actual <= fin:
+        siguiente_mes = (
+            actual.replace(day=28) + timedelta(days=4)
+        ).replace(day=1)
+        fin_mes = siguiente_mes - timedelta(days=1)
+
+        if actual.day == 1 and fin_mes <= fin:
+            referencias.append(
+                coleccion.document(_id_resumen_mes(actual))
+            )
+            actual = siguiente_mes
+        else:
+            referencias.append(
+                coleccion.document(_id_resumen_dia(actual))
+            )
+            actual += timedelta(days=1)
+
+    return referencias
+
+
+def totales_periodo(db, inicio, fin, tipos, grado=None):
+    """
+    Suma los totales por tipo entre dos fechas (incluidas)
+    leyendo solo documentos de finanzas_resumen.
+
+    Solo es exacto si resumen_completo(db) es True.
+    """
+
+    totales = {tipo: 0.0 for tipo in tipos}
+
+    for snap in db.get_all(_referencias_periodo(db, inicio, fin)):
+        if not snap.exists:
+            continue
+
+        data = snap.to_dict()
+
+        if grado:
+            fuente = data.get("grados", {}).get(grado, {})
+        else:
+            fuente = data.get("total", {})
+
+        for tipo in tipos:
+            totales[tipo] += fuente.get(tipo, 0.0)
+
+    return totales
+
+
+def completar_grado_finanzas(db):
+    """
+    Agrega el campo "grado" a los cobros antiguos que
+    solo guardaban alumno_nie, usando el grado actual
+    del alumno. Devuelve la cantidad de documentos
+    actualizados.
+    """
+
+    mapa_grados = {
+        doc.id: doc.to_dict().get("grado_actual")
+        for doc in db.collection("alumnos").stream()
+    }
+
+    batch = db.batch()
+    pendientes = 0
+    actualizados = 0
+
+    for doc in db.collection("finanzas").stream():
+        data = doc.to_dict()
+        grado = mapa_grados.get(data.get("alumno_nie"))
+
+        if "grado" in data or not grado:
+            continue
+
+        batch.update(doc.reference, {"grado": grado})
+        pendientes += 1
+        actualizados += 1
+
+        if pendientes == 500:
+            batch.commit()
+            batch = db.batch()
+            pendientes = 0
+
+    if pendientes:
+        batch.commit()
+
+    return actualizados
+
+
+def reconstruir_resumen(db, progreso=None):
+    """
+    Recalcula finanzas_resumen desde cero a partir de
+    todas las transacciones de "finanzas" y lo marca como
+    completo para los reportes.
+
+    El grado se toma del propio movimiento y, si no lo
+    tiene, del grado actual del alumno.
+    """
+
+    mapa_grados = {
+        doc.id: doc.to_dict().get("grado_actual")
+        for doc in db.collection("alumnos").stream()
+    }
+
+    resumenes = {}
+    procesados = 0
+
+    for doc in db.collection("finanzas").stream():
+        data = doc.to_dict()
+        procesados += 1
+
+        if not data.get("fecha") or data.get("tipo") not in TIPOS_MOVIMIENTO:
+            continue
+
+        fecha = _fecha_sv(data["fecha"])
+        tipo = data["tipo"]
+        monto = data.get("monto", 0.0)
+        grado = data.get("grado") or mapa_grados.get(data.get("alumno_nie"))
+
+        for periodo, clave, doc_id in (
+            ("dia", fecha.isoformat(), _id_resumen_dia(fecha)),
+            ("mes", fecha.strftime("%Y-%m"), _id_resumen_mes(fecha)),
+        ):
+            resumen = resumenes.setdefault(
+                doc_id,
+                {
+                    "periodo": periodo,
+                    "clave": clave,
+                    "total": {},
+                    "cantidad": {},
+                    "grados": {},
+                }
+            )
+
+            resumen["total"][tipo] = resumen["total"].get(tipo, 0.0) + monto
+            resumen["cantidad"][tipo] = resumen["cantidad"].get(tipo, 0) + 1
+
+            if grado:
+                por_grado = resumen["grados"].setdefault(grado, {})
+                por_grado[tipo] = por_grado.get(tipo, 0.0) + monto
+
+        if progreso and procesados % 500 == 0:
+            progreso(procesados)
+
+    coleccion = db.collection(COLECCION_RESUMEN)
+
+    batch = db.batch()
+    pendientes = 0
+
+    # Los resúmenes sin transacciones se eliminan; el resto
+    # se sobrescribe completo.
+    obsoletos = [
+        doc.reference
+        for doc in coleccion.stream()
+        if doc.id not in resumenes and doc.id != ID_CONTROL_RESUMEN
+    ]
+
+    escrituras = [
+        (ref, None) for ref in obsoletos
+    ] + [
+        (coleccion.document(doc_id), resumen)
+        for doc_id, resumen in resumenes.items()
+    ]
+
+    for ref, resumen in escrituras:
+        if resumen is None:
+            batch.delete(ref)
+        else:
+            batch.set(ref, resumen)
+
+        pendientes += 1
+
+        if pendientes == 500:
+            batch.commit()
+            batch = db.batch()
+            pendientes = 0
+
+    if pendientes:
+        batch.commit()
+
+    marcar_resumen_completo(db)
+
+    return procesados, len(resumenes)
+
+
+# ==========================================
+# REPORTES FINANCIEROS
+# ==========================================
+
+def paginar_movimientos(db, inicio, fin, tipos, grado=None, tam_pagina=300):
+    """
+    Recorre las transacciones entre dos fechas (incluidas)
+    filtrando tipo y grado en Firestore, en páginas con
+    cursor ordenadas de la más reciente a la más antigua.
+
+    Índices compuestos requeridos (firestore.indexes.json):
+    tipo + fecha DESC y grado + tipo + fecha DESC.
+    """
+
+    if not tipos:
+        return
+
+    inicio_sv, _ = limites_dia_sv(inicio)
+    _, fin_sv = limites_dia_sv(fin)
+
+    consulta = (
+        db.collection("finanzas")
+        .where("fecha", ">=", inicio_sv)
+        .where("fecha", "<", fin_sv)
+        .where("tipo", "in", list(tipos))
+    )
+
+    if grado:
+        consulta = consulta.where("grado", "==", grado)
+
+    consulta = consulta.order_by(
+        "fecha",
+        direction=firestore.Query.DESCENDING
+    )
+
+    ultimo = None
+
+    while True:
+        pagina = consulta.limit(tam_pagina)
+
+        if ultimo is not None:
+            pagina = pagina.start_after(ultimo)
+
+        docs = list(pagina.stream())
+
+        if not docs:
+            return
+
+        filas = []
+
+        for doc in docs:
+            data = doc.to_dict()
+            data["grado_reporte"] = data.get("grado") or "-"
+            filas.append(data)
+
+        yield filas
+
+        if len(docs) < tam_pagina:
+            return
+
+        ultimo = docs[-1]
+
+
+# ==========================================
+# DUPLICADOS DEL DÍA
+# ==========================================
+
+def verificar_pago_duplicado_hoy(db, docente_id, tipo_gasto):
+    """
+    True si ya se registró hoy un pago de salario
+    para el docente.
+    """
+
+    if "Salario" not in tipo_gasto:
+        return False
+
+    docs = (
+        db.collection("finanzas")
+        .where("docente_id", "==", docente_id)
+        .where("tipo", "==", "egreso")
+        .stream()
+    )
+
+    hoy = datetime.now(TZ_SV).date()
+
+    for d in docs:
+        data = d.to_dict()
+        fecha_db = data.get("fecha")
+
+        if (
+            fecha_db
+            and _fecha_sv(fecha_db) == hoy
+            and "Salario" in data.get("descripcion", "")
+        ):
+            return True
+
+    return False
+
+
+def existe_duplicado(db, coleccion, campo_id, id_valor, descripcion):
+    """
+    True si ya existe hoy un movimiento con el mismo
+    concepto para la misma persona.
+    """
+
+    docs = (
+        db.collection(coleccion)
+        .where(campo_id, "==", id_valor)
+        .where("descripcion", "==", descripcion)
+        .stream()
+    )
+
+    hoy = datetime.now(TZ_SV).date()
+
+    for d in docs:
+        fecha_db = d.to_dict().get("fecha")
+
+        if fecha_db and _fecha_sv(fecha_db) == hoy:
+            return True
+
+    return False
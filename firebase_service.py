@@ -1,7 +1,10 @@
 import os
+import time
 import streamlit as st
 import firebase_admin
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 from firebase_admin import credentials, firestore, storage
 
 
@@ -105,4 +108,122 @@ def subir_archivo(archivo, ruta):
 
     except Exception as error:
         st.error(f"Error al subir archivo: {error}")
-        return None
\ No newline at end of file
+        return None
+
+
+# ==========================================
+# ELIMINACIÓN MASIVA
+# ==========================================
+
+TAM_LOTE_FIRESTORE = 500
+
+
+def _confirmar_borrado(db, referencias, reintentos=5):
+    """
+    Elimina un lote de referencias en un solo commit,
+    reintentando con espera exponencial ante fallos
+    transitorios.
+    """
+
+    for intento in range(reintentos):
+        try:
+            batch = db.batch()
+
+            for referencia in referencias:
+                batch.delete(referencia)
+
+            batch.commit()
+
+            return len(referencias)
+
+        except Exception:
+            if intento == reintentos - 1:
+                raise
+
+            time.sleep(0.5 * (2 ** intento))
+
+
+def eliminar_por_consulta(
+    db,
+    consulta,
+    progreso=None,
+    tam_lote=TAM_LOTE_FIRESTORE,
+    max_hilos=4,
+):
+    """
+    Elimina todos los documentos de una consulta o
+    colección.
+
+    Recorre la consulta en páginas con cursor (solo
+    lee los IDs), borra cada página en un lote completo
+    y mantiene como máximo max_hilos lotes en vuelo.
+    progreso(eliminados) se invoca desde el hilo que
+    llama, por lo que puede actualizar la interfaz.
+
+    Devuelve la cantidad de documentos eliminados.
+    """
+
+    consulta = consulta.select(["__name__"])
+
+    eliminados = 0
+    ultimo = None
+    en_vuelo = set()
+
+    def recoger(terminados):
+        nonlocal eliminados
+
+        for futuro in terminados:
+            eliminados += futuro.result()
+
+        if progreso and terminados:
+            progreso(eliminados)
+
+    with ThreadPoolExecutor(max_workers=max_hilos) as pool:
+        while True:
+            pagina = consulta.limit(tam_lote)
+
+            if ultimo is not None:
+                pagina = pagina.start_after(ultimo)
+
+            docs = list(pagina.stream())
+
+            if not docs:
+                break
+
+            en_vuelo.add(
+                pool.submit(
+                    _confirmar_borrado,
+                    db,
+                    [doc.reference for doc in docs]
+                )
+            )
+
+            if len(en_vuelo) >= max_hilos:
+                terminados, en_vuelo = wait(
+                    en_vuelo,
+                    return_when=FIRST_COMPLETED
+                )
+                recoger(terminados)
+
+            if len(docs) < tam_lote:
+                break
+
+            ultimo = docs[-1]
+
+        recoger(wait(en_vuelo).done)
+
+    return eliminados
+
+
+
+def contar_documentos(consulta):
+    """
+    Cuenta los documentos de una consulta con una
+    agregación count() en el servidor: no descarga
+    ningún documento y se factura una lectura por
+    cada 1000 índices recorridos.
+    """
+
+    resultado = consulta.count(alias="total").get()
+
+    return int(resultado[0][0].value)
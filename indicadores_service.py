@@ -0,0 +1,121 @@
+import streamlit as st
+
+from academic_config import LISTA_GRADOS_TODO, LISTA_MESES
+from asistencia_service import asistencia_dia
+from config import CICLO_LECTIVO
+from finanzas_service import (
+    obtener_movimientos_dia,
+    obtener_resumen_dia,
+    resumen_completo,
+)
+from firebase_service import contar_documentos
+from notas_service import materias_pendientes_mes
+
+
+# ==========================================
+# INDICADORES DEL TABLERO DE INICIO
+# ==========================================
+#
+# Cada indicador sale de una agregación count() o de un
+# documento de resumen, nunca de recorrer colecciones: el
+# tablero completo cuesta unas pocas lecturas. La única
+# excepción son los ingresos del día mientras finanzas_resumen
+# no se haya reconstruido. Se guardan 60 segundos en caché,
+# compartidos entre sesiones.
+
+
+def mes_lectivo(fecha):
+    """
+    Mes de LISTA_MESES al que corresponde la fecha,
+    o None fuera del año escolar (febrero a octubre).
+    """
+
+    indice = fecha.month - 2
+
+    if 0 <= indice < len(LISTA_MESES):
+        return LISTA_MESES[indice]
+
+    return None
+
+
+def _intentar(calcular):
+    # Un indicador que falla (sin conexión, índice faltante)
+    # no debe impedir que se muestren los demás
+    try:
+        return calcular()
+    except Exception:
+        return None
+
+
+def _ingresos_dia(db, fecha):
+    # Antes de reconstruir finanzas_resumen el resumen del día
+    # puede estar incompleto: se suman las transacciones
+    if not resumen_completo(db):
+        return sum(
+            d.get("monto", 0.0)
+            for d in obtener_movimientos_dia(db, fecha)
+            if d.get("tipo") == "ingreso"
+        )
+
+    resumen = obtener_resumen_dia(db, fecha)
+
+    if not resumen:
+        return 0.0
+
+    return resumen.get("total", {}).get("ingreso", 0.0)
+
+
+def _asistencia_dia(db, fecha, ciclo_lectivo):
+    tomados, conteos = asistencia_dia(
+        db,
+        fecha,
+        LISTA_GRADOS_TODO,
+        ciclo_lectivo
+    )
+
+    return {
+        "grados_tomados": tomados,
+        "grados": len(LISTA_GRADOS_TODO),
+        "presentes": conteos.get("Presente", 0),
+        "registros": sum(conteos.values()),
+    }
+
+
+def _notas_pendientes(db, fecha, ciclo_lectivo):
+    mes = mes_lectivo(fecha)
+
+    if mes is None:
+        return None
+
+    pendientes, esperadas = materias_pendientes_mes(db, mes, ciclo_lectivo)
+
+    return {"mes": mes, "pendientes": pendientes, "esperadas": esperadas}
+
+
+@st.cache_data(show_spinner=False, ttl=60)
+def indicadores_inicio(_db, fecha, ciclo_lectivo=CICLO_LECTIVO):
+    """
+    Indicadores del tablero administrativo para la fecha.
+
+    Los valores que no se pudieron calcular quedan en None.
+    """
+
+    return {
+        "alumnos_activos": _intentar(
+            lambda: contar_documentos(
+                _db.collection("alumnos").where("estado", "==", "Activo")
+            )
+        ),
+        "docentes_activos": _intentar(
+            lambda: contar_documentos(
+                _db.collection("maestros_perfil").where("activo", "==", True)
+            )
+        ),
+        "ingresos_dia": _intentar(lambda: _ingresos_dia(_db, fecha)),
+        "asistencia_dia": _intentar(
+            lambda: _asistencia_dia(_db, fecha, ciclo_lectivo)
+        ),
+        "notas_pendientes": _intentar(
+            lambda: _notas_pendientes(_db, fecha, ciclo_lectivo)
+        ),
+    }
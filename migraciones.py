@@ -0,0 +1,186 @@
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from firebase_admin import firestore
+
+
+# ============================================================
+# EJECUTOR DE MIGRACIONES
+# ============================================================
+#
+# Cada colección de una migración tiene su propio documento de
+# control en migraciones/{nombre}_{coleccion} con el último ID
+# procesado; así los hilos nunca escriben el mismo documento. El
+# cursor se guarda en el mismo lote que las actualizaciones, por
+# lo que una ejecución interrumpida continúa exactamente desde la
+# última página confirmada.
+
+COLECCION_CONTROL = "migraciones"
+
+# Un lote admite 500 escrituras; se reserva una para el cursor.
+TAM_PAGINA_MIGRACION = 499
+
+
+def migrar_coleccion(
+    db,
+    control_ref,
+    coleccion,
+    transformar,
+    detener,
+    tam_pagina=TAM_PAGINA_MIGRACION,
+    informar=print,
+):
+    """
+    Recorre una colección por páginas ordenadas por ID
+    y aplica transformar(data) a cada documento.
+
+    transformar devuelve el diccionario de campos a
+    actualizar, o None si el documento no cambia.
+
+    Devuelve (actualizados, ignorados, procesados) de
+    esta ejecución.
+    """
+
+    control = control_ref.get()
+    control = control.to_dict() if control.exists else {}
+
+    if control.get("completada"):
+        informar(f"   {coleccion}: ya migrada, se omite.")
+        return 0, 0, 0
+
+    referencia_coleccion = db.collection(coleccion)
+    consulta = referencia_coleccion.order_by("__name__")
+
+    ultimo_id = control.get("cursor")
+
+    if ultimo_id:
+        informar(f"   {coleccion}: reanudando después de {ultimo_id}")
+
+    actualizados = 0
+    ignorados = 0
+    procesados = 0
+    inicio = time.monotonic()
+
+    while not detener.is_set():
+        pagina = consulta.limit(tam_pagina)
+
+        if ultimo_id:
+            pagina = pagina.start_after(
+                {"__name__": referencia_coleccion.document(ultimo_id)}
+            )
+
+        docs = list(pagina.stream())
+
+        if not docs:
+            break
+
+        batch = db.batch()
+        cambios = 0
+
+        for doc in docs:
+            actualizacion = transformar(doc.to_dict())
+
+            if actualizacion:
+                batch.update(doc.reference, actualizacion)
+                cambios += 1
+
+        ultimo_id = docs[-1].id
+
+        batch.set(
+            control_ref,
+            {
+                "coleccion": coleccion,
+                "cursor": ultimo_id,
+                "actualizado": firestore.SERVER_TIMESTAMP,
+            },
+            merge=True
+        )
+
+        batch.commit()
+
+        actualizados += cambios
+        ignorados += len(docs) - cambios
+        procesados += len(docs)
+
+        transcurrido = max(time.monotonic() - inicio, 1e-6)
+
+        informar(
+            f"   {coleccion}: {procesados} documentos "
+            f"({procesados / transcurrido:.0f} docs/s)"
+        )
+
+        if len(docs) < tam_pagina:
+            break
+
+    if not detener.is_set():
+        control_ref.set(
+            {"completada": True},
+            merge=True
+        )
+
+    return actualizados, ignorados, procesados
+
+
+def ejecutar_migracion(
+    db,
+    nombre,
+    colecciones,
+    transformar,
+    informar=print,
+):
+    """
+    Migra varias colecciones en paralelo (un hilo por
+    colección) y devuelve {coleccion: resultado}, donde
+    resultado es la tupla de migrar_coleccion o la
+    excepción que detuvo esa colección.
+
+    Ante Ctrl+C se detienen todas después de confirmar
+    la página en curso.
+    """
+
+    detener = threading.Event()
+    resultados = {}
+    inicio = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=len(colecciones)) as pool:
+        futuros = {
+            coleccion: pool.submit(
+                migrar_coleccion,
+                db,
+                db.collection(COLECCION_CONTROL).document(
+                    f"{nombre}_{coleccion}"
+                ),
+                coleccion,
+                transformar,
+                detener,
+                informar=informar,
+            )
+            for coleccion in colecciones
+        }
+
+        try:
+            for coleccion, futuro in futuros.items():
+                try:
+                    resultados[coleccion] = futuro.result()
+                except Exception as error:
+                    resultados[coleccion] = error
+
+        except KeyboardInterrupt:
+            detener.set()
+            raise
+
+    total = sum(
+        r[2] for r in resultados.values()
+        if isinstance(r, tuple)
+    )
+
+    transcurrido = max(time.monotonic() - inicio, 1e-6)
+
+    informar(
+        f"   Total: {total} documentos en {transcurrido:.1f} s "
+        f"({total / transcurrido:.0f} docs/s)"
+    )
+
+    return resultados
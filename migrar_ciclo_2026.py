@@ -1,4 +1,5 @@
 from firebase_service import conectar_firebase
+from migraciones import ejecutar_migracion
 
 
 # ============================================================
@@ -8,11 +9,14 @@ from firebase_service import conectar_firebase
 CICLO_ORIGEN = 2026
 
 
+NOMBRE_MIGRACION = f"ciclo_lectivo_{CICLO_ORIGEN}"
+
+
 # ============================================================
-# MIGRAR UNA COLECCIÓN
+# TRANSFORMACIÓN DE CADA DOCUMENTO
 # ============================================================
 
-def migrar_coleccion(db, nombre_coleccion):
+def agregar_ciclo(data):
     """
     Agrega ciclo_lectivo=2026 únicamente a los documentos
     que todavía no poseen ese campo.
@@ -23,45 +27,10 @@ def migrar_coleccion(db, nombre_coleccion):
     NO cambia estados.
     """
 
-    print(f"   Abriendo colección: {nombre_coleccion}")
-
-    docs = db.collection(nombre_coleccion).stream()
-
-    print(f"   Lectura iniciada: {nombre_coleccion}")
-
-    actualizados = 0
-    ignorados = 0
-    procesados = 0
-
-    for doc in docs:
-
-        procesados += 1
-
-        data = doc.to_dict()
+    if "ciclo_lectivo" in data:
+        return None
 
-        # ----------------------------------------------------
-        # Solo migramos documentos que NO tienen ciclo_lectivo
-        # ----------------------------------------------------
-
-        if "ciclo_lectivo" not in data:
-
-            doc.reference.update({
-                "ciclo_lectivo": CICLO_ORIGEN
-            })
-
-            actualizados += 1
-
-        else:
-            ignorados += 1
-
-        # Mostrar progreso cada 100 documentos
-        if procesados % 100 == 0:
-            print(
-                f"   {nombre_coleccion}: "
-                f"{procesados} documentos procesados..."
-            )
-
-    return actualizados, ignorados, procesados
+    return {"ciclo_lectivo": CICLO_ORIGEN}
 
 
 # ============================================================
@@ -117,58 +86,64 @@ def main():
     total_procesados = 0
 
     # --------------------------------------------------------
-    # MIGRACIÓN
+    # MIGRACIÓN (colecciones en paralelo, reanudable)
     # --------------------------------------------------------
 
+    print()
+    print("-" * 60)
+    print(f"Procesando colecciones: {', '.join(colecciones)}")
+    print("-" * 60)
+
+    try:
+
+        resultados = ejecutar_migracion(
+            db,
+            NOMBRE_MIGRACION,
+            colecciones,
+            agregar_ciclo
+        )
+
+    except KeyboardInterrupt:
+
+        print()
+        print()
+        print("⚠️ MIGRACIÓN INTERRUMPIDA POR EL USUARIO.")
+        print(
+            "Los documentos ya actualizados permanecen seguros."
+        )
+        print(
+            "Al ejecutar nuevamente el script se continuará "
+            "desde la última página confirmada."
+        )
+        return
+
     for coleccion in colecciones:
 
+        resultado = resultados[coleccion]
+
         print()
-        print("-" * 60)
-        print(f"Procesando colección: {coleccion}")
-        print("-" * 60)
-
-        try:
-
-            actualizados, ignorados, procesados = migrar_coleccion(
-                db,
-                coleccion
-            )
-
-            total_actualizados += actualizados
-            total_ignorados += ignorados
-            total_procesados += procesados
-
-            print()
-            print(
-                f"✅ {coleccion}: "
-                f"{actualizados} actualizados | "
-                f"{ignorados} ya tenían ciclo | "
-                f"{procesados} procesados"
-            )
-
-        except KeyboardInterrupt:
-
-            print()
-            print()
-            print("⚠️ MIGRACIÓN INTERRUMPIDA POR EL USUARIO.")
-            print(
-                "Los documentos ya actualizados permanecen seguros."
-            )
-            print(
-                "Puedes ejecutar nuevamente el script."
-            )
-            return
-
-        except Exception as error:
-
-            print()
-            print(f"❌ ERROR EN LA COLECCIÓN '{coleccion}':")
-            print(error)
+
+        if isinstance(resultado, Exception):
 
             # No detenemos toda la migración.
-            # Intentamos continuar con la siguiente colección.
+            # Las demás colecciones continúan.
+            print(f"❌ ERROR EN LA COLECCIÓN '{coleccion}':")
+            print(resultado)
             continue
 
+        actualizados, ignorados, procesados = resultado
+
+        total_actualizados += actualizados
+        total_ignorados += ignorados
+        total_procesados += procesados
+
+        print(
+            f"✅ {coleccion}: "
+            f"{actualizados} actualizados | "
+            f"{ignorados} ya tenían ciclo | "
+            f"{procesados} procesados"
+        )
+
     # --------------------------------------------------------
     # RESUMEN
     # --------------------------------------------------------
@@ -0,0 +1,369 @@
+import io
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+from academic_config import LISTA_MESES, MAPA_CURRICULAR
+from config import CICLO_LECTIVO
+from notas_service import columnas_materia, guardar_notas_mes
+
+
+# ==========================================
+# IMPORTACIÓN DE NOTAS DESDE EXCEL
+# ==========================================
+#
+# Cada hoja del libro corresponde a una materia y un mes:
+#
+#   MATERIA | Matemáticas y Datos
+#   MES     | Febrero
+#   NIE | NOMBRE | ACT1 | ACT2 | ALT1 | ALT2 | EXAM
+#   ...una fila por alumno...
+#
+# Conducta usa una sola columna CONDUCTA. La columna PROM de la
+# Hoja de Control se ignora: el promedio siempre se recalcula.
+#
+# La plantilla trae la nómina completa en cada hoja, así que una
+# celda vacía significa "sin nota", nunca 0: las filas sin
+# ninguna nota y las hojas vacías no se importan, y una celda
+# vacía conserva la nota que el alumno ya tenía guardada.
+
+ENCABEZADOS_EXCEL = {
+    "ACT1": "Act1 (25%)",
+    "ACT2": "Act2 (25%)",
+    "ALT1": "Alt1 (10%)",
+    "ALT2": "Alt2 (10%)",
+    "EXAM": "Examen (30%)",
+    "EXAMEN": "Examen (30%)",
+    "CONDUCTA": "Nota Conducta",
+}
+
+TITULOS_PLANTILLA = {
+    "Act1 (25%)": "ACT1",
+    "Act2 (25%)": "ACT2",
+    "Alt1 (10%)": "ALT1",
+    "Alt2 (10%)": "ALT2",
+    "Examen (30%)": "EXAM",
+    "Nota Conducta": "CONDUCTA",
+}
+
+# Límite de Excel para el nombre de una hoja
+LARGO_TITULO_HOJA = 31
+
+# Celda vacía: el alumno no tiene esa nota en el libro
+SIN_NOTA = float("nan")
+
+
+def _texto(valor):
+    if valor is None:
+        return ""
+
+    return str(valor).strip()
+
+
+def _nie(valor):
+    # Un NIE escrito como número vuelve de Excel como int o float
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+
+    return _texto(valor)
+
+
+def _nota(valor):
+    """
+    Convierte una celda en nota. Las celdas vacías no
+    son una nota (NaN), no un cero. Devuelve None si el
+    valor no es una nota válida.
+    """
+
+    if valor is None or _texto(valor) == "":
+        return SIN_NOTA
+
+    try:
+        nota = float(_texto(valor).replace(",", "."))
+    except ValueError:
+        return None
+
+    if not 0.0 <= nota <= 10.0:
+        return None
+
+    return nota
+
+
+def generar_plantilla(grado, materias, meses, alumnos):
+    """
+    Libro con una hoja por materia y mes, con la nómina
+    del grado ya escrita. Devuelve los bytes del .xlsx.
+    """
+
+    libro = Workbook(write_only=True)
+    numero = 0
+
+    for materia in materias:
+        columnas = columnas_materia(materia)
+
+        for mes in meses:
+            numero += 1
+            sufijo = f" {mes[:3]}"
+            titulo = f"{numero:02d} {materia}"
+
+            hoja = libro.create_sheet(
+                title=(
+                    titulo[:LARGO_TITULO_HOJA - len(sufijo)] + sufijo
+                )
+            )
+
+            hoja.append(["MATERIA", materia])
+            hoja.append(["MES", mes])
+            hoja.append(["GRADO", grado])
+            hoja.append([])
+            hoja.append(
+                ["NIE", "NOMBRE"]
+                + [TITULOS_PLANTILLA[c] for c in columnas]
+            )
+
+            for alumno in alumnos:
+                hoja.append([alumno["nie"], alumno["nombre"]])
+
+    salida = io.BytesIO()
+    libro.save(salida)
+
+    return salida.getvalue()
+
+
+def leer_libro_notas(archivo, grado, nies_validos):
+    """
+    Lee el libro en modo de solo lectura (fila por fila,
+    sin cargarlo completo en memoria) y valida cada hoja.
+
+    Devuelve (hojas, errores). Cada hoja es un diccionario
+    con "materia", "mes", "columnas" y "df" (NIE y una
+    columna por actividad).
+    """
+
+    materias_grado = MAPA_CURRICULAR.get(grado, [])
+    hojas = []
+    errores = []
+    vistas = set()
+
+    libro = load_workbook(archivo, read_only=True, data_only=True)
+
+    try:
+        for hoja in libro.worksheets:
+            materia = None
+            mes = None
+            encabezados = None
+            filas = []
+
+            for numero, celdas in enumerate(
+                hoja.iter_rows(values_only=True),
+                start=1
+            ):
+                if not any(_texto(c) for c in celdas):
+                    continue
+
+                clave = _texto(celdas[0]).upper()
+
+                if encabezados is None:
+                    if clave == "MATERIA" and len(celdas) > 1:
+                        materia = _texto(celdas[1])
+                    elif clave == "MES" and len(celdas) > 1:
+                        mes = _texto(celdas[1]).capitalize()
+                    elif clave == "NIE":
+                        encabezados = [
+                            ENCABEZADOS_EXCEL.get(_texto(c).upper())
+                            for c in celdas
+                        ]
+                    continue
+
+                nie = _nie(celdas[0])
+
+                if nie:
+                    filas.append((numero, nie, celdas))
+
+            lugar = f"Hoja '{hoja.title}'"
+
+            if materia not in materias_grado:
+                errores.append(
+                    f"{lugar}: la materia '{materia}' no pertenece "
+                    f"a {grado}."
+                )
+                continue
+
+            if mes not in LISTA_MESES:
+                errores.append(f"{lugar}: mes '{mes}' no válido.")
+                continue
+
+            if (materia, mes) in vistas:
+                errores.append(
+                    f"{lugar}: {materia} - {mes} aparece en más de una hoja."
+                )
+                continue
+
+            vistas.add((materia, mes))
+
+            columnas = columnas_materia(materia)
+            posiciones = {}
+
+            for columna in columnas:
+                if encabezados is None or columna not in encabezados:
+                    errores.append(
+                        f"{lugar}: falta la columna "
+                        f"{TITULOS_PLANTILLA[columna]}."
+                    )
+                    break
+
+                posiciones[columna] = encabezados.index(columna)
+
+            else:
+                registros = []
+                nies_hoja = set()
+
+                for numero, nie, celdas in filas:
+                    if nie not in nies_validos:
+                        errores.append(
+                            f"{lugar}, fila {numero}: el NIE {nie} no está "
+                            f"en la nómina activa de {grado}."
+                        )
+                        continue
+
+                    if nie in nies_hoja:
+                        errores.append(
+                            f"{lugar}, fila {numero}: el NIE {nie} está repetido."
+                        )
+                        continue
+
+                    nies_hoja.add(nie)
+                    registro = {"NIE": nie}
+                    con_notas = False
+
+                    for columna, posicion in posiciones.items():
+                        valor = (
+                            celdas[posicion]
+                            if posicion < len(celdas)
+                            else None
+                        )
+                        nota = _nota(valor)
+
+                        if nota is None:
+                            errores.append(
+                                f"{lugar}, fila {numero}: "
+                                f"{TITULOS_PLANTILLA[columna]} = '{valor}' "
+                                "no es una nota entre 0 y 10."
+                            )
+                            nota = SIN_NOTA
+
+                        registro[columna] = nota
+                        con_notas = con_notas or pd.notna(nota)
+
+                    if con_notas:
+                        registros.append(registro)
+
+                if not registros:
+                    continue
+
+                hojas.append(
+                    {
+                        "materia": materia,
+                        "mes": mes,
+                        "columnas": columnas,
+                        "df": pd.DataFrame(
+                            registros,
+                            columns=["NIE"] + columnas
+                        ),
+                    }
+                )
+
+    finally:
+        libro.close()
+
+    return hojas, errores
+
+
+def importar_hojas(
+    db,
+    grado,
+    hojas,
+    id_documento,
+    ciclo_lectivo=CICLO_LECTIVO,
+):
+    """
+    Guarda todas las hojas validadas. id_documento(materia,
+    mes) devuelve el ID de notas_mensuales de la pantalla.
+
+    Los registros actuales se leen en una sola llamada y
+    cada hoja se guarda con guardar_notas_mes, por lo que
+    solo se escriben los alumnos cuyas notas cambian. Las
+    celdas vacías conservan la nota ya guardada.
+
+    Cada hoja se confirma por separado. Si una falla, la
+    importación se detiene ahí y devuelve el error; volver
+    a importar el mismo libro la completa, porque las hojas
+    ya guardadas no tienen cambios y no se reescriben.
+
+    Devuelve (resultados, error): resultados es
+    [(materia, mes, alumnos guardados), ...] de las hojas
+    guardadas y error es None o el mensaje de la hoja que
+    falló.
+    """
+
+    referencias = [
+        db.collection("notas_mensuales").document(
+            id_documento(hoja["materia"], hoja["mes"])
+        )
+        for hoja in hojas
+    ]
+
+    guardados_por_id = {
+        snap.id: (
+            snap.to_dict().get("detalles", {})
+            if snap.exists
+            else {}
+        )
+        for snap in db.get_all(referencias)
+    }
+
+    resultados = []
+
+    for hoja, referencia in zip(hojas, referencias):
+        columnas = hoja["columnas"]
+        detalles = guardados_por_id.get(referencia.id, {})
+
+        original = pd.DataFrame(
+            {
+                "NIE": hoja["df"]["NIE"],
+                **{
+                    columna: hoja["df"]["NIE"].map(
+                        lambda nie, c=columna: (
+                            detalles.get(nie, {}).get(c, SIN_NOTA)
+                        )
+                    )
+                    for columna in columnas
+                },
+            }
+        )
+
+        editado = hoja["df"].copy()
+
+        for columna in columnas:
+            editado[columna] = editado[columna].fillna(original[columna])
+
+        try:
+            guardados = guardar_notas_mes(
+                db,
+                grado,
+                hoja["materia"],
+                hoja["mes"],
+                referencia.id,
+                original,
+                editado,
+                columnas,
+                set(detalles),
+                ciclo_lectivo,
+            )
+
+        except Exception as e:
+            return resultados, f"{hoja['materia']} - {hoja['mes']}: {e}"
+
+        resultados.append((hoja["materia"], hoja["mes"], guardados))
+
+    return resultados, None
@@ -0,0 +1,1167 @@
+import threading
+
+from collections import OrderedDict
+
+import numpy as np
+from firebase_admin import firestore
+
+from academic_config import (
+    LISTA_GRADOS_NOTAS,
+    LISTA_MESES,
+    MAPA_CURRICULAR,
+    NOTA_APROBACION,
+)
+from config import CICLO_LECTIVO
+from firebase_service import contar_documentos
+from utils import redondear_mined_vector
+
+
+# ==========================================
+# CUBO DE CALIFICACIONES
+# ==========================================
+#
+# Las notas de un grado se cargan en un arreglo
+# alumnos × materias × meses (LISTA_MESES). Las celdas sin
+# nota quedan en NaN para mostrarlas como "-" y se toman como
+# cero al promediar, igual que n.get(mes, 0).
+
+# Febrero-Abril, Mayo-Julio y Agosto-Octubre
+TRIMESTRES = [
+    LISTA_MESES[0:3],
+    LISTA_MESES[3:6],
+    LISTA_MESES[6:9],
+]
+
+
+def _armar_cubo(nies, materias, notas):
+    """
+    Calcula en bloque los promedios trimestrales y el
+    promedio final de un arreglo de notas con la regla
+    de redondear_mined.
+    """
+
+    base = np.nan_to_num(notas, nan=0.0)
+
+    # Se suma mes por mes, en el mismo orden que el cálculo escalar
+    trimestres = np.stack(
+        [
+            redondear_mined_vector(
+                (base[..., k] + base[..., k + 1] + base[..., k + 2]) / 3
+            )
+            for k in (0, 3, 6)
+        ],
+        axis=-1
+    )
+
+    final = redondear_mined_vector(
+        (trimestres[..., 0] + trimestres[..., 1] + trimestres[..., 2]) / 3
+    )
+
+    return {
+        "nies": nies,
+        "materias": materias,
+        "indice_nie": {nie: i for i, nie in enumerate(nies)},
+        "indice_materia": {materia: j for j, materia in enumerate(materias)},
+        "notas": notas,
+        "trimestres": trimestres,
+        "final": final,
+    }
+
+
+def calcular_cubo(registros, nies, materias):
+    """
+    Construye el cubo a partir de documentos de "notas"
+    (diccionarios con nie, materia, mes y promedio_final)
+    y calcula en bloque los promedios trimestrales y el
+    promedio final con la regla de redondear_mined.
+
+    Las notas de alumnos o materias fuera de las listas
+    recibidas se ignoran.
+    """
+
+    nies = list(nies)
+    materias = list(materias)
+
+    indice_nie = {nie: i for i, nie in enumerate(nies)}
+    indice_materia = {materia: j for j, materia in enumerate(materias)}
+    indice_mes = {mes: k for k, mes in enumerate(LISTA_MESES)}
+
+    notas = np.full(
+        (len(nies), len(materias), len(LISTA_MESES)),
+        np.nan
+    )
+
+    for registro in registros:
+        i = indice_nie.get(registro.get("nie"))
+        j = indice_materia.get(registro.get("materia"))
+        k = indice_mes.get(registro.get("mes"))
+
+        if i is None or j is None or k is None:
+            continue
+
+        nota = registro.get("promedio_final")
+
+        if nota is not None:
+            notas[i, j, k] = nota
+
+    return _armar_cubo(nies, materias, notas)
+
+
+def subcubo(cubo, nies, materias):
+    """
+    Extrae del cubo las filas y columnas pedidas, en ese
+    orden. Los alumnos o materias que no están en el cubo
+    quedan sin notas.
+    """
+
+    nies = list(nies)
+    materias = list(materias)
+
+    # La última fila y columna del relleno quedan en NaN
+    alto, ancho, meses = cubo["notas"].shape
+    relleno = np.full((alto + 1, ancho + 1, meses), np.nan)
+    relleno[:alto, :ancho] = cubo["notas"]
+
+    filas = np.array(
+        [cubo["indice_nie"].get(nie, alto) for nie in nies],
+        dtype=int
+    )
+    columnas = np.array(
+        [cubo["indice_materia"].get(materia, ancho) for materia in materias],
+        dtype=int
+    )
+
+    return _armar_cubo(
+        nies,
+        materias,
+        relleno[filas[:, None], columnas[None, :]]
+    )
+
+
+# ==========================================
+# CACHÉ DE CUBOS POR GRADO
+# ==========================================
+#
+# Cubo completo de cada (ciclo, grado) en memoria del proceso,
+# compartido por todas las sesiones. Es un LRU limitado por
+# bytes y cada "Guardar Notas" del grado lo invalida; la versión
+# por llave evita guardar un cubo leído antes de la invalidación,
+# y la generación, uno leído antes de vaciar toda la caché.
+
+LIMITE_MEMORIA_CUBOS = 64 * 1024 * 1024
+
+_cache_cubos = {
+    "entradas": OrderedDict(),
+    "bytes": 0,
+    "versiones": {},
+    "generacion": 0,
+}
+
+_candado_cubos = threading.Lock()
+
+
+def _tamano_cubo(cubo):
+    return (
+        cubo["notas"].nbytes
+        + cubo["trimestres"].nbytes
+        + cubo["final"].nbytes
+    )
+
+
+def _cubo_en_cache(clave):
+    with _candado_cubos:
+        entradas = _cache_cubos["entradas"]
+
+        if clave not in entradas:
+            return None, (
+                _cache_cubos["generacion"],
+                _cache_cubos["versiones"].get(clave, 0),
+            )
+
+        entradas.move_to_end(clave)
+
+        return entradas[clave], None
+
+
+def _guardar_cubo(clave, cubo, version):
+    with _candado_cubos:
+        if version != (
+            _cache_cubos["generacion"],
+            _cache_cubos["versiones"].get(clave, 0),
+        ):
+            return
+
+        entradas = _cache_cubos["entradas"]
+
+        if clave in entradas:
+            _cache_cubos["bytes"] -= _tamano_cubo(entradas.pop(clave))
+
+        entradas[clave] = cubo
+        _cache_cubos["bytes"] += _tamano_cubo(cubo)
+
+        while (
+            _cache_cubos["bytes"] > LIMITE_MEMORIA_CUBOS
+            and len(entradas) > 1
+        ):
+            _, descartado = entradas.popitem(last=False)
+            _cache_cubos["bytes"] -= _tamano_cubo(descartado)
+
+
+def invalidar_cubo_grado(grado, ciclo_lectivo=CICLO_LECTIVO):
+    """
+    Descarta el cubo en caché de un grado. Se llama
+    después de cualquier escritura en sus notas.
+    """
+
+    clave = (ciclo_lectivo, grado)
+
+    with _candado_cubos:
+        versiones = _cache_cubos["versiones"]
+        versiones[clave] = versiones.get(clave, 0) + 1
+
+        cubo = _cache_cubos["entradas"].pop(clave, None)
+
+        if cubo is not None:
+            _cache_cubos["bytes"] -= _tamano_cubo(cubo)
+
+
+def invalidar_cubos():
+    """
+    Descarta los cubos de todos los grados y ciclos, por
+    ejemplo después de borrar la base de datos.
+    """
+
+    with _candado_cubos:
+        _cache_cubos["generacion"] += 1
+        _cache_cubos["entradas"].clear()
+        _cache_cubos["bytes"] = 0
+
+
+def _cubo_grado_completo(db, grado, ciclo_lectivo):
+    clave = (ciclo_lectivo, grado)
+    cubo, version = _cubo_en_cache(clave)
+
+    if cubo is not None:
+        return cubo
+
+    # Las notas sin ciclo_lectivo son anteriores a la migración
+    registros = [
+        data
+        for data in (
+            doc.to_dict()
+            for doc in db.collection("notas")
+            .where("grado", "==", grado)
+            .stream()
+        )
+        if data.get("ciclo_lectivo", ciclo_lectivo) == ciclo_lectivo
+    ]
+
+    nies = sorted({r.get("nie") for r in registros if r.get("nie")})
+    materias = sorted({r.get("materia") for r in registros if r.get("materia")})
+
+    cubo = calcular_cubo(registros, nies, materias)
+    _guardar_cubo(clave, cubo, version)
+
+    return cubo
+
+
+def cargar_cubo_grado(db, grado, nies, materias, ciclo_lectivo=CICLO_LECTIVO):
+    """
+    Cubo del grado para los alumnos y materias pedidos.
+
+    La primera consulta lee todas las notas del grado; las
+    siguientes se sirven desde la caché hasta que se guarden
+    notas de ese grado.
+    """
+
+    return subcubo(
+        _cubo_grado_completo(db, grado, ciclo_lectivo),
+        nies,
+        materias
+    )
+
+
+def cargar_cubo_alumno(
+    db,
+    nie,
+    materias,
+    ciclo_lectivo=CICLO_LECTIVO,
+    grado=None,
+):
+    """
+    Cubo de un solo alumno, para las boletas individuales.
+
+    Si el cubo de su grado ya está en caché no hay lecturas;
+    si no, se arma desde notas_resumen (una lectura) y, si el
+    alumno no tiene resumen o el ciclo aún no se reconstruyó,
+    desde sus notas sueltas.
+    """
+
+    if grado:
+        cubo, _ = _cubo_en_cache((ciclo_lectivo, grado))
+
+        if cubo is not None:
+            return subcubo(cubo, [nie], materias)
+
+    resumen = None
+
+    if resumen_notas_completo(db, ciclo_lectivo):
+        resumen = obtener_resumen_notas(db, nie, ciclo_lectivo)
+
+    if resumen is not None:
+        registros = registros_resumen(resumen)
+
+    else:
+        registros = (
+            doc.to_dict()
+            for doc in db.collection("notas")
+            .where("nie", "==", nie)
+            .stream()
+        )
+
+    return calcular_cubo(registros, [nie], materias)
+
+
+# ==========================================
+# RESUMEN ANUAL POR ALUMNO
+# ==========================================
+#
+# notas_resumen/{ciclo}_{nie} guarda en un solo documento:
+#
+#   notas.{materia}.{mes}          promedio mensual
+#   promedios.{materia}.T1/T2/T3   promedios trimestrales
+#   promedios.{materia}.PF         promedio final
+#
+# Se actualiza en el mismo lote que "Guardar Notas".
+#
+# Un resumen creado por el primer guardado después de
+# instalarlo solo tiene ese mes. notas_resumen/control_{ciclo}
+# se escribe al reconstruir el ciclo; mientras no exista, las
+# boletas individuales leen las notas sueltas.
+
+COLECCION_RESUMEN = "notas_resumen"
+
+# Ciclos con resumen completo ya confirmados en este proceso
+_ciclos_resumen_completo = set()
+
+
+def _id_resumen(nie, ciclo_lectivo):
+    return f"{ciclo_lectivo}_{nie}"
+
+
+def _id_control_resumen(ciclo_lectivo):
+    return f"control_{ciclo_lectivo}"
+
+
+def resumen_notas_completo(db, ciclo_lectivo=CICLO_LECTIVO):
+    """
+    True si notas_resumen del ciclo ya se reconstruyó y
+    cada resumen tiene todas las notas del alumno.
+    """
+
+    if ciclo_lectivo in _ciclos_resumen_completo:
+        return True
+
+    snap = db.collection(COLECCION_RESUMEN).document(
+        _id_control_resumen(ciclo_lectivo)
+    ).get()
+
+    if snap.exists and snap.to_dict().get("completo"):
+        _ciclos_resumen_completo.add(ciclo_lectivo)
+        return True
+
+    return False
+
+
+def marcar_resumen_notas_completo(db, ciclo_lectivo=CICLO_LECTIVO):
+    db.collection(COLECCION_RESUMEN).document(
+        _id_control_resumen(ciclo_lectivo)
+    ).set(
+        {
+            "completo": True,
+            "ciclo_lectivo": ciclo_lectivo,
+            "actualizado": firestore.SERVER_TIMESTAMP,
+        }
+    )
+
+
+def _promedios_materia(cubo, i, j):
+    t1, t2, t3 = cubo["trimestres"][i, j].tolist()
+
+    return {
+        "T1": t1,
+        "T2": t2,
+        "T3": t3,
+        "PF": float(cubo["final"][i, j]),
+    }
+
+
+def obtener_resumen_notas(db, nie, ciclo_lectivo=CICLO_LECTIVO):
+    """
+    Devuelve el resumen anual del alumno o None
+    si todavía no existe.
+    """
+
+    snap = db.collection(COLECCION_RESUMEN).document(
+        _id_resumen(nie, ciclo_lectivo)
+    ).get()
+
+    return snap.to_dict() if snap.exists else None
+
+
+def registros_resumen(resumen):
+    """
+    Convierte un resumen en registros con la misma
+    forma que los documentos de "notas".
+    """
+
+    nie = resumen.get("nie")
+
+    return [
+        {
+            "nie": nie,
+            "materia": materia,
+            "mes": mes,
+            "promedio_final": nota,
+        }
+        for materia, meses in resumen.get("notas", {}).items()
+        for mes, nota in meses.items()
+    ]
+
+
+def agregar_resumen_notas(
+    db,
+    batch,
+    grado,
+    materia,
+    mes,
+    promedios,
+    ciclo_lectivo=CICLO_LECTIVO,
+):
+    """
+    Agrega al lote la actualización de notas_resumen de
+    cada alumno en promedios ({nie: promedio del mes}).
+
+    Los resúmenes actuales se leen en una sola llamada
+    para recalcular los trimestres de la materia con los
+    demás meses ya guardados.
+    """
+
+    if not promedios:
+        return
+
+    nies = list(promedios)
+
+    referencias = [
+        db.collection(COLECCION_RESUMEN).document(
+            _id_resumen(nie, ciclo_lectivo)
+        )
+        for nie in nies
+    ]
+
+    meses_guardados = {}
+
+    for snap in db.get_all(referencias):
+        if snap.exists:
+            meses_guardados[snap.id] = (
+                snap.to_dict().get("notas", {}).get(materia, {})
+            )
+
+    agregar_estadisticas_notas(
+        batch,
+        db,
+        grado,
+        materia,
+        mes,
+        promedios,
+        {
+            nie: meses_guardados.get(referencia.id, {}).get(mes)
+            for nie, referencia in zip(nies, referencias)
+        },
+        ciclo_lectivo,
+    )
+
+    registros = []
+
+    for nie, referencia in zip(nies, referencias):
+        meses = dict(meses_guardados.get(referencia.id, {}))
+        meses[mes] = promedios[nie]
+
+        registros.extend(
+            {
+                "nie": nie,
+                "materia": materia,
+                "mes": mes_guardado,
+                "promedio_final": nota,
+            }
+            for mes_guardado, nota in meses.items()
+        )
+
+    cubo = calcular_cubo(registros, nies, [materia])
+
+    for i, (nie, referencia) in enumerate(zip(nies, referencias)):
+        batch.set(
+            referencia,
+            {
+                "nie": nie,
+                "grado": grado,
+                "ciclo_lectivo": ciclo_lectivo,
+                "notas": {materia: {mes: promedios[nie]}},
+                "promedios": {materia: _promedios_materia(cubo, i, 0)},
+            },
+            merge=True
+        )
+
+
+def reconstruir_resumen_notas(db, ciclo_lectivo=CICLO_LECTIVO):
+    """
+    Recalcula notas_resumen de un ciclo a partir de
+    la colección "notas". Las notas sin ciclo_lectivo
+    se asignan al ciclo recibido. También recalcula
+    notas_estadisticas del ciclo y lo marca como completo.
+
+    Devuelve (notas leídas, resúmenes escritos).
+    """
+
+    registros = []
+    grados = {}
+
+    for doc in db.collection("notas").stream():
+        data = doc.to_dict()
+
+        if data.get("ciclo_lectivo", ciclo_lectivo) != ciclo_lectivo:
+            continue
+
+        if not data.get("nie") or not data.get("materia"):
+            continue
+
+        registros.append(data)
+        grados[data["nie"]] = data.get("grado")
+
+    nies = sorted(grados)
+    materias = sorted({r["materia"] for r in registros})
+
+    cubo = calcular_cubo(registros, nies, materias)
+    estadisticas = estadisticas_cubo(cubo, grados, ciclo_lectivo)
+
+    batch = db.batch()
+    pendientes = 0
+
+    for i, nie in enumerate(nies):
+        notas = {}
+        promedios = {}
+
+        for j, materia in enumerate(materias):
+            fila = cubo["notas"][i, j]
+
+            if np.isnan(fila).all():
+                continue
+
+            notas[materia] = {
+                mes: nota
+                for mes, nota in zip(LISTA_MESES, fila.tolist())
+                if not np.isnan(nota)
+            }
+
+            promedios[materia] = _promedios_materia(cubo, i, j)
+
+        batch.set(
+            db.collection(COLECCION_RESUMEN).document(
+                _id_resumen(nie, ciclo_lectivo)
+            ),
+            {
+                "nie": nie,
+                "grado": grados[nie],
+                "ciclo_lectivo": ciclo_lectivo,
+                "notas": notas,
+                "promedios": promedios,
+            }
+        )
+        pendientes += 1
+
+        if pendientes == 500:
+            batch.commit()
+            batch = db.batch()
+            pendientes = 0
+
+    if pendientes:
+        batch.commit()
+
+    reemplazar_estadisticas_notas(db, estadisticas, ciclo_lectivo)
+    marcar_resumen_notas_completo(db, ciclo_lectivo)
+
+    return len(registros), len(nies)
+
+
+# ==========================================
+# ESTADÍSTICAS POR GRADO, MATERIA Y MES
+# ==========================================
+#
+# notas_estadisticas tiene un documento por grado, materia y
+# mes con la cantidad de notas, su suma, la suma de sus
+# cuadrados, un histograma de diez tramos de un punto y los
+# reprobados (promedio menor que NOTA_APROBACION). El tablero
+# de analítica los lee sin recorrer la colección notas.
+#
+# Cada guardado aplica con Increment la diferencia entre la
+# nota anterior de notas_resumen y la nueva, en el mismo lote
+# que las notas.
+
+COLECCION_ESTADISTICAS = "notas_estadisticas"
+
+TRAMOS_HISTOGRAMA = 10
+
+
+def _id_estadistica(grado, materia, mes, ciclo_lectivo):
+    return f"{ciclo_lectivo}_{grado}_{materia}_{mes}".replace(" ", "_")
+
+
+def _tramo(nota):
+    # 10.0 cae en el último tramo (9-10)
+    return str(min(int(nota), TRAMOS_HISTOGRAMA - 1))
+
+
+def _nota_valida(nota):
+    return nota is not None and not np.isnan(nota)
+
+
+def agregar_estadisticas_notas(
+    batch,
+    db,
+    grado,
+    materia,
+    mes,
+    promedios,
+    anteriores,
+    ciclo_lectivo=CICLO_LECTIVO,
+):
+    """
+    Agrega al lote la actualización de notas_estadisticas.
+    anteriores tiene la nota que cada alumno tenía en
+    notas_resumen para ese mes (None si no tenía).
+    """
+
+    cantidad = 0
+    suma = 0.0
+    suma_cuadrados = 0.0
+    reprobados = 0
+    histograma = {}
+
+    for nie, nota in promedios.items():
+        previa = anteriores.get(nie)
+
+        if _nota_valida(previa):
+            cantidad -= 1
+            suma -= previa
+            suma_cuadrados -= previa * previa
+            reprobados -= previa < NOTA_APROBACION
+            histograma[_tramo(previa)] = histograma.get(_tramo(previa), 0) - 1
+
+        if _nota_valida(nota):
+            cantidad += 1
+            suma += nota
+            suma_cuadrados += nota * nota
+            reprobados += nota < NOTA_APROBACION
+            histograma[_tramo(nota)] = histograma.get(_tramo(nota), 0) + 1
+
+    # Un mapa vacío en un merge reemplazaría el histograma completo
+    histograma = {
+        tramo: firestore.Increment(delta)
+        for tramo, delta in histograma.items()
+        if delta
+    }
+
+    # Sin cambios no se escribe: crearía un documento vacío
+    if not (cantidad or suma or suma_cuadrados or reprobados or histograma):
+        return
+
+    datos = {
+        "ciclo_lectivo": ciclo_lectivo,
+        "grado": grado,
+        "materia": materia,
+        "mes": mes,
+        "cantidad": firestore.Increment(cantidad),
+        "suma": firestore.Increment(suma),
+        "suma_cuadrados": firestore.Increment(suma_cuadrados),
+        "reprobados": firestore.Increment(reprobados),
+    }
+
+    if histograma:
+        datos["histograma"] = histograma
+
+    batch.set(
+        db.collection(COLECCION_ESTADISTICAS).document(
+            _id_estadistica(grado, materia, mes, ciclo_lectivo)
+        ),
+        datos,
+        merge=True
+    )
+
+
+def eliminar_resumen_alumno(db, nie):
+    """
+    Borra los notas_resumen de un alumno y, en el mismo
+    lote, descuenta sus notas de notas_estadisticas. Solo
+    se descuenta de estadísticas que ya existen.
+
+    Devuelve la cantidad de resúmenes borrados.
+    """
+
+    batch = db.batch()
+    pendientes = 0
+    eliminados = 0
+
+    docs = (
+        db.collection(COLECCION_RESUMEN)
+        .where("nie", "==", nie)
+        .stream()
+    )
+
+    for doc in docs:
+        data = doc.to_dict()
+        grado = data.get("grado")
+        ciclo_lectivo = data.get(
+            "ciclo_lectivo",
+            int(doc.id.split("_", 1)[0])
+        )
+
+        notas = [
+            (materia, mes, nota)
+            for materia, meses in data.get("notas", {}).items()
+            for mes, nota in meses.items()
+            if _nota_valida(nota)
+        ]
+
+        existentes = set()
+
+        if grado and notas:
+            referencias = [
+                db.collection(COLECCION_ESTADISTICAS).document(
+                    _id_estadistica(grado, materia, mes, ciclo_lectivo)
+                )
+                for materia, mes, _ in notas
+            ]
+
+            existentes = {
+                snap.id for snap in db.get_all(referencias) if snap.exists
+            }
+
+        # Un resumen y sus estadísticas van en el mismo lote
+        if pendientes + len(notas) + 1 > 500:
+            batch.commit()
+            batch = db.batch()
+            pendientes = 0
+
+        for materia, mes, nota in notas:
+            if _id_estadistica(grado, materia, mes, ciclo_lectivo) in existentes:
+                agregar_estadisticas_notas(
+                    batch,
+                    db,
+                    grado,
+                    materia,
+                    mes,
+                    {nie: None},
+                    {nie: nota},
+                    ciclo_lectivo
+                )
+                pendientes += 1
+
+        batch.delete(doc.reference)
+        pendientes += 1
+        eliminados += 1
+
+    if pendientes:
+        batch.commit()
+
+    return eliminados
+
+
+def estadisticas_cubo(cubo, grados, ciclo_lectivo=CICLO_LECTIVO):
+    """
+    Calcula desde cero las estadísticas de todas las
+    combinaciones con notas de un cubo. grados asigna
+    a cada NIE su grado.
+
+    Devuelve {id de documento: datos}.
+    """
+
+    grado_por_fila = np.array(
+        [grados[nie] for nie in cubo["nies"]],
+        dtype=object
+    )
+    estadisticas = {}
+
+    for grado in sorted(set(grado_por_fila.tolist()), key=str):
+        filas = cubo["notas"][grado_por_fila == grado]
+
+        for j, materia in enumerate(cubo["materias"]):
+            for k, mes in enumerate(LISTA_MESES):
+                notas = filas[:, j, k]
+                notas = notas[~np.isnan(notas)]
+
+                if not notas.size:
+                    continue
+
+                conteo = np.bincount(
+                    np.minimum(notas.astype(int), TRAMOS_HISTOGRAMA - 1),
+                    minlength=TRAMOS_HISTOGRAMA
+                )
+
+                estadisticas[
+                    _id_estadistica(grado, materia, mes, ciclo_lectivo)
+                ] = {
+                    "ciclo_lectivo": ciclo_lectivo,
+                    "grado": grado,
+                    "materia": materia,
+                    "mes": mes,
+                    "cantidad": int(notas.size),
+                    "suma": float(notas.sum()),
+                    "suma_cuadrados": float((notas * notas).sum()),
+                    "reprobados": int((notas < NOTA_APROBACION).sum()),
+                    "histograma": {
+                        str(tramo): int(total)
+                        for tramo, total in enumerate(conteo.tolist())
+                        if total
+                    },
+                }
+
+    return estadisticas
+
+
+def reemplazar_estadisticas_notas(db, estadisticas, ciclo_lectivo=CICLO_LECTIVO):
+    """
+    Escribe las estadísticas recalculadas de un ciclo y
+    borra las combinaciones que ya no tienen notas.
+    """
+
+    coleccion = db.collection(COLECCION_ESTADISTICAS)
+    sobrantes = [
+        doc.reference
+        for doc in (
+            coleccion.where("ciclo_lectivo", "==", ciclo_lectivo).stream()
+        )
+        if doc.id not in estadisticas
+    ]
+
+    operaciones = [
+        (coleccion.document(id_doc), datos)
+        for id_doc, datos in estadisticas.items()
+    ] + [(referencia, None) for referencia in sobrantes]
+
+    for inicio in range(0, len(operaciones), 500):
+        batch = db.batch()
+
+        for referencia, datos in operaciones[inicio:inicio + 500]:
+            if datos is None:
+                batch.delete(referencia)
+            else:
+                batch.set(referencia, datos)
+
+        batch.commit()
+
+
+def obtener_estadisticas_notas(db, ciclo_lectivo=CICLO_LECTIVO):
+    """
+    Lista de estadísticas de un ciclo con promedio,
+    desviación y porcentaje de reprobados ya calculados.
+    """
+
+    filas = []
+
+    for doc in (
+        db.collection(COLECCION_ESTADISTICAS)
+        .where("ciclo_lectivo", "==", ciclo_lectivo)
+        .stream()
+    ):
+        data = doc.to_dict()
+        cantidad = data.get("cantidad", 0)
+
+        if cantidad <= 0:
+            continue
+
+        promedio = data.get("suma", 0.0) / cantidad
+        varianza = max(
+            data.get("suma_cuadrados", 0.0) / cantidad - promedio ** 2,
+            0.0
+        )
+        histograma = data.get("histograma", {})
+
+        filas.append(
+            {
+                "grado": data.get("grado"),
+                "materia": data.get("materia"),
+                "mes": data.get("mes"),
+                "cantidad": cantidad,
+                "suma": data.get("suma", 0.0),
+                "promedio": promedio,
+                "desviacion": float(np.sqrt(varianza)),
+                "reprobados": data.get("reprobados", 0),
+                "histograma": [
+                    histograma.get(str(tramo), 0)
+                    for tramo in range(TRAMOS_HISTOGRAMA)
+                ],
+            }
+        )
+
+    return filas
+
+
+def materias_pendientes_mes(db, mes, ciclo_lectivo=CICLO_LECTIVO):
+    """
+    Devuelve (pendientes, esperadas): cuántas materias de
+    los grados con notas aún no tienen ninguna nota del mes.
+
+    Cuenta las estadísticas del mes con una agregación,
+    sin leer los documentos. Las que quedaron en cero notas
+    (alumnos eliminados) no cuentan como registradas.
+
+    Índice compuesto requerido (firestore.indexes.json):
+    ciclo_lectivo + mes + cantidad.
+    """
+
+    esperadas = sum(
+        len(MAPA_CURRICULAR.get(grado, []))
+        for grado in LISTA_GRADOS_NOTAS
+    )
+
+    registradas = contar_documentos(
+        db.collection(COLECCION_ESTADISTICAS)
+        .where("ciclo_lectivo", "==", ciclo_lectivo)
+        .where("mes", "==", mes)
+        .where("cantidad", ">", 0)
+    )
+
+    return max(esperadas - registradas, 0), esperadas
+
+
+# ==========================================
+# GUARDAR NOTAS DEL MES
+# ==========================================
+
+COLUMNAS_ACTIVIDADES = [
+    "Act1 (25%)",
+    "Act2 (25%)",
+    "Alt1 (10%)",
+    "Alt2 (10%)",
+    "Examen (30%)",
+]
+
+COLUMNAS_CONDUCTA = ["Nota Conducta"]
+
+# Act1, Act2, Alt1, Alt2 y Examen
+PESOS_ACTIVIDADES = [0.25, 0.25, 0.10, 0.10, 0.30]
+
+
+def columnas_materia(materia):
+    """
+    Columnas de notas del editor para una materia.
+    """
+
+    if materia == "Conducta":
+        return list(COLUMNAS_CONDUCTA)
+
+    return list(COLUMNAS_ACTIVIDADES)
+
+# Cada alumno ocupa dos escrituras (notas y notas_resumen)
+# más la de notas_mensuales por lote.
+TAM_BLOQUE_NOTAS = 200
+
+
+def calcular_promedios(df, columnas):
+    """
+    Promedio redondeado de cada fila del editor.
+
+    Conducta tiene una sola columna; las demás materias
+    ponderan las cinco actividades en el mismo orden que
+    el cálculo fila por fila.
+    """
+
+    if len(columnas) == 1:
+        return redondear_mined_vector(df[columnas[0]].astype(float))
+
+    promedio = None
+
+    for columna, peso in zip(columnas, PESOS_ACTIVIDADES):
+        termino = df[columna].astype(float) * peso
+        promedio = termino if promedio is None else promedio + termino
+
+    return redondear_mined_vector(promedio)
+
+
+def guardar_notas_mes(
+    db,
+    grado,
+    materia,
+    mes,
+    id_doc,
+    original,
+    editado,
+    columnas,
+    guardados,
+    ciclo_lectivo=CICLO_LECTIVO,
+):
+    """
+    Guarda solo los alumnos cuyas notas cambiaron respecto
+    a lo cargado en el editor, o que aún no estaban en
+    notas_mensuales (guardados es el conjunto de esos NIE).
+
+    notas_mensuales se actualiza campo por campo
+    (detalles.{nie}), así dos docentes que editan alumnos
+    distintos no se sobrescriben.
+
+    Devuelve la cantidad de alumnos guardados.
+    """
+
+    actual = editado.set_index("NIE")[columnas].astype(float)
+    previo = (
+        original.set_index("NIE")[columnas]
+        .astype(float)
+        .reindex(actual.index)
+    )
+
+    iguales = (actual == previo) | (actual.isna() & previo.isna())
+    cambiados = actual[
+        ~iguales.all(axis=1) | ~actual.index.isin(list(guardados))
+    ]
+
+    if cambiados.empty:
+        return 0
+
+    # Una actividad sin nota pesa 0 en el promedio, igual que
+    # en el editor, pero no se guarda como nota
+    promedios = calcular_promedios(cambiados.fillna(0.0), columnas).tolist()
+    filas = [
+        {
+            columna: firestore.DELETE_FIELD if np.isnan(valor) else valor
+            for columna, valor in fila.items()
+        }
+        for fila in cambiados.to_dict("records")
+    ]
+    nies = list(cambiados.index)
+
+    for inicio in range(0, len(nies), TAM_BLOQUE_NOTAS):
+        batch = db.batch()
+        detalles = {}
+        promedios_bloque = {}
+
+        for nie, fila, promedio in zip(
+            nies[inicio:inicio + TAM_BLOQUE_NOTAS],
+            filas[inicio:inicio + TAM_BLOQUE_NOTAS],
+            promedios[inicio:inicio + TAM_BLOQUE_NOTAS],
+        ):
+            detalles[nie] = {**fila, "Promedio": promedio}
+            promedios_bloque[nie] = promedio
+
+            batch.set(
+                db.collection("notas").document(f"{nie}_{id_doc}"),
+                {
+                    "nie": nie,
+                    "grado": grado,
+                    "materia": materia,
+                    "mes": mes,
+                    "promedio_final": promedio,
+                    "ciclo_lectivo": ciclo_lectivo,
+                }
+            )
+
+        batch.set(
+            db.collection("notas_mensuales").document(id_doc),
+            {
+                "ciclo_lectivo": ciclo_lectivo,
+                "grado": grado,
+                "materia": materia,
+                "mes": mes,
+                "detalles": detalles,
+                "nies": firestore.ArrayUnion(sorted(detalles)),
+            },
+            merge=True
+        )
+
+        agregar_resumen_notas(
+            db,
+            batch,
+            grado,
+            materia,
+            mes,
+            promedios_bloque,
+            ciclo_lectivo,
+        )
+
+        batch.commit()
+
+    invalidar_cubo_grado(grado, ciclo_lectivo)
+
+    return len(nies)
+
+
+# ==========================================
+# LECTURA DEL CUBO PARA LOS REPORTES
+# ==========================================
+
+def filas_alumno(cubo, nie, materias=None):
+    """
+    Devuelve una fila por materia del alumno con:
+
+    - meses: nota de cada mes de LISTA_MESES o "-".
+    - trimestres: [T1, T2, T3].
+    - final: promedio final.
+    - con_notas: si la materia tiene alguna nota.
+    """
+
+    if materias is None:
+        materias = cubo["materias"]
+
+    i = cubo["indice_nie"].get(nie)
+    filas = []
+
+    for materia in materias:
+        j = cubo["indice_materia"].get(materia)
+
+        if i is None or j is None:
+            filas.append(
+                {
+                    "materia": materia,
+                    "meses": ["-"] * len(LISTA_MESES),
+                    "trimestres": [0.0, 0.0, 0.0],
+                    "final": 0.0,
+                    "con_notas": False,
+                }
+            )
+            continue
+
+        notas = cubo["notas"][i, j]
+        presentes = ~np.isnan(notas)
+
+        filas.append(
+            {
+                "materia": materia,
+                "meses": [
+                    nota if presente else "-"
+                    for nota, presente in zip(
+                        notas.tolist(),
+                        presentes.tolist()
+                    )
+                ],
+                "trimestres": cubo["trimestres"][i, j].tolist(),
+                "final": float(cubo["final"][i, j]),
+                "con_notas": bool(presentes.any()),
+            }
+        )
+
+    return filas
+
+
+def boletas_grado(cubo, alumnos):
+    """
+    Datos de las boletas de un grado para boletas_pdf,
+    en el orden de la nómina recibida.
+    """
+
+    return [
+        {
+            "nombre": alumno["nombre"],
+            "nie": alumno["nie"],
+            "filas": filas_alumno(cubo, alumno["nie"]),
+        }
+        for alumno in alumnos
+    ]
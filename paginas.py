@@ -0,0 +1,139 @@
+from functools import partial
+from importlib import import_module
+
+
+# ==========================================
+# REGISTRO DE PÁGINAS
+# ==========================================
+#
+# Cada opción del menú apunta al módulo y la función que la
+# dibuja. El módulo se importa la primera vez que se abre la
+# página, así el arranque (login y tablero de inicio) no carga
+# pandas, reportlab ni las vistas que la sesión no usa: un
+# docente nunca importa finanzas, promoción ni los generadores
+# de boletas en PDF. firebase_admin sí se carga al arrancar,
+# porque app.py necesita la conexión para el login.
+#
+# Las vistas que reciben dependencias por parámetro se envuelven
+# en un adaptador con firma (db).
+
+
+def _inscripcion(db):
+    from academic_config import LISTA_GRADOS_TODO
+    from firebase_service import subir_archivo
+    from views.inscripcion import mostrar_inscripcion
+
+    mostrar_inscripcion(
+        db=db,
+        lista_grados=LISTA_GRADOS_TODO,
+        subir_archivo=subir_archivo,
+    )
+
+
+def _consulta_alumnos(db):
+    from academic_config import LISTA_GRADOS_TODO, MAPA_CURRICULAR
+    from firebase_service import subir_archivo
+    from utils import obtener_fecha_hoy
+    from views.alumnos import mostrar_consulta_alumnos
+
+    mostrar_consulta_alumnos(
+        db=db,
+        lista_grados=LISTA_GRADOS_TODO,
+        mapa_curricular=MAPA_CURRICULAR,
+        obtener_fecha_hoy=obtener_fecha_hoy,
+        subir_archivo=subir_archivo,
+    )
+
+
+def _maestros(db):
+    import streamlit as st
+
+    from academic_config import LISTA_GRADOS_TODO, MAPA_CURRICULAR
+    from config import CICLO_LECTIVO
+    from finanzas_service import verificar_pago_duplicado_hoy
+    from firebase_service import subir_archivo
+    from utils import obtener_fecha_hoy, obtener_hora_actual
+    from views.docentes import mostrar_maestros
+
+    mostrar_maestros(
+        db=db,
+        lista_grados=LISTA_GRADOS_TODO,
+        mapa_curricular=MAPA_CURRICULAR,
+        subir_archivo=subir_archivo,
+        obtener_fecha_hoy=obtener_fecha_hoy,
+        obtener_hora_actual=obtener_hora_actual,
+        verificar_pago_duplicado_hoy=partial(verificar_pago_duplicado_hoy, db),
+    )
+
+    st.caption(
+        f"📅 Ciclo Lectivo actual: {CICLO_LECTIVO}"
+    )
+
+
+def _promocion(db):
+    from utils import obtener_fecha_hoy
+    from views.promocion import mostrar_promocion
+
+    mostrar_promocion(
+        db=db,
+        obtener_fecha_hoy=obtener_fecha_hoy,
+        ciclo_origen=2026,
+        ciclo_destino=2027,
+    )
+
+
+PAGINAS = {
+    "admin": {
+        "Inicio": ("views.inicio", "mostrar_inicio"),
+        "Inscripción": _inscripcion,
+        "Consulta Alumnos": _consulta_alumnos,
+        "Maestros": _maestros,
+        "Asistencia Global": ("views.asistencia", "mostrar_asistencia_global"),
+        "Notas": ("views.notas", "mostrar_notas"),
+        "Analítica": ("views.analitica", "mostrar_analitica"),
+        "Finanzas": ("views.finanzas", "mostrar_finanzas"),
+        "Promoción de Grado": _promocion,
+        "Configuración (Usuarios)": ("views.configuracion", "mostrar_configuracion"),
+    },
+    "docente": {
+        "Inicio": ("views.inicio", "mostrar_inicio"),
+        "Mis Listados": ("views.docente", "mostrar_listados"),
+        "Tomar Asistencia": ("views.docente", "mostrar_tomar_asistencia"),
+        "Cargar Notas": ("views.docente", "mostrar_cargar_notas"),
+        "Ver Mis Cargas": ("views.docente", "mostrar_mis_cargas"),
+        "Expediente Alumnos": ("views.docente", "mostrar_bitacora"),
+        "Boletas de Notas": ("views.docente", "mostrar_boletas_docente"),
+    },
+}
+
+
+def obtener_pagina(rol, opcion):
+    """
+    Función que dibuja la opción del menú para el rol,
+    o None si el rol no tiene esa página.
+    """
+
+    pagina = PAGINAS.get(rol, {}).get(opcion)
+
+    if pagina is None or callable(pagina):
+        return pagina
+
+    modulo, funcion = pagina
+
+    return getattr(import_module(modulo), funcion)
+
+
+def mostrar_pagina(db, rol, opcion):
+    """
+    Dibuja la página seleccionada. Devuelve False si
+    la opción no existe para el rol.
+    """
+
+    pagina = obtener_pagina(rol, opcion)
+
+    if pagina is None:
+        return False
+
+    pagina(db)
+
+    return True
@@ -0,0 +1,84 @@
+from config import CICLO_LECTIVO
+from firebase_service import conectar_firebase
+from asistencia_service import reconstruir_resumen_asistencia
+
+
+# ============================================================
+# PROGRAMA PRINCIPAL
+# ============================================================
+
+def main():
+
+    print()
+    print("=" * 60)
+    print(f"RECONSTRUCCIÓN DE asistencia_resumen - CICLO {CICLO_LECTIVO}")
+    print("=" * 60)
+
+    # --------------------------------------------------------
+    # CONEXIÓN A FIREBASE
+    # --------------------------------------------------------
+
+    print("\nConectando con Firebase...")
+
+    try:
+        db, error = conectar_firebase()
+
+    except Exception as e:
+        print(f"\n❌ ERROR AL CONECTAR CON FIREBASE:")
+        print(e)
+        return
+
+    if error:
+        print(f"\n❌ ERROR DE CONEXIÓN:")
+        print(error)
+        return
+
+    if not db:
+        print("\n❌ No fue posible conectar con Firebase.")
+        return
+
+    print("✅ Conexión con Firebase establecida.")
+
+    # --------------------------------------------------------
+    # RECÁLCULO
+    # --------------------------------------------------------
+
+    try:
+        procesados, resumenes = reconstruir_resumen_asistencia(
+            db,
+            ciclo_lectivo=CICLO_LECTIVO
+        )
+
+    except KeyboardInterrupt:
+        print()
+        print("⚠️ RECONSTRUCCIÓN INTERRUMPIDA POR EL USUARIO.")
+        print("Puedes ejecutar nuevamente el script.")
+        return
+
+    except Exception as error:
+        print()
+        print("❌ ERROR DURANTE LA RECONSTRUCCIÓN:")
+        print(error)
+        return
+
+    # --------------------------------------------------------
+    # RESUMEN
+    # --------------------------------------------------------
+
+    print()
+    print("=" * 60)
+    print("RECONSTRUCCIÓN FINALIZADA")
+    print("=" * 60)
+
+    print(f"Tomas de asistencia leídas: {procesados}")
+    print(f"Resúmenes mensuales:        {resumenes}")
+
+    print("=" * 60)
+
+
+# ============================================================
+# EJECUCIÓN
+# ============================================================
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+from firebase_service import conectar_firebase
+from finanzas_service import (
+    completar_grado_finanzas,
+    reconstruir_resumen,
+)
+
+
+# ============================================================
+# PROGRAMA PRINCIPAL
+# ============================================================
+
+def main():
+
+    print()
+    print("=" * 60)
+    print("RECONSTRUCCIÓN DE finanzas_resumen")
+    print("=" * 60)
+
+    # --------------------------------------------------------
+    # CONEXIÓN A FIREBASE
+    # --------------------------------------------------------
+
+    print("\nConectando con Firebase...")
+
+    try:
+        db, error = conectar_firebase()
+
+    except Exception as e:
+        print(f"\n❌ ERROR AL CONECTAR CON FIREBASE:")
+        print(e)
+        return
+
+    if error:
+        print(f"\n❌ ERROR DE CONEXIÓN:")
+        print(error)
+        return
+
+    if not db:
+        print("\n❌ No fue posible conectar con Firebase.")
+        return
+
+    print("✅ Conexión con Firebase establecida.")
+
+    # --------------------------------------------------------
+    # RECÁLCULO
+    # --------------------------------------------------------
+
+    def progreso(procesados):
+        print(f"   finanzas: {procesados} documentos procesados...")
+
+    try:
+        print("\nCompletando el grado en cobros antiguos...")
+
+        con_grado = completar_grado_finanzas(db)
+
+        print(f"   {con_grado} cobros actualizados con su grado.")
+
+        print("\nRecalculando resúmenes...")
+
+        procesados, resumenes = reconstruir_resumen(
+            db,
+            progreso=progreso
+        )
+
+    except KeyboardInterrupt:
+        print()
+        print("⚠️ RECONSTRUCCIÓN INTERRUMPIDA POR EL USUARIO.")
+        print("Puedes ejecutar nuevamente el script.")
+        return
+
+    except Exception as error:
+        print()
+        print("❌ ERROR DURANTE LA RECONSTRUCCIÓN:")
+        print(error)
+        return
+
+    # --------------------------------------------------------
+    # RESUMEN
+    # --------------------------------------------------------
+
+    print()
+    print("=" * 60)
+    print("RECONSTRUCCIÓN FINALIZADA")
+    print("=" * 60)
+
+    print(f"Cobros con grado:      {con_grado}")
+    print(f"Transacciones leídas:  {procesados}")
+    print(f"Resúmenes escritos:    {resumenes}")
+
+    print()
+    print(
+        "Los reportes financieros leerán sus totales desde "
+        "finanzas_resumen."
+    )
+
+    print()
+    print(
+        "IMPORTANTE: este script puede ejecutarse nuevamente "
+        "sin duplicar los totales."
+    )
+
+    print("=" * 60)
+
+
+# ============================================================
+# EJECUCIÓN
+# ============================================================
+
+if __name__ == "__main__":
+    main()
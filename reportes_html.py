@@ -0,0 +1,198 @@
+from functools import lru_cache
+from html import escape
+
+from config import CICLO_LECTIVO
+
+
+# ==========================================
+# PLANTILLAS DE REPORTES IMPRIMIBLES
+# ==========================================
+#
+# Las plantillas se definen una sola vez: las filas usan
+# formato posicional con % y los encabezados el método format
+# ya enlazado. Las filas se producen con generadores y se unen
+# con un único "".join, de modo que el costo crece en forma
+# lineal con la cantidad de filas.
+
+# Grados, materias y descripciones se repiten mucho entre filas
+_escapar = lru_cache(maxsize=4096)(escape)
+
+# ------------------------------------------
+# CUADRO DE REGISTRO ANUAL
+# ------------------------------------------
+
+_INICIO_ALUMNO = (
+    "<tr><td rowspan='%d'>%d</td>"
+    "<td rowspan='%d' style='text-align:left;'>%s</td>"
+)
+
+# inicio, materia, FEB-ABR, T1, MAY-JUL, T2, AGO-OCT, T3, PF
+_FILA_CUADRO = (
+    "%s"
+    "<td style='text-align:left; font-size:10px;'>%s</td>"
+    "<td>%s</td><td>%s</td><td>%s</td>"
+    "<td style='background:#e3f2fd;'><b>%s</b></td>"
+    "<td>%s</td><td>%s</td><td>%s</td>"
+    "<td style='background:#e3f2fd;'><b>%s</b></td>"
+    "<td>%s</td><td>%s</td><td>%s</td>"
+    "<td style='background:#e3f2fd;'><b>%s</b></td>"
+    "<td style='background:#1e3a8a; color:white;'><b>%s</b></td>"
+    "</tr>"
+)
+
+_CUADRO_ANUAL = """
+<div style="font-family:Arial; padding:10px;">
+    <div style="text-align:center; border-bottom:2px solid #333;">
+        {logo}
+        <h2>COLEGIO PROFA. BLANCA ELENA DE HERNÁNDEZ</h2>
+        <h3>CUADRO DE REGISTRO DE CALIFICACIONES ANUAL - CICLO {ciclo}</h3>
+        <p><b>GRADO:</b> {grado}</p>
+    </div>
+    <table border="1" style="width:100%; border-collapse:collapse; text-align:center; font-size:11px; margin-top:10px;">
+        <tr style="background:#f2f2f2;">
+            <th>No.</th><th>ESTUDIANTE</th><th>ASIGNATURA</th>
+            <th>FEB</th><th>MAR</th><th>ABR</th><th style="background:#bbdefb;">PT1</th>
+            <th>MAY</th><th>JUN</th><th>JUL</th><th style="background:#bbdefb;">PT2</th>
+            <th>AGO</th><th>SEP</th><th>OCT</th><th style="background:#bbdefb;">PT3</th>
+            <th style="background:#0d47a1; color:white;">PF</th>
+        </tr>
+        {filas}
+    </table>
+</div>
+""".format
+
+
+def filas_cuadro_anual(alumnos, filas_por_alumno):
+    """
+    Genera las filas del cuadro anual. filas_por_alumno
+    recibe un NIE y devuelve sus filas de
+    notas_service.filas_alumno.
+    """
+
+    for numero, alumno in enumerate(alumnos, start=1):
+        filas = filas_por_alumno(alumno["nie"])
+
+        for indice, fila in enumerate(filas):
+            # La primera materia lleva el número y el nombre del alumno
+            inicio = (
+                _INICIO_ALUMNO % (
+                    len(filas),
+                    numero,
+                    len(filas),
+                    _escapar(alumno["nombre"]),
+                )
+                if indice == 0
+                else "<tr>"
+            )
+
+            meses = fila["meses"]
+            t1, t2, t3 = fila["trimestres"]
+
+            yield _FILA_CUADRO % (
+                inicio,
+                _escapar(fila["materia"]),
+                *meses[0:3], t1,
+                *meses[3:6], t2,
+                *meses[6:9], t3,
+                fila["final"],
+            )
+
+
+def render_cuadro_anual(
+    grado,
+    alumnos,
+    filas_por_alumno,
+    logo="",
+    ciclo_lectivo=CICLO_LECTIVO,
+):
+    """
+    HTML completo del cuadro de registro anual de un grado.
+    """
+
+    return _CUADRO_ANUAL(
+        logo=logo,
+        ciclo=ciclo_lectivo,
+        grado=escape(grado.upper()),
+        filas="".join(filas_cuadro_anual(alumnos, filas_por_alumno)),
+    )
+
+
+# ------------------------------------------
+# REPORTE FINANCIERO
+# ------------------------------------------
+
+_COLORES_TIPO = {
+    "ingreso": "#e8f5e9",
+}
+
+_COLOR_OTRO_TIPO = "#ffebee"
+
+# color, fecha, grado, persona, descripción, monto
+_FILA_FINANCIERA = (
+    "<tr style='background:%s;'>"
+    "<td>%s</td><td>%s</td><td>%s</td>"
+    "<td>%s</td><td align='right'>$%.2f</td>"
+    "</tr>"
+)
+
+_REPORTE_FINANCIERO = (
+    '<div style="font-family:Arial; padding:20px;">'
+    '<div style="display:flex; justify-content:space-between; align-items:center; border-bottom:2px solid #333; padding-bottom:10px;">'
+    '<div style="display:flex; align-items:center; gap:15px;">{logo}'
+    '<div><h2 style="margin:0;">COLEGIO BLANCA ELENA</h2><p style="margin:0;">{titulo}</p></div></div>'
+    '<div style="text-align:right;"><p><b>Desde:</b> {desde}<br><b>Hasta:</b> {hasta}</p></div></div><br>'
+    '<div style="display:flex; gap:20px; margin-bottom:20px;">'
+    '<div style="background:#e8f5e9; padding:10px; border:1px solid #4caf50; border-radius:5px; flex:1; text-align:center;">'
+    '<h4 style="margin:0; color:#2e7d32;">INGRESOS</h4><h2 style="margin:0;">${ingresos:.2f}</h2></div>'
+    '<div style="background:#ffebee; padding:10px; border:1px solid #e57373; border-radius:5px; flex:1; text-align:center;">'
+    '<h4 style="margin:0; color:#c62828;">EGRESOS</h4><h2 style="margin:0;">${egresos:.2f}</h2></div>'
+    '<div style="background:#f5f5f5; padding:10px; border:1px solid #999; border-radius:5px; flex:1; text-align:center;">'
+    '<h4 style="margin:0;">BALANCE</h4><h2 style="margin:0;">${balance:.2f}</h2></div></div>'
+    '<table style="width:100%; border-collapse:collapse; font-size:12px;" border="1" bordercolor="#ddd">'
+    '<tr style="background:#333; color:white;"><th padding="5">Fecha</th><th>Grado</th>'
+    '<th>Persona/Entidad</th><th>Descripción</th><th>Monto</th></tr>'
+    '{filas}'
+    '</table><br><br><div style="text-align:center;">__________________________<br>Firma Dirección</div></div>'
+).format
+
+
+def filas_reporte_financiero(movimientos):
+    """
+    Genera una fila por movimiento de finanzas (con el
+    campo "grado_reporte" de paginar_movimientos).
+    """
+
+    for item in movimientos:
+        yield _FILA_FINANCIERA % (
+            _COLORES_TIPO.get(item["tipo"], _COLOR_OTRO_TIPO),
+            item["fecha_legible"],
+            _escapar(str(item.get("grado_reporte", "-"))),
+            _escapar(str(item["nombre_persona"])),
+            _escapar(str(item["descripcion"])),
+            item["monto"],
+        )
+
+
+def render_reporte_financiero(
+    movimientos,
+    titulo,
+    desde,
+    hasta,
+    ingresos,
+    egresos,
+    logo="",
+):
+    """
+    HTML completo del reporte financiero imprimible.
+    """
+
+    return _REPORTE_FINANCIERO(
+        logo=logo,
+        titulo=escape(titulo),
+        desde=desde.strftime("%d/%m/%Y"),
+        hasta=hasta.strftime("%d/%m/%Y"),
+        ingresos=ingresos,
+        egresos=egresos,
+        balance=ingresos - egresos,
+        filas="".join(filas_reporte_financiero(movimientos)),
+    )
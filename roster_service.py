@@ -0,0 +1,76 @@
+import streamlit as st
+
+
+# ==========================================
+# NÓMINA DE ALUMNOS ACTIVOS POR GRADO
+# ==========================================
+
+@st.cache_data(show_spinner=False, ttl=600)
+def _consultar_alumnos_activos(_db, grado):
+    """
+    Consulta en Firestore los alumnos activos de un grado.
+
+    El resultado se comparte entre sesiones y reruns.
+    "alumnos" solo guarda el grado actual, así que la
+    nómina no depende del ciclo lectivo.
+    """
+
+    docs = (
+        _db.collection("alumnos")
+        .where("grado_actual", "==", grado)
+        .where("estado", "==", "Activo")
+        .stream()
+    )
+
+    alumnos = []
+
+    for doc in docs:
+        data = doc.to_dict()
+
+        alumnos.append(
+            {
+                "nie": data.get("nie", doc.id),
+                "nombre": (
+                    f"{data.get('apellidos', '')} "
+                    f"{data.get('nombres', '')}"
+                ),
+                "data": data,
+            }
+        )
+
+    alumnos.sort(key=lambda x: x["nombre"])
+
+    return alumnos
+
+
+def obtener_alumnos_activos(db, grado):
+    """
+    Devuelve la nómina ordenada de alumnos activos
+    de un grado: [{"nie", "nombre", "data"}, ...].
+    """
+
+    if not db or not grado:
+        return []
+
+    return _consultar_alumnos_activos(db, grado)
+
+
+def invalidar_alumnos_activos(*grados):
+    """
+    Descarta la nómina en caché de los grados indicados.
+
+    Debe llamarse después de cualquier escritura que
+    cambie el grado, el estado o los datos de un alumno.
+    """
+
+    for grado in set(grados):
+        if grado:
+            _consultar_alumnos_activos.clear(None, grado)
+
+
+def invalidar_nominas():
+    """
+    Descarta las nóminas en caché de todos los grados.
+    """
+
+    _consultar_alumnos_activos.clear()
@@ -0,0 +1,174 @@
+import streamlit as st
+
+from utils import limpiar_nombre, obtener_hora_actual
+
+
+# ==========================================
+# CONTEXTO DEL USUARIO EN SESIÓN
+# ==========================================
+#
+# Al iniciar sesión se arma una sola vez lo que las pantallas
+# necesitan del usuario: perfil docente, foto, cargas
+# académicas y grados en los que es guía. Se guarda en
+# st.session_state["contexto_usuario"] y las vistas lo leen
+# sin consultas. Solo se vuelve a armar con refrescar_contexto.
+#
+# El perfil se enlaza por ID de documento: el campo
+# usuarios.id_docente apunta a maestros_perfil. Las cuentas
+# anteriores sin ese campo se enlazan una vez por nombre y el
+# ID encontrado se guarda en el usuario.
+
+CLAVE_CONTEXTO = "contexto_usuario"
+
+
+def _buscar_id_docente(db, nombre):
+    for candidato in dict.fromkeys([nombre, limpiar_nombre(nombre)]):
+        if not candidato:
+            continue
+
+        docs = list(
+            db.collection("maestros_perfil")
+            .where("nombre", "==", candidato)
+            .limit(1)
+            .stream()
+        )
+
+        if docs:
+            return docs[0].id
+
+    return None
+
+
+def _cargas(consulta):
+    cargas = []
+
+    for doc in consulta.stream():
+        data = doc.to_dict()
+
+        cargas.append(
+            {
+                "id": doc.id,
+                "grado": data.get("grado"),
+                "materias": data.get("materias", []),
+                "es_guia": bool(data.get("es_guia")),
+            }
+        )
+
+    return cargas
+
+
+def construir_contexto(db, usuario, datos_usuario):
+    """
+    Arma el contexto de un usuario a partir de su
+    documento de "usuarios".
+    """
+
+    nombre = datos_usuario.get("nombre", usuario)
+
+    contexto = {
+        "usuario": usuario,
+        "rol": datos_usuario.get("rol"),
+        "nombre": nombre,
+        "id_docente": None,
+        "perfil": {},
+        "foto_url": None,
+        "cargas": [],
+        "grados": [],
+        "grados_guia": [],
+        "actualizado": obtener_hora_actual(),
+    }
+
+    if contexto["rol"] != "docente" or not db:
+        return contexto
+
+    id_docente = datos_usuario.get("id_docente")
+
+    if not id_docente:
+        id_docente = _buscar_id_docente(db, nombre)
+
+        if id_docente:
+            db.collection("usuarios").document(usuario).update(
+                {"id_docente": id_docente}
+            )
+
+    perfil = {}
+    cargas = []
+
+    if id_docente:
+        snap = db.collection("maestros_perfil").document(id_docente).get()
+        perfil = snap.to_dict() if snap.exists else {}
+
+        cargas = _cargas(
+            db.collection("carga_academica").where(
+                "id_docente", "==", id_docente
+            )
+        )
+
+    # Cargas antiguas sin id_docente solo guardan el nombre
+    if not cargas:
+        cargas = _cargas(
+            db.collection("carga_academica").where(
+                "nombre_docente", "==", nombre
+            )
+        )
+
+    contexto.update(
+        {
+            "id_docente": id_docente,
+            "perfil": perfil,
+            "foto_url": perfil.get("foto_url"),
+            "cargas": cargas,
+            "grados": list(dict.fromkeys(c["grado"] for c in cargas)),
+            "grados_guia": [c["grado"] for c in cargas if c["es_guia"]],
+        }
+    )
+
+    return contexto
+
+
+def iniciar_contexto(db, usuario, datos_usuario):
+    """
+    Guarda en la sesión el contexto del usuario que
+    acaba de iniciar sesión.
+    """
+
+    st.session_state[CLAVE_CONTEXTO] = construir_contexto(
+        db,
+        usuario,
+        datos_usuario
+    )
+
+    return st.session_state[CLAVE_CONTEXTO]
+
+
+def refrescar_contexto(db):
+    """
+    Vuelve a leer el usuario en sesión y reemplaza
+    su contexto (por ejemplo, tras cambiar sus cargas).
+    """
+
+    usuario = st.session_state.get("user_id")
+
+    if not db or not usuario:
+        return None
+
+    snap = db.collection("usuarios").document(usuario).get()
+
+    if not snap.exists:
+        return None
+
+    return iniciar_contexto(db, usuario, snap.to_dict())
+
+
+def contexto_usuario(db):
+    """
+    Contexto del usuario en sesión. Se arma si la
+    sesión comenzó antes de que existiera.
+    """
+
+    contexto = st.session_state.get(CLAVE_CONTEXTO)
+
+    if contexto is None:
+        contexto = refrescar_contexto(db)
+
+    return contexto or {}
@@ -1,17 +1,23 @@
-import base64
+from datetime import datetime
 
+import numpy as np
+
+from config import TZ_SV
+
+
+def obtener_fecha_hoy():
+    """Retorna la fecha actual en El Salvador"""
+    return datetime.now(TZ_SV).date()
+
+
+def obtener_hora_actual():
+    """Retorna fecha y hora legible en El Salvador"""
+    return datetime.now(TZ_SV).strftime("%d/%m/%Y %H:%M")
 
-def get_base64(path):
-    """
-    Convierte un archivo de imagen a Base64 para poder
-    incrustarlo directamente dentro de HTML.
-    """
-    try:
-        with open(path, "rb") as archivo:
-            contenido = base64.b64encode(archivo.read()).decode()
-            return f"data:image/png;base64,{contenido}"
-    except Exception:
-        return ""
+
+def limpiar_nombre(nombre):
+    if not nombre: return ""
+    return nombre.replace("*", "").replace("_", " ").strip()
 
 
 def redondear_mined(valor):
@@ -28,4 +34,22 @@ def redondear_mined(valor):
     if parte_decimal >= 0.5:
         return float(parte_entera + 1)
 
-    return float(parte_entera)
\ No newline at end of file
+    return float(parte_entera)
+
+
+def redondear_mined_vector(valores):
+    """
+    Versión vectorizada de redondear_mined para arreglos
+    de NumPy. Produce exactamente los mismos valores que
+    aplicar redondear_mined celda por celda.
+    """
+    valores = np.asarray(valores, dtype=float)
+
+    parte_entera = np.trunc(valores)
+    parte_decimal = valores - parte_entera
+
+    return np.where(
+        parte_decimal >= 0.5,
+        parte_entera + 1.0,
+        parte_entera
+    )
@@ -4,25 +4,24 @@ import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
 
-def eliminar_documentos_consulta(query):
-    """
-    Elimina todos los documentos devueltos
-    por una consulta de Firestore.
-    """
-
-    documentos = list(query.stream())
-
-    for documento in documentos:
-        documento.reference.delete()
-
-    return len(documentos)
+from activos import LOGO, SELLO, documento_impresion, etiqueta_imagen
+from alumnos_service import quitar_alumno_de_registros
+from asistencia_service import quitar_alumno_de_resumen
+from espejo_service import maestro_guia as obtener_maestro_guia
+from finanzas_service import eliminar_movimientos
+from firebase_service import eliminar_por_consulta
+from notas_service import (
+    cargar_cubo_alumno,
+    eliminar_resumen_alumno,
+    filas_alumno,
+    invalidar_cubo_grado,
+)
+from roster_service import invalidar_alumnos_activos
 
 def mostrar_consulta_alumnos(
     db,
     lista_grados,
     mapa_curricular,
-    redondear_mined,
-    get_base64,
     obtener_fecha_hoy,
     subir_archivo,
 ):
@@ -117,17 +116,7 @@ def mostrar_consulta_alumnos(
 
     a = st.session_state.alum_view
 
-    q_guia = (
-        db.collection("carga_academica")
-        .where("grado", "==", a["grado_actual"])
-        .where("es_guia", "==", True)
-        .stream()
-    )
-
-    maestro_guia = "No Asignado"
-
-    for d in q_guia:
-        maestro_guia = d.to_dict()["nombre_docente"]
+    maestro_guia = obtener_maestro_guia(db, a["grado_actual"])
 
     st.markdown("---")
 
@@ -325,13 +314,7 @@ def mostrar_consulta_alumnos(
                         "Visualizar Recibo",
                         key="btn_visualizar_recibo_alumno"
                     ):
-                        logo = get_base64("logo.png")
-
-                        hi = (
-                            f'<img src="{logo}" height="60">'
-                            if logo
-                            else ""
-                        )
+                        hi = etiqueta_imagen(LOGO, 60)
 
                         html_recibo = f"""
                         <div style="
@@ -446,21 +429,19 @@ def mostrar_consulta_alumnos(
                         """
 
                         components.html(
-                            f"""
-                            <html>
-                                <body>
-                                    {html_recibo}
-                                    <br>
-                                    <center>
-                                        <button
-                                            onclick="window.print()"
-                                        >
-                                            🖨️ IMPRIMIR COPIA
-                                        </button>
-                                    </center>
-                                </body>
-                            </html>
-                            """,
+                            documento_impresion(
+                                f"""
+                                {html_recibo}
+                                <br>
+                                <center>
+                                    <button
+                                        onclick="window.print()"
+                                    >
+                                        🖨️ IMPRIMIR COPIA
+                                    </button>
+                                </center>
+                                """
+                            ),
                             height=400,
                             scrolling=True
                         )
@@ -490,13 +471,7 @@ def mostrar_consulta_alumnos(
                     .strftime("%d/%m/%Y")
                 )
 
-                logo = get_base64("logo.png")
-
-                hi = (
-                    f'<img src="{logo}" height="40">'
-                    if logo
-                    else ""
-                )
+                hi = etiqueta_imagen(LOGO, 40)
 
                 html = f"""
                 <div style="
@@ -582,20 +557,18 @@ def mostrar_consulta_alumnos(
                 """
 
                 components.html(
-                    f"""
-                    <html>
-                        <body>
-                            {html}
-                            <br>
-
-                            <center>
-                                <button onclick="window.print()">
-                                    🖨️ IMPRIMIR
-                                </button>
-                            </center>
-                        </body>
-                    </html>
-                    """,
+                    documento_impresion(
+                        f"""
+                        {html}
+                        <br>
+
+                        <center>
+                            <button onclick="window.print()">
+                                🖨️ IMPRIMIR
+                            </button>
+                        </center>
+                        """
+                    ),
                     height=350
                 )
 
@@ -606,118 +579,76 @@ def mostrar_consulta_alumnos(
     with tabs[2]:
         st.subheader("Boleta Oficial")
 
-        notas = (
-            db.collection("notas")
-            .where("nie", "==", a["nie"])
-            .stream()
-        )
-
-        nm = {}
-
-        for doc in notas:
-            dd = doc.to_dict()
-
-            if dd["materia"] not in nm:
-                nm[dd["materia"]] = {}
-
-            nm[dd["materia"]][dd["mes"]] = (
-                dd["promedio_final"]
-            )
-
-        filas = []
-
         malla = mapa_curricular.get(
             a["grado_actual"],
             []
         )
 
-        for mat in malla:
-            if mat in nm:
-                n = nm[mat]
-
-                t1 = redondear_mined(
-                    (
-                        n.get("Febrero", 0)
-                        + n.get("Marzo", 0)
-                        + n.get("Abril", 0)
-                    ) / 3
-                )
-
-                t2 = redondear_mined(
-                    (
-                        n.get("Mayo", 0)
-                        + n.get("Junio", 0)
-                        + n.get("Julio", 0)
-                    ) / 3
-                )
+        cubo = cargar_cubo_alumno(
+            db,
+            a["nie"],
+            malla,
+            grado=a["grado_actual"]
+        )
 
-                t3 = redondear_mined(
-                    (
-                        n.get("Agosto", 0)
-                        + n.get("Septiembre", 0)
-                        + n.get("Octubre", 0)
-                    ) / 3
-                )
+        filas = []
 
-                fin = redondear_mined(
-                    (t1 + t2 + t3) / 3
-                )
+        for fila in filas_alumno(cubo, a["nie"]):
+            if not fila["con_notas"]:
+                continue
 
-                filas.append(
-                    f"""
-                    <tr>
-                        <td style="text-align:left">
-                            {mat}
-                        </td>
+            (
+                feb, mar, abr,
+                may, jun, jul,
+                ago, sep, oct_,
+            ) = fila["meses"]
 
-                        <td>{n.get('Febrero', '-')}</td>
-                        <td>{n.get('Marzo', '-')}</td>
-                        <td>{n.get('Abril', '-')}</td>
+            t1, t2, t3 = fila["trimestres"]
+            fin = fila["final"]
 
-                        <td style="background:#eee">
-                            <b>{t1}</b>
-                        </td>
+            filas.append(
+                f"""
+                <tr>
+                    <td style="text-align:left">
+                        {fila["materia"]}
+                    </td>
 
-                        <td>{n.get('Mayo', '-')}</td>
-                        <td>{n.get('Junio', '-')}</td>
-                        <td>{n.get('Julio', '-')}</td>
+                    <td>{feb}</td>
+                    <td>{mar}</td>
+                    <td>{abr}</td>
 
-                        <td style="background:#eee">
-                            <b>{t2}</b>
-                        </td>
+                    <td style="background:#eee">
+                        <b>{t1}</b>
+                    </td>
 
-                        <td>{n.get('Agosto', '-')}</td>
-                        <td>{n.get('Septiembre', '-')}</td>
-                        <td>{n.get('Octubre', '-')}</td>
+                    <td>{may}</td>
+                    <td>{jun}</td>
+                    <td>{jul}</td>
 
-                        <td style="background:#eee">
-                            <b>{t3}</b>
-                        </td>
+                    <td style="background:#eee">
+                        <b>{t2}</b>
+                    </td>
 
-                        <td style="
-                            background:#333;
-                            color:white;
-                        ">
-                            <b>{fin}</b>
-                        </td>
-                    </tr>
-                    """
-                )
+                    <td>{ago}</td>
+                    <td>{sep}</td>
+                    <td>{oct_}</td>
 
-        logo = get_base64("logo.png")
-        sello = get_base64("sello.png")
+                    <td style="background:#eee">
+                        <b>{t3}</b>
+                    </td>
 
-        hi = (
-            f'<img src="{logo}" height="60">'
-            if logo
-            else ""
-        )
+                    <td style="
+                        background:#333;
+                        color:white;
+                    ">
+                        <b>{fin}</b>
+                    </td>
+                </tr>
+                """
+            )
 
-        hs = (
-            f'<img src="{sello}" height="80">'
-            if sello
-            else ""
-        )
+        hi = etiqueta_imagen(LOGO, 60)
+        hs = etiqueta_imagen(SELLO, 80)
 
         html = f"""
         <div style="
@@ -831,27 +762,17 @@ def mostrar_consulta_alumnos(
         """
 
         components.html(
-            f"""
-            <html>
-                <body>
-                    {html}
+            documento_impresion(
+                f"""
+                {html}
 
-                    <br>
+                <br>
 
-                    <button onclick="window.print()">
-                        🖨️ IMPRIMIR BOLETA
-                    </button>
-
-                    <style>
-                        @media print {{
-                            button {{
-                                display:none;
-                            }}
-                        }}
-                    </style>
-                </body>
-            </html>
-            """,
+                <button onclick="window.print()">
+                    🖨️ IMPRIMIR BOLETA
+                </button>
+                """
+            ),
             height=600,
             scrolling=True
         )
@@ -1041,6 +962,11 @@ def mostrar_consulta_alumnos(
                     update_data
                 )
 
+                invalidar_alumnos_activos(
+                    a["grado_actual"],
+                    ng
+                )
+
                 # Actualizar también la copia de sesión
                 st.session_state.alum_view = (
                     db.collection("alumnos")
@@ -1250,6 +1176,10 @@ def mostrar_consulta_alumnos(
                         datos_baja
                     )
 
+                    invalidar_alumnos_activos(
+                        a["grado_actual"]
+                    )
+
                     st.session_state.alum_view.update(
                         datos_baja
                     )
@@ -1288,6 +1218,10 @@ def mostrar_consulta_alumnos(
                     datos_reactivacion
                 )
 
+                invalidar_alumnos_activos(
+                    a["grado_actual"]
+                )
+
                 st.session_state.alum_view.update(
                     datos_reactivacion
                 )
@@ -1358,7 +1292,8 @@ def mostrar_consulta_alumnos(
                     # ==================================
 
                     notas_eliminadas = (
-                        eliminar_documentos_consulta(
+                        eliminar_por_consulta(
+                            db,
                             db.collection("notas")
                             .where(
                                 "nie",
@@ -1368,18 +1303,27 @@ def mostrar_consulta_alumnos(
                         )
                     )
 
+                    # Descuenta sus notas de notas_estadisticas
+                    eliminar_resumen_alumno(
+                        db,
+                        nie
+                    )
+
                     # ==================================
                     # 2. FINANZAS
                     # ==================================
 
+                    # Descuenta los montos de finanzas_resumen
                     pagos_eliminados = (
-                        eliminar_documentos_consulta(
+                        eliminar_movimientos(
+                            db,
                             db.collection("finanzas")
                             .where(
                                 "alumno_nie",
                                 "==",
                                 nie
-                            )
+                            ),
+                            a["grado_actual"]
                         )
                     )
 
@@ -1388,7 +1332,8 @@ def mostrar_consulta_alumnos(
                     # ==================================
 
                     logs_eliminados = (
-                        eliminar_documentos_consulta(
+                        eliminar_por_consulta(
+                            db,
                             db.collection("bitacora")
                             .where(
                                 "nie",
@@ -1399,90 +1344,27 @@ def mostrar_consulta_alumnos(
                     )
 
                     # ==================================
-                    # 4. NOTAS MENSUALES
+                    # 4. NOTAS MENSUALES Y ASISTENCIA
                     # ==================================
 
-                    notas_mensuales = (
-                        db.collection(
-                            "notas_mensuales"
-                        ).stream()
+                    # Antes de quitarlo de "asistencia": sus
+                    # tomas indican qué meses descontar.
+                    quitar_alumno_de_resumen(
+                        db,
+                        nie
                     )
 
-                    for documento in notas_mensuales:
-
-                        datos = documento.to_dict()
-
-                        detalles = datos.get(
-                            "detalles",
-                            {}
+                    # Solo los documentos cuyo índice "nies"
+                    # contiene al alumno.
+                    registros_modificados = (
+                        quitar_alumno_de_registros(
+                            db,
+                            nie
                         )
-
-                        if nie in detalles:
-
-                            detalles.pop(
-                                nie,
-                                None
-                            )
-
-                            documento.reference.update(
-                                {
-                                    "detalles": detalles
-                                }
-                            )
-
-                    # ==================================
-                    # 5. ASISTENCIA
-                    # ==================================
-
-                    asistencias = (
-                        db.collection(
-                            "asistencia"
-                        ).stream()
                     )
 
-                    for documento in asistencias:
-
-                        datos = documento.to_dict()
-
-                        registros = datos.get(
-                            "registros",
-                            {}
-                        )
-
-                        observaciones = datos.get(
-                            "observaciones",
-                            {}
-                        )
-
-                        modificado = False
-
-                        if nie in registros:
-                            registros.pop(
-                                nie,
-                                None
-                            )
-                            modificado = True
-
-                        if nie in observaciones:
-                            observaciones.pop(
-                                nie,
-                                None
-                            )
-                            modificado = True
-
-                        if modificado:
-
-                            documento.reference.update(
-                                {
-                                    "registros": registros,
-                                    "observaciones": (
-                                        observaciones
-                                    ),
-                                }
-                            )
-
                     # ==================================
-                    # 6. DOCUMENTO PRINCIPAL
+                    # 5. DOCUMENTO PRINCIPAL
                     # ==================================
 
                     db.collection(
@@ -1491,6 +1373,14 @@ def mostrar_consulta_alumnos(
                         nie
                     ).delete()
 
+                    invalidar_alumnos_activos(
+                        a["grado_actual"]
+                    )
+
+                    invalidar_cubo_grado(
+                        a["grado_actual"]
+                    )
+
                     # Limpiar sesión
                     if (
                         "alum_view"
@@ -1520,6 +1410,11 @@ def mostrar_consulta_alumnos(
                         f"{logs_eliminados}"
                     )
 
+                    st.write(
+                        f"Notas mensuales y asistencias depuradas: "
+                        f"{registros_modificados}"
+                    )
+
                     time.sleep(2)
                     st.rerun()
 
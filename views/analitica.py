@@ -0,0 +1,146 @@
+import pandas as pd
+import streamlit as st
+
+from academic_config import LISTA_GRADOS_NOTAS, LISTA_MESES, NOTA_APROBACION
+from config import CICLO_LECTIVO
+from notas_service import TRAMOS_HISTOGRAMA, obtener_estadisticas_notas
+
+
+@st.cache_data(show_spinner=False, ttl=120)
+def _estadisticas(_db, ciclo_lectivo):
+    return pd.DataFrame(obtener_estadisticas_notas(_db, ciclo_lectivo))
+
+
+def _promedio_ponderado(df, por):
+    grupos = df.groupby(por, sort=False)[["suma", "cantidad", "reprobados"]].sum()
+    grupos["Promedio"] = (grupos["suma"] / grupos["cantidad"]).round(2)
+    grupos["% Reprobados"] = (
+        grupos["reprobados"] / grupos["cantidad"] * 100
+    ).round(1)
+
+    return grupos.rename(
+        columns={"cantidad": "Notas", "reprobados": "Reprobados"}
+    ).drop(columns="suma")
+
+
+def mostrar_analitica(db):
+    """
+    Tablero de rendimiento académico del ciclo.
+
+    Lee notas_estadisticas (una fila por grado, materia
+    y mes, mantenida en cada guardado de notas), por lo
+    que no recorre la colección de notas.
+    """
+
+    st.title("📈 Analítica Académica")
+
+    df = _estadisticas(db, CICLO_LECTIVO)
+
+    if df.empty:
+        st.info(
+            "Aún no hay estadísticas de notas para este ciclo. "
+            "Se generan al guardar notas."
+        )
+        return
+
+    c1, c2, c3 = st.columns(3)
+
+    grados = [g for g in LISTA_GRADOS_NOTAS if g in set(df["grado"])]
+    sel_grados = c1.multiselect("Grados", grados, key="an_grados")
+
+    materias = sorted(set(df["materia"]))
+    sel_materias = c2.multiselect("Materias", materias, key="an_materias")
+
+    sel_meses = c3.multiselect("Meses", LISTA_MESES, key="an_meses")
+
+    incluir_conducta = st.checkbox("Incluir Conducta", value=False)
+
+    filtro = pd.Series(True, index=df.index)
+
+    if sel_grados:
+        filtro &= df["grado"].isin(sel_grados)
+    if sel_materias:
+        filtro &= df["materia"].isin(sel_materias)
+    if sel_meses:
+        filtro &= df["mes"].isin(sel_meses)
+    if not incluir_conducta:
+        filtro &= df["materia"] != "Conducta"
+
+    datos = df[filtro]
+
+    if datos.empty:
+        st.warning("No hay notas para los filtros seleccionados.")
+        return
+
+    # ------------------------------------------
+    # INDICADORES
+    # ------------------------------------------
+
+    total_notas = int(datos["cantidad"].sum())
+    total_reprobados = int(datos["reprobados"].sum())
+
+    k1, k2, k3 = st.columns(3)
+    k1.metric("Notas registradas", f"{total_notas:,}")
+    k2.metric("Promedio general", f"{datos['suma'].sum() / total_notas:.2f}")
+    k3.metric(
+        f"Reprobados (< {NOTA_APROBACION:g})",
+        f"{total_reprobados:,}",
+        f"{total_reprobados / total_notas * 100:.1f}%",
+        delta_color="off"
+    )
+
+    # ------------------------------------------
+    # DISTRIBUCIÓN Y TENDENCIA
+    # ------------------------------------------
+
+    g1, g2 = st.columns(2)
+
+    with g1:
+        st.markdown("#### Distribución de promedios")
+
+        histograma = pd.DataFrame(
+            datos["histograma"].tolist(),
+            columns=[
+                f"{tramo}-{tramo + 1}"
+                for tramo in range(TRAMOS_HISTOGRAMA)
+            ]
+        ).sum()
+
+        st.bar_chart(histograma.rename("Alumnos"))
+
+    with g2:
+        st.markdown("#### Tendencia mensual")
+
+        tendencia = _promedio_ponderado(datos, "mes").reindex(
+            [mes for mes in LISTA_MESES if mes in set(datos["mes"])]
+        )
+
+        st.line_chart(tendencia[["Promedio"]])
+
+    # ------------------------------------------
+    # POR MATERIA Y POR GRADO
+    # ------------------------------------------
+
+    st.markdown("#### Reprobados por materia")
+
+    por_materia = _promedio_ponderado(datos, "materia").sort_values(
+        "% Reprobados",
+        ascending=False
+    )
+
+    st.bar_chart(por_materia["% Reprobados"])
+    st.dataframe(por_materia, width="stretch")
+
+    st.markdown("#### Promedio por grado y materia")
+
+    cuadro = datos.pivot_table(
+        index="grado",
+        columns="materia",
+        values=["suma", "cantidad"],
+        aggfunc="sum"
+    )
+    cuadro = (cuadro["suma"] / cuadro["cantidad"]).round(2).reindex(
+        [g for g in LISTA_GRADOS_NOTAS if g in cuadro.index]
+    )
+
+    st.dataframe(cuadro, width="stretch")
@@ -0,0 +1,69 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from alumnos_service import indexar_nies_existentes
+from espejo_service import invalidar_espejo
+from finanzas_service import marcar_resumen_completo
+from firebase_service import eliminar_por_consulta
+from notas_service import invalidar_cubos, marcar_resumen_notas_completo
+from roster_service import invalidar_nominas
+
+
+def borrar_coleccion(db, coll_name):
+    if not db: return 0
+    avance = st.empty()
+    total = eliminar_por_consulta(db, db.collection(coll_name), progreso=lambda n: avance.caption(f"🗑️ {coll_name}: {n} documentos eliminados..."))
+    avance.caption(f"✅ {coll_name}: {total} documentos eliminados.")
+    return total
+
+
+def mostrar_configuracion(db):
+    """
+    Usuarios del sistema y mantenimiento de la
+    base de datos (reservado al desarrollador).
+    """
+
+    st.header("⚙️ Configuración")
+    t_usr, t_db = st.tabs(["👥 Usuarios", "⚠️ Base de Datos"])
+
+    with t_usr:
+        st.subheader("Crear / Editar Credenciales")
+        ur = db.collection("usuarios").stream()
+        lu = [u.to_dict() for u in ur]
+        if st.session_state["user_id"] != "david":
+            lu = [x for x in lu if x["usuario"] != "david"]
+        st.dataframe(pd.DataFrame(lu), use_container_width=True)
+        with st.form("add_user"):
+            c1, c2 = st.columns(2)
+            u_user = c1.text_input("Usuario (ID)")
+            u_pass = c2.text_input("Contraseña", type="password")
+            u_name = c1.text_input("Nombre Real")
+            u_rol = c2.selectbox("Rol", ["docente", "admin"])
+            if st.form_submit_button("Guardar"):
+                if u_user == "david" and st.session_state["user_id"] != "david":
+                    st.error("No tienes permiso para modificar al Super Admin.")
+                else:
+                    db.collection("usuarios").document(u_user).set({"usuario": u_user, "pass": u_pass, "rol": u_rol, "nombre": u_name})
+                    st.success("Usuario creado/actualizado"); time.sleep(1); st.rerun()
+
+    with t_db:
+        if st.session_state["user_id"] == "david":
+            st.warning("Zona de Peligro")
+            if st.button("🔴 BORRAR TODO") and st.text_input("Confirmar:") == "BORRAR":
+                borrar_coleccion(db, "alumnos"); borrar_coleccion(db, "maestros_perfil"); borrar_coleccion(db, "carga_academica"); borrar_coleccion(db, "finanzas"); borrar_coleccion(db, "finanzas_resumen"); borrar_coleccion(db, "notas"); borrar_coleccion(db, "notas_resumen"); borrar_coleccion(db, "notas_estadisticas"); borrar_coleccion(db, "asistencia_resumen")
+                borrar_coleccion(db, "usuarios")
+                # Sin transacciones ni notas, los resúmenes quedan completos
+                marcar_resumen_completo(db); marcar_resumen_notas_completo(db)
+                invalidar_espejo("carga_academica", "maestros_perfil"); invalidar_nominas(); invalidar_cubos()
+                db.collection("usuarios").document("david").set({"usuario": "david", "pass": "admin123", "rol": "admin", "nombre": "David Fuentes (Dev)"})
+                st.success("Borrado completo.")
+            st.divider()
+            st.caption("Completa el índice de alumnos (campo 'nies') en notas mensuales y asistencias anteriores.")
+            if st.button("🧭 Indexar NIE en registros antiguos"):
+                with st.spinner("Indexando..."):
+                    total_indexados = indexar_nies_existentes(db)
+                st.success(f"Documentos indexados: {total_indexados}")
+        else:
+            st.info("Función reservada para el desarrollador.")
@@ -0,0 +1,277 @@
+import time
+
+import pandas as pd
+import streamlit as st
+import streamlit.components.v1 as components
+from firebase_admin import firestore
+
+from academic_config import (
+    LISTA_GRADOS_NOTAS,
+    LISTA_GRADOS_TODO,
+    LISTA_MESES,
+    MAPA_CURRICULAR,
+)
+from activos import LOGO, SELLO, documento_impresion, etiqueta_imagen
+from asistencia_service import guardar_asistencia
+from config import CICLO_LECTIVO
+from espejo_service import maestro_guia
+from notas_service import (
+    calcular_promedios,
+    cargar_cubo_alumno,
+    columnas_materia,
+    filas_alumno,
+)
+from roster_service import obtener_alumnos_activos
+from sesion_service import contexto_usuario, refrescar_contexto
+from utils import obtener_fecha_hoy, obtener_hora_actual
+from views.editor_notas import mostrar_editor_notas
+from views.importar_notas import mostrar_importacion_notas
+
+
+def mostrar_listados(db):
+    """
+    Hoja de control de evaluación de un grado para imprimir.
+    """
+
+    st.title("🖨️ Imprimir Listas")
+    g = st.selectbox("Grado:", LISTA_GRADOS_TODO)
+    mes_lista = st.selectbox("Mes:", LISTA_MESES)
+    if st.button("Generar Hoja de Control"):
+        lista = [a['nombre'] for a in obtener_alumnos_activos(db, g)]
+        if not lista: st.warning("Sin alumnos")
+        else:
+            hi = etiqueta_imagen(LOGO, 50)
+            rows = ""
+            for i, n in enumerate(lista):
+                rows += f"<tr><td>{i+1}</td><td style='text-align:left;padding-left:5px;'>{n}</td><td></td><td></td><td></td><td></td><td></td><td></td></tr>"
+            html = f"""<div style='font-family:Arial;font-size:12px;padding:20px;'><div style='display:flex;align-items:center;border-bottom:2px solid black;margin-bottom:10px;'>{hi}<div style='margin-left:15px'><h3>COLEGIO PROFA. BLANCA ELENA</h3><h4>CONTROL DE EVALUACIÓN - {mes_lista.upper()} - {g.upper()}</h4></div></div><table border='1' style='width:100%;border-collapse:collapse;text-align:center;'><tr style='background:#eee;font-weight:bold;'><td width='5%'>No.</td><td width='40%'>NOMBRE</td><td width='8%'>ACT1</td><td width='8%'>ACT2</td><td width='8%'>ALT1</td><td width='8%'>ALT2</td><td width='8%'>EXAM</td><td width='10%'>PROM</td></tr>{rows}</table></div>"""
+            components.html(documento_impresion(f"""{html}<br><button onclick="window.print()">🖨️ IMPRIMIR LISTADO</button>"""), height=600, scrolling=True)
+
+
+@st.fragment
+def _editor_asistencia(db, fecha, grado, df_asist, clave):
+    """
+    Fragmento con el editor de asistencia y su botón de
+    guardar: marcar un alumno no relee la nómina ni el
+    documento de asistencia del día.
+    """
+
+    ed = st.data_editor(df_asist, column_config={"NIE": st.column_config.TextColumn(disabled=True), "Nombre": st.column_config.TextColumn(disabled=True), "Estado": st.column_config.SelectboxColumn("Estado", options=["Presente", "Ausente", "Tardanza", "Permiso"], required=True), "Observación": st.column_config.TextColumn(width="medium")}, hide_index=True, width="stretch", key=clave)
+    if st.button("💾 Guardar Asistencia"):
+        regs = {r["NIE"]: r["Estado"] for r in ed.to_dict(orient="records")}
+        obs_regs = {r["NIE"]: r["Observación"] for r in ed.to_dict(orient="records")}
+        guardar_asistencia(db, fecha, grado, regs, obs_regs)
+        st.success("Guardado.")
+
+
+def mostrar_tomar_asistencia(db):
+    """
+    Toma de asistencia diaria de un grado.
+    """
+
+    st.title("📅 Control de Asistencia")
+    c1, c2 = st.columns(2)
+    fecha_asist = c1.date_input("Fecha:", obtener_fecha_hoy())
+    grado_asist = c2.selectbox("Grado:", LISTA_GRADOS_TODO)
+    if grado_asist:
+        id_asistencia = ( f"{CICLO_LECTIVO}_{fecha_asist}_{grado_asist}")
+        doc_snap = db.collection("asistencia").document(id_asistencia).get()
+        lista_alumnos = [{"NIE": a['nie'], "Nombre": a['nombre']} for a in obtener_alumnos_activos(db, grado_asist)]
+        if lista_alumnos:
+            datos = doc_snap.to_dict().get("registros", {}) if doc_snap.exists else {}
+            observaciones = doc_snap.to_dict().get("observaciones", {}) if doc_snap.exists else {}
+            data_editor = []
+            for alum in lista_alumnos:
+                data_editor.append({"NIE": alum["NIE"], "Nombre": alum["Nombre"], "Estado": datos.get(alum["NIE"], "Presente"), "Observación": observaciones.get(alum["NIE"], "")})
+            df_asist = pd.DataFrame(data_editor)
+            _editor_asistencia(db, fecha_asist, grado_asist, df_asist, id_asistencia)
+        else: st.warning("Sin alumnos.")
+
+
+def mostrar_cargar_notas(db):
+    """
+    Registro mensual de notas de las materias del docente.
+    """
+
+    st.title("📝 Registro de Notas")
+    c1, c2, c3 = st.columns(3)
+    g = c1.selectbox("Grado", ["Select..."]+LISTA_GRADOS_NOTAS)
+    mp = MAPA_CURRICULAR.get(g,[]) if g!="Select..." else []
+    m = c2.selectbox("Materia", ["Select..."]+mp)
+    mes = c3.selectbox("Mes", LISTA_MESES)
+    if g!="Select...":
+        mostrar_importacion_notas(db, g, lambda materia, mes_imp: f"{CICLO_LECTIVO}_{g}_{materia}_{mes_imp}".replace(" ","_"), "cargar", CICLO_LECTIVO)
+    if g!="Select..." and m!="Select...":
+        lista = [{"NIE": a['nie'], "Nombre": a['nombre']} for a in obtener_alumnos_activos(db, g)]
+        if not lista: st.warning("Sin alumnos")
+        else:
+            df = pd.DataFrame(lista).sort_values("Nombre")
+            id_doc = (f"{CICLO_LECTIVO}_{g}_{m}_{mes}".replace(" ","_"))
+            cols = columnas_materia(m)
+            doc_ref = db.collection("notas_mensuales").document(id_doc).get()
+            dd = doc_ref.to_dict().get('detalles', {}) if doc_ref.exists else {}
+            for c in cols: df[c] = df["NIE"].map(lambda x: dd.get(x, {}).get(c, 0.0))
+            if m == "Conducta": df["Promedio"] = df[cols[0]]
+            else: df["Promedio"] = calcular_promedios(df, cols)
+            mostrar_editor_notas(db, g, m, mes, id_doc, df, cols, set(dd), id_doc, "Guardar", CICLO_LECTIVO)
+
+
+def mostrar_mis_cargas(db):
+    """
+    Grados y materias asignados al docente en sesión.
+    """
+
+    st.title("📋 Mi Carga Académica")
+    # Cargas leídas al iniciar sesión por el ID del perfil docente
+    contexto = contexto_usuario(db)
+    if st.button("🔄 Actualizar"):
+        contexto = refrescar_contexto(db) or {}
+    st.caption(f"Actualizado: {contexto.get('actualizado', '-')}")
+    found = False
+    for d in contexto.get("cargas", []):
+        found = True
+        with st.container(border=True):
+            st.subheader(d['grado'])
+            st.write("**Materias:** " + ", ".join(d['materias']))
+            if d.get('es_guia'): st.success("🌟 MAESTRO GUÍA")
+    if not found: st.info("No se encontraron cargas asignadas a su perfil. Contacte a Dirección.")
+
+
+def mostrar_bitacora(db):
+    """
+    Expediente del alumno y su bitácora de observaciones.
+    """
+
+    st.title("📂 Bitácora del Alumno")
+    c1, c2 = st.columns(2)
+    grado_sel = c1.selectbox("Seleccionar Grado", LISTA_GRADOS_TODO)
+    dict_alumnos = {a['nombre']: a['data'] for a in obtener_alumnos_activos(db, grado_sel)}
+    if dict_alumnos:
+        nombre_alum = c2.selectbox("Seleccionar Alumno", ["Seleccionar..."] + sorted(list(dict_alumnos.keys())))
+        if nombre_alum != "Seleccionar...":
+            alum_data = dict_alumnos[nombre_alum]
+            nie_actual = alum_data['nie']
+            st.markdown("---")
+            cp1, cp2 = st.columns([1, 4])
+            with cp1:
+                foto_url_alum = (
+                    alum_data.get("documentos", {})
+                    .get("foto_url")
+                )
+
+                if foto_url_alum:
+                    try:
+                        st.image(
+                            foto_url_alum,
+                            width=130
+                        )
+                    except Exception:
+                        st.markdown(
+                            """
+                            <div style="
+                                width:130px;
+                                height:130px;
+                                border-radius:50%;
+                                background:#e9edf5;
+                                display:flex;
+                                align-items:center;
+                                justify-content:center;
+                                font-size:55px;
+                                margin:auto;
+                            ">
+                                👤
+                            </div>
+                            """,
+                            unsafe_allow_html=True
+                        )
+                else:
+                    st.markdown(
+                        """
+                        <div style="
+                            width:130px;
+                            height:130px;
+                            border-radius:50%;
+                            background:#e9edf5;
+                            display:flex;
+                            align-items:center;
+                            justify-content:center;
+                            font-size:55px;
+                            margin:auto;
+                        ">
+                            👤
+                        </div>
+                        """,
+                        unsafe_allow_html=True
+                    )
+            with cp2:
+                st.subheader(f"{alum_data.get('apellidos', '')} {alum_data.get('nombres', '')}")
+                st.write(f"**NIE:** {alum_data['nie']} | **Responsable:** {alum_data.get('encargado',{}).get('nombre','-')}")
+                st.write(f"**Tel:** {alum_data.get('encargado',{}).get('telefono','-')}")
+            st.divider()
+            st.markdown("### 📝 Historial de Observaciones")
+            with st.expander("➕ Agregar Nueva Nota / Observación", expanded=True):
+                with st.form("form_bitacora"):
+                    nota_texto = st.text_area("Escriba la observación:")
+                    if st.form_submit_button("Guardar en Bitácora"):
+                        if nota_texto:
+                            nueva_entrada = {"nie": nie_actual, "alumno": nombre_alum, "grado": grado_sel, "fecha": firestore.SERVER_TIMESTAMP, "fecha_legible": obtener_hora_actual(), "autor": st.session_state["user_name"], "contenido": nota_texto}
+                            db.collection("bitacora").add(nueva_entrada)
+                            st.success("Nota agregada."); time.sleep(1); st.rerun()
+                        else: st.warning("La nota no puede estar vacía.")
+            logs = db.collection("bitacora").where("nie", "==", nie_actual).stream()
+            lista_logs = [l.to_dict() for l in logs]
+            lista_logs.sort(key=lambda x: x.get('fecha_legible', ''), reverse=True)
+            if lista_logs:
+                for log in lista_logs:
+                    with st.container(border=True):
+                        c_meta, c_body = st.columns([1, 3])
+                        with c_meta:
+                            st.caption(f"📅 {log.get('fecha_legible')}")
+                            st.caption(f"✍️ **{log.get('autor')}**")
+                        with c_body: st.write(log.get('contenido'))
+            else: st.info("No hay registros en la bitácora de este alumno.")
+    else: c2.warning("No hay alumnos inscritos en este grado.")
+
+
+def mostrar_boletas_docente(db):
+    """
+    Boleta de notas imprimible de un alumno.
+    """
+
+    st.title("🖨️ Impresión de Boletas de Notas")
+    c1, c2 = st.columns(2)
+    grado_sel = c1.selectbox("Seleccionar Grado", LISTA_GRADOS_TODO)
+    dict_alumnos = {a['nombre']: a['data'] for a in obtener_alumnos_activos(db, grado_sel)}
+
+    if dict_alumnos:
+        nombre_alum = c2.selectbox("Seleccionar Alumno", ["Seleccionar..."] + sorted(list(dict_alumnos.keys())))
+        if nombre_alum != "Seleccionar...":
+            alum_data = dict_alumnos[nombre_alum]
+            malla_completa = MAPA_CURRICULAR.get(grado_sel, [])
+
+            st.markdown("---")
+            st.subheader("Configuración de Boleta")
+            st.info("Puede eliminar de la lista las materias que aún no desea que aparezcan en el reporte impreso.")
+            materias_seleccionadas = st.multiselect("Seleccione las materias a incluir en la boleta:", malla_completa, default=malla_completa)
+
+            if st.button("Generar Boleta") and materias_seleccionadas:
+                # Obtener al guía del grado
+                guia_boleta = maestro_guia(db, grado_sel)
+
+                # Cubo de notas del alumno
+                cubo = cargar_cubo_alumno(db, alum_data['nie'], materias_seleccionadas, grado=grado_sel)
+
+                filas = []
+                for fila in filas_alumno(cubo, alum_data['nie']):
+                    # Si no hay notas registradas para esa materia todavía los meses salen con "-"
+                    feb, mar, abr, may, jun, jul, ago, sep, oct_ = fila['meses']
+                    t1, t2, t3 = fila['trimestres']
+                    fin = fila['final']
+                    filas.append(f"<tr><td style='text-align:left'>{fila['materia']}</td><td>{feb}</td><td>{mar}</td><td>{abr}</td><td style='background:#eee'><b>{t1}</b></td><td>{may}</td><td>{jun}</td><td>{jul}</td><td style='background:#eee'><b>{t2}</b></td><td>{ago}</td><td>{sep}</td><td>{oct_}</td><td style='background:#eee'><b>{t3}</b></td><td style='background:#333;color:white'><b>{fin}</b></td></tr>")
+
+                hi = etiqueta_imagen(LOGO, 60)
+                hs = etiqueta_imagen(SELLO, 80)
+                html = f"""<div style='font-family:Arial;font-size:12px;padding:20px;'><div style='display:flex;align-items:center;border-bottom:2px solid black;margin-bottom:10px;'>{hi}<div style='margin-left:20px'><h2>COLEGIO PROFA. BLANCA ELENA</h2><h4>INFORME DE NOTAS</h4></div></div><p><b>Alumno:</b> {nombre_alum} | <b>Grado:</b> {grado_sel} | <b>Guía:</b> {guia_boleta}</p><table border='1' style='width:100%;border-collapse:collapse;text-align:center;'><tr style='background:#ddd;font-weight:bold;'><td>ASIGNATURA</td><td>F</td><td>M</td><td>A</td><td>T1</td><td>M</td><td>J</td><td>J</td><td>T2</td><td>A</td><td>S</td><td>O</td><td>T3</td><td>FIN</td></tr>{"".join(filas)}</table><br><br><br><div style='display:flex;justify-content:space-between;align-items:end;padding:0 50px;'><div style='text-align:center;width:30%'><div style='border-top:1px solid black;width:100%'>Orientador</div></div><div style='text-align:center;'>{hs}</div><div style='text-align:center;width:30%'><div style='border-top:1px solid black;width:100%'>Dirección</div></div></div></div>"""
+                components.html(documento_impresion(f"""{html}<br><button onclick="window.print()">🖨️ IMPRIMIR BOLETA</button>"""), height=600, scrolling=True)
+    else:
+        c2.warning("No hay alumnos inscritos en este grado.")
@@ -4,6 +4,9 @@ import pandas as pd
 import streamlit as st
 from firebase_admin import firestore
 from config import CICLO_LECTIVO
+from espejo_service import cargas_academicas, invalidar_espejo, maestros
+from finanzas_service import eliminar_movimientos, registrar_movimiento
+from firebase_service import eliminar_por_consulta
 
 
 def mostrar_maestros(
@@ -32,12 +35,9 @@ def mostrar_maestros(
     # CARGAR DOCENTES
     # ==========================================
 
-    docs_m = db.collection("maestros_perfil").stream()
-
     mapa_profesores = {}
 
-    for documento in docs_m:
-        data = documento.to_dict()
+    for id_docente, data in maestros(db):
 
         nombre = data.get("nombre", "Sin Nombre")
         codigo = data.get("codigo", "S/C")
@@ -54,7 +54,7 @@ def mostrar_maestros(
         )
 
         mapa_profesores[key_name] = {
-            "id": documento.id,
+            "id": id_docente,
             "data": data,
         }
 
@@ -138,6 +138,8 @@ def mostrar_maestros(
                         }
                     )
 
+                    invalidar_espejo("maestros_perfil")
+
                     st.success(
                         "✅ Docente registrado correctamente."
                     )
@@ -304,6 +306,8 @@ def mostrar_maestros(
                     actualizacion
                 )
 
+                invalidar_espejo("maestros_perfil")
+
                 st.session_state[
                     "edit_prof_mode"
                 ] = False
@@ -399,6 +403,8 @@ def mostrar_maestros(
                             }
                         )
 
+                        invalidar_espejo("carga_academica")
+
                         st.success(
                             "✅ Carga académica asignada."
                         )
@@ -412,28 +418,17 @@ def mostrar_maestros(
                 "#### Carga Actual"
             )
 
-            cargas = (
-                db.collection(
-                    "carga_academica"
-                )
-                .where(
-                    "id_docente",
-                    "==",
-                    pid
-                )
-                .stream()
+            cargas = cargas_academicas(
+                db,
+                id_docente=pid
             )
 
             cargas_encontradas = False
 
-            for carga in cargas:
+            for id_carga, datos_carga in cargas:
 
                 cargas_encontradas = True
 
-                datos_carga = (
-                    carga.to_dict()
-                )
-
                 texto_titulo = (
                     f"{datos_carga.get('grado', '?')}"
                 )
@@ -466,16 +461,18 @@ def mostrar_maestros(
                         "🗑️ Eliminar carga",
                         key=(
                             f"del_carga_"
-                            f"{carga.id}"
+                            f"{id_carga}"
                         )
                     ):
 
                         db.collection(
                             "carga_academica"
                         ).document(
-                            carga.id
+                            id_carga
                         ).delete()
 
+                        invalidar_espejo("carga_academica")
+
                         st.rerun()
 
             if not cargas_encontradas:
@@ -554,9 +551,8 @@ def mostrar_maestros(
                         else:
                             tipo_db = "interno"
 
-                        db.collection(
-                            "finanzas"
-                        ).add(
+                        registrar_movimiento(
+                            db,
                             {
                                 "tipo": tipo_db,
                                 "categoria_persona": (
@@ -776,6 +772,8 @@ def mostrar_maestros(
                         datos_baja
                     )
 
+                    invalidar_espejo("maestros_perfil")
+
                     st.success(
                         "✅ Docente dado de baja correctamente."
                     )
@@ -810,6 +808,8 @@ def mostrar_maestros(
                     datos_reactivacion
                 )
 
+                invalidar_espejo("maestros_perfil")
+
                 st.success(
                     "✅ Docente reactivado correctamente."
                 )
@@ -882,7 +882,8 @@ def mostrar_maestros(
                     # 1. CARGA ACADÉMICA
                     # ==================================
 
-                    cargas = (
+                    cargas_eliminadas = eliminar_por_consulta(
+                        db,
                         db.collection(
                             "carga_academica"
                         )
@@ -891,20 +892,15 @@ def mostrar_maestros(
                             "==",
                             pid
                         )
-                        .stream()
                     )
 
-                    cargas_eliminadas = 0
-
-                    for carga in cargas:
-                        carga.reference.delete()
-                        cargas_eliminadas += 1
-
                     # ==================================
                     # 2. FINANZAS DEL DOCENTE
                     # ==================================
 
-                    movimientos = (
+                    # Descuenta los montos de finanzas_resumen
+                    movimientos_eliminados = eliminar_movimientos(
+                        db,
                         db.collection(
                             "finanzas"
                         )
@@ -913,15 +909,8 @@ def mostrar_maestros(
                             "==",
                             pid
                         )
-                        .stream()
                     )
 
-                    movimientos_eliminados = 0
-
-                    for movimiento in movimientos:
-                        movimiento.reference.delete()
-                        movimientos_eliminados += 1
-
                     # ==================================
                     # 3. PERFIL PRINCIPAL
                     # ==================================
@@ -932,6 +921,11 @@ def mostrar_maestros(
                         pid
                     ).delete()
 
+                    invalidar_espejo(
+                        "carga_academica",
+                        "maestros_perfil"
+                    )
+
                     # Limpiar estados relacionados
                     if (
                         "edit_prof_mode"
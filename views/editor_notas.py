@@ -0,0 +1,74 @@
+import time
+
+import streamlit as st
+
+from config import CICLO_LECTIVO
+from notas_service import guardar_notas_mes
+
+
+@st.fragment
+def mostrar_editor_notas(
+    db,
+    grado,
+    materia,
+    mes,
+    id_documento,
+    df,
+    columnas,
+    guardados,
+    clave,
+    etiqueta="Guardar",
+    ciclo_lectivo=CICLO_LECTIVO,
+):
+    """
+    Editor de notas de una materia y un mes con su botón
+    de guardar.
+
+    Es un fragmento: editar una celda vuelve a ejecutar solo
+    el editor, sin releer la nómina ni notas_mensuales. df y
+    guardados (NIE ya presentes en notas_mensuales) vienen de
+    la última ejecución completa, que se repite al guardar.
+    """
+
+    cfg = {
+        "NIE": st.column_config.TextColumn(disabled=True),
+        "Nombre": st.column_config.TextColumn(disabled=True, width="medium"),
+        "Promedio": st.column_config.NumberColumn(disabled=True),
+    }
+
+    for c in columnas:
+        cfg[c] = st.column_config.NumberColumn(
+            min_value=0.0,
+            max_value=10.0,
+            step=0.01
+        )
+
+    ed = st.data_editor(
+        df,
+        column_config=cfg,
+        hide_index=True,
+        width="stretch",
+        key=clave
+    )
+
+    if st.button(etiqueta):
+        # Solo los alumnos con cambios respecto a lo cargado
+        total = guardar_notas_mes(
+            db,
+            grado,
+            materia,
+            mes,
+            id_documento,
+            df,
+            ed,
+            columnas,
+            guardados,
+            ciclo_lectivo
+        )
+
+        if total:
+            st.success(f"Guardado ({total} alumnos actualizados)")
+            time.sleep(1)
+            st.rerun()
+        else:
+            st.info("No hay cambios por guardar.")
@@ -0,0 +1,267 @@
+import time
+from datetime import timedelta
+
+import pandas as pd
+import streamlit as st
+import streamlit.components.v1 as components
+from firebase_admin import firestore
+
+from academic_config import LISTA_GRADOS_TODO
+from activos import LOGO, documento_impresion, etiqueta_imagen
+from espejo_service import maestros
+from finanzas_service import (
+    existe_duplicado,
+    obtener_movimientos_dia,
+    paginar_movimientos,
+    registrar_movimiento,
+    resumen_completo,
+    totales_periodo,
+    verificar_pago_duplicado_hoy,
+)
+from reportes_html import render_reporte_financiero
+from roster_service import obtener_alumnos_activos
+from utils import obtener_fecha_hoy, obtener_hora_actual
+
+
+def mostrar_finanzas(db):
+    """
+    Corte de caja, cobros a alumnos, gastos operativos
+    y reportes financieros por periodo.
+    """
+
+    st.title("💰 Administración Financiera")
+    t1, t2, t3, t4 = st.tabs(["📊 Corte de Caja", "➕ Cobros (Alumnos)", "➖ Gastos Operativos", "📜 Reportes & Reimpresión"])
+
+    with t1:
+        c_date, _ = st.columns([1, 2])
+        fecha_corte = c_date.date_input("Fecha de Corte", obtener_fecha_hoy())
+        fecha_str = fecha_corte.strftime("%d/%m/%Y")
+        data_hoy = obtener_movimientos_dia(db, fecha_corte)
+        # Los totales salen de las mismas filas que muestra la tabla
+        ingreso_dia = 0.0
+        egreso_dia = 0.0
+        for d in data_hoy:
+            if d['tipo'] == 'ingreso': ingreso_dia += d['monto']
+            elif d['tipo'] == 'egreso': egreso_dia += d['monto']
+        saldo_dia = ingreso_dia - egreso_dia
+        kpi1, kpi2, kpi3 = st.columns(3)
+        kpi1.metric("Ingresos del Día", f"${ingreso_dia:.2f}", delta_color="normal")
+        kpi2.metric("Gastos del Día", f"${egreso_dia:.2f}", delta_color="inverse")
+        kpi3.metric("Saldo Neto", f"${saldo_dia:.2f}")
+        st.divider()
+        if data_hoy:
+            df_hoy = pd.DataFrame(data_hoy)
+            st.dataframe(df_hoy[['descripcion', 'tipo', 'monto', 'nombre_persona']], use_container_width=True)
+            if st.button("🖨️ Imprimir Corte del Día"):
+                hi = etiqueta_imagen(LOGO, 40)
+                html_corte = f"""<div style="font-family:monospace;width:300px;margin:auto;border:1px solid black;padding:10px;"><div style="text-align:center;">{hi}<br><b>COLEGIO BLANCA ELENA</b><br>CORTE DE CAJA</div><br><b>FECHA:</b> {fecha_str}<br><hr><table width="100%"><tr><td>(+) INGRESOS:</td><td align="right">${ingreso_dia:.2f}</td></tr><tr><td>(-) GASTOS:</td><td align="right">${egreso_dia:.2f}</td></tr><tr><td><b>(=) SALDO:</b></td><td align="right"><b>${saldo_dia:.2f}</b></td></tr></table><br><div style="text-align:center;margin-top:20px;">___________________<br>Firma Responsable</div></div>"""
+                components.html(documento_impresion(f"""{html_corte}<br><center><button onclick="window.print()">IMPRIMIR</button></center>"""), height=400)
+        else: st.info("No hay movimientos hoy.")
+
+    with t2:
+        st.subheader("Búsqueda de Alumno para Cobro")
+        modo_busqueda = st.radio("Buscar por:", ["NIE", "Nombre", "Grado"], horizontal=True)
+        nie_encontrado = None
+
+        if modo_busqueda == "NIE":
+            n_input = st.text_input("Ingrese NIE:")
+
+            if st.button("Buscar por NIE") and n_input:
+                d = db.collection("alumnos").document(n_input).get()
+
+                if d.exists:
+                    alumno_data = d.to_dict()
+
+                    if alumno_data.get("estado", "Activo") != "Activo":
+                        st.warning(
+                            "⚠️ Este alumno está dado de baja y no puede recibir nuevos cobros."
+                        )
+
+                        if "pago_alum" in st.session_state:
+                            del st.session_state["pago_alum"]
+                        if pa.get("estado", "Activo") != "Activo":
+                            st.warning(
+                                "⚠️ El alumno seleccionado está dado de baja. "
+                                "No se permiten nuevos cobros."
+                        )
+
+                        del st.session_state["pago_alum"]
+                        st.rerun()
+                else:
+                    st.session_state.pago_alum = alumno_data
+            else:
+                st.error("No encontrado")
+
+        elif modo_busqueda == "Nombre":
+            alums_ref = (
+                db.collection("alumnos")
+                .where("estado", "==", "Activo")
+                .stream()
+            )
+            mapa_nombres = {f"{a.to_dict().get('apellidos', '')} {a.to_dict().get('nombres', '')}": a.id for a in alums_ref}
+            sel_nom = st.selectbox("Seleccione Alumno:", [""] + sorted(list(mapa_nombres.keys())))
+            if sel_nom:
+                nie_encontrado = mapa_nombres[sel_nom]
+                if st.button("Cargar Alumno"):
+                    st.session_state.pago_alum = db.collection("alumnos").document(nie_encontrado).get().to_dict()
+
+        elif modo_busqueda == "Grado":
+            sel_grado = st.selectbox("Seleccione Grado:", LISTA_GRADOS_TODO)
+            mapa_grado = {a['nombre']: a['nie'] for a in obtener_alumnos_activos(db, sel_grado)}
+            sel_nom_g = st.selectbox("Alumno del Grado:", [""] + sorted(list(mapa_grado.keys())))
+            if sel_nom_g:
+                nie_encontrado = mapa_grado[sel_nom_g]
+                if st.button("Cargar Alumno Grado"):
+                    st.session_state.pago_alum = db.collection("alumnos").document(nie_encontrado).get().to_dict()
+
+        st.divider()
+
+        if "pago_alum" in st.session_state:
+            pa = st.session_state.pago_alum
+            st.success(f"Cobrando a: **{pa.get('apellidos', '')} {pa.get('nombres', '')}** (NIE: {pa['nie']})")
+
+            with st.form("form_cobro"):
+                tipo_c = st.selectbox("Tipo de Cobro", ["Colegiatura", "Matrícula", "Uniformes", "Otros"])
+                det_c = st.text_input("Detalle (Ej: Mes de Marzo)")
+                monto = st.number_input("Monto ($)", min_value=0.01)
+                obs = st.text_input("Observaciones")
+                if st.form_submit_button("✅ Registrar Ingreso"):
+                    desc_full = f"{tipo_c} - {det_c}"
+                    if existe_duplicado(db, "finanzas", "alumno_nie", pa['nie'], desc_full):
+                        st.error("⛔ Transacción duplicada (Mismo alumno, mismo concepto hoy).")
+                    else:
+                        recibo_data = {"tipo": "ingreso", "descripcion": desc_full, "monto": monto, "alumno_nie": pa['nie'], "grado": pa.get('grado_actual'), "nombre_persona": f"{pa.get('apellidos', '')} {pa.get('nombres', '')}", "observaciones": obs, "fecha": firestore.SERVER_TIMESTAMP, "fecha_legible": obtener_hora_actual(), "id_short": str(int(time.time()))[-6:]}
+                        registrar_movimiento(db, recibo_data)
+                        st.session_state.recibo_temp = recibo_data
+                        st.success("Cobro registrado")
+                        del st.session_state.pago_alum
+                        st.rerun()
+        if "recibo_temp" in st.session_state:
+            r = st.session_state.recibo_temp
+            hi = etiqueta_imagen(LOGO, 60)
+            html_recibo = f"""<div style="border: 2px solid #333; padding: 20px; font-family: 'Helvetica', sans-serif; max-width: 700px; margin: auto;"><table width="100%"><tr><td width="20%">{hi}</td><td width="60%" align="center"><h3 style="margin:0;">COLEGIO PROFA. BLANCA ELENA DE HERNÁNDEZ</h3><p style="margin:5px; font-size:12px;">San Felipe, San Bartolo, Ilopango</p><p style="margin:0; font-size:12px;"><b>COMPROBANTE DE INGRESO</b></p></td><td width="20%" align="right"><h4 style="margin:0; color: #d32f2f;">NO. {r.get('id_short','000')}</h4><p style="font-size:12px;">{r['fecha_legible']}</p></td></tr></table><hr><div style="padding: 10px;"><p><b>RECIBIMOS DE:</b> {r['nombre_persona']}</p><p><b>LA CANTIDAD DE:</b> <span style="font-size:18px; font-weight:bold;">${r['monto']:.2f}</span></p><p><b>POR CONCEPTO DE:</b> {r['descripcion']}</p></div><br><br><table width="100%"><tr><td align="center" style="border-top: 1px solid #000; width:40%;">Entregado Por</td><td width="20%"></td><td align="center" style="border-top: 1px solid #000; width:40%;">Recibido (Caja)</td></tr></table></div>"""
+            components.html(documento_impresion(f"""{html_recibo}<br><center><button onclick="window.print()">🖨️ IMPRIMIR COMPROBANTE</button></center>"""), height=500)
+            if st.button("Cerrar Comprobante"): del st.session_state.recibo_temp; st.rerun()
+
+    with t3:
+        with st.form("fg"):
+            tp = st.selectbox("Gasto", ["Salario", "Servicios", "Mantenimiento", "Otros"])
+            maestro_seleccionado = None
+            per = ""
+            if tp == "Salario":
+                l_ms = {datos['nombre']: id_m for id_m, datos in maestros(db) if datos.get("activo") is True}
+                nom_sel = st.selectbox("Seleccionar Maestro:", list(l_ms.keys()))
+                if nom_sel: maestro_seleccionado = l_ms[nom_sel]; per = nom_sel
+            else:
+                per = st.text_input("Pagado a (Nombre/Empresa)")
+
+            mt = st.number_input("Monto", min_value=0.01)
+            det_g = st.text_input("Detalle")
+
+            if st.form_submit_button("Registrar"):
+                desc_full = f"{tp} - {det_g}"
+                duplicado = False
+                if tp == "Salario" and maestro_seleccionado:
+                    if verificar_pago_duplicado_hoy(db, maestro_seleccionado, "Salario"): duplicado = True
+
+                if duplicado:
+                    st.error("⛔ Pago duplicado detectado (Salario ya registrado hoy para este docente).")
+                else:
+                    gasto_data = {"tipo": "egreso", "descripcion": desc_full, "monto": mt, "nombre_persona": per, "fecha": firestore.SERVER_TIMESTAMP, "fecha_legible": obtener_hora_actual(), "id_short": str(int(time.time()))[-6:]}
+                    if maestro_seleccionado: gasto_data["docente_id"] = maestro_seleccionado
+                    registrar_movimiento(db, gasto_data)
+                    st.session_state.gasto_temp = gasto_data
+                    st.success("Registrado"); time.sleep(1); st.rerun()
+
+        if "gasto_temp" in st.session_state:
+            r = st.session_state.gasto_temp
+            hi = etiqueta_imagen(LOGO, 60)
+            html_gasto = f"""<div style="border: 2px solid #d32f2f; padding: 20px; font-family: 'Helvetica', sans-serif; max-width: 700px; margin: auto;"><table width="100%"><tr><td width="20%">{hi}</td><td width="60%" align="center"><h3 style="margin:0;">COLEGIO PROFA. BLANCA ELENA DE HERNÁNDEZ</h3><p style="margin:0; font-size:12px;"><b>COMPROBANTE DE EGRESO (GASTO)</b></p></td><td width="20%" align="right"><h4 style="margin:0; color: #d32f2f;">NO. {r.get('id_short','000')}</h4><p style="font-size:12px;">{r['fecha_legible']}</p></td></tr></table><hr><div style="padding: 10px;"><p><b>PAGADO A:</b> {r['nombre_persona']}</p><p><b>LA CANTIDAD DE:</b> <span style="font-size:18px; font-weight:bold;">${r['monto']:.2f}</span></p><p><b>POR CONCEPTO DE:</b> {r['descripcion']}</p></div><br><br><table width="100%"><tr><td align="center" style="border-top: 1px solid #000; width:40%;">Autorizado Por</td><td width="20%"></td><td align="center" style="border-top: 1px solid #000; width:40%;">Recibido Conforme</td></tr></table></div>"""
+            components.html(documento_impresion(f"""{html_gasto}<br><center><button onclick="window.print()">🖨️ IMPRIMIR COMPROBANTE</button></center>"""), height=500)
+            if st.button("Cerrar Comprobante Gasto"): del st.session_state.gasto_temp; st.rerun()
+
+    with t4:
+        st.subheader("📜 Reportes Financieros")
+
+        c_f1, c_f2, c_f3 = st.columns(3)
+        filtro_rango = c_f1.selectbox("Rango de Tiempo", ["Este Mes", "Mes Pasado", "Últimos 3 Meses", "Últimos 6 Meses", "Este Año", "Personalizado"])
+        f_tipo = c_f2.multiselect("Tipo Transacción:", ["ingreso", "egreso"], default=["ingreso", "egreso"])
+        lista_grados_filtro = ["Todos"] + LISTA_GRADOS_TODO
+        filtro_grado = c_f3.selectbox("Filtrar Grado (Alumnos):", lista_grados_filtro)
+
+        hoy = obtener_fecha_hoy()
+        f_inicio = hoy
+        f_fin = hoy
+
+        if filtro_rango == "Personalizado":
+            c_d1, c_d2 = st.columns(2)
+            f_inicio = c_d1.date_input("Desde", hoy.replace(day=1))
+            f_fin = c_d2.date_input("Hasta", hoy)
+        elif filtro_rango == "Este Mes":
+            f_inicio = hoy.replace(day=1)
+            f_fin = hoy
+        elif filtro_rango == "Mes Pasado":
+            mes_anterior = hoy.replace(day=1) - timedelta(days=1)
+            f_inicio = mes_anterior.replace(day=1)
+            f_fin = mes_anterior
+        elif filtro_rango == "Últimos 3 Meses":
+            f_inicio = hoy - timedelta(days=90)
+            f_fin = hoy
+        elif filtro_rango == "Últimos 6 Meses":
+            f_inicio = hoy - timedelta(days=180)
+            f_fin = hoy
+        elif filtro_rango == "Este Año":
+            f_inicio = hoy.replace(month=1, day=1)
+            f_fin = hoy
+
+        grado_consulta = None if filtro_grado == "Todos" else filtro_grado
+        columnas_rep = ['fecha_legible', 'tipo', 'grado_reporte', 'nombre_persona', 'descripcion', 'monto']
+
+        # Con finanzas_resumen completo los totales salen de unos pocos
+        # resúmenes y el detalle solo se lee si se pide; si no, se suman
+        # las filas recorridas
+        usar_resumen = resumen_completo(db)
+        ver_detalle = not usar_resumen or st.toggle("Mostrar detalle de movimientos")
+
+        # Páginas con cursor: el DataFrame se arma por página; el HTML solo al imprimir
+        paginas_df = []
+        movimientos = []
+        tot_ing = 0.0
+        tot_egr = 0.0
+        avance = st.empty()
+
+        if ver_detalle:
+            for pagina in paginar_movimientos(db, f_inicio, f_fin, f_tipo, grado_consulta):
+                paginas_df.append(pd.DataFrame(pagina).reindex(columns=columnas_rep))
+                movimientos.extend(pagina)
+                for item in pagina:
+                    if item['tipo'] == 'ingreso': tot_ing += item['monto']
+                    elif item['tipo'] == 'egreso': tot_egr += item['monto']
+                avance.caption(f"⏳ {len(movimientos)} registros cargados...")
+            avance.empty()
+
+        if usar_resumen:
+            totales_resumen = totales_periodo(db, f_inicio, f_fin, f_tipo, grado_consulta)
+            tot_ing = totales_resumen.get('ingreso', 0.0)
+            tot_egr = totales_resumen.get('egreso', 0.0)
+
+        st.divider()
+        k1, k2, k3 = st.columns(3)
+        k1.metric("Total Ingresos", f"${tot_ing:.2f}", border=True)
+        k2.metric("Total Egresos", f"${tot_egr:.2f}", delta_color="inverse", border=True)
+        k3.metric("Balance Periodo", f"${tot_ing - tot_egr:.2f}", border=True)
+        st.divider()
+
+        if paginas_df:
+            df_rep = pd.concat(paginas_df, ignore_index=True)
+            st.dataframe(df_rep, use_container_width=True)
+
+            if st.button("🖨️ Imprimir Reporte Generado"):
+                hi = etiqueta_imagen(LOGO, 50)
+
+                titulo_reporte = f"REPORTE FINANCIERO ({filtro_rango})"
+                if filtro_grado != "Todos": titulo_reporte += f" - {filtro_grado.upper()}"
+
+                html_reporte = render_reporte_financiero(movimientos, titulo_reporte, f_inicio, f_fin, tot_ing, tot_egr, logo=hi)
+                components.html(documento_impresion(f"""{html_reporte}<br><center><button onclick="window.print()" style="background:#333; color:white; padding:10px 20px; cursor:pointer;">🖨️ IMPRIMIR REPORTE PDF</button></center>"""), height=600, scrolling=True)
+        elif ver_detalle: st.info("No hay registros en este rango.")
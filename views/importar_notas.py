@@ -0,0 +1,158 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from academic_config import LISTA_MESES, MAPA_CURRICULAR
+from config import CICLO_LECTIVO
+from notas_excel import generar_plantilla, importar_hojas, leer_libro_notas
+from notas_service import calcular_promedios
+from roster_service import obtener_alumnos_activos
+
+
+def mostrar_importacion_notas(
+    db,
+    grado,
+    id_documento,
+    clave,
+    ciclo_lectivo=CICLO_LECTIVO,
+):
+    """
+    Importa desde Excel las notas de varias materias y
+    meses de un grado en una sola operación.
+
+    id_documento(materia, mes) devuelve el ID del documento
+    de notas_mensuales que usa la pantalla; clave distingue
+    los widgets de cada pantalla.
+    """
+
+    with st.expander("📥 Importar notas desde Excel"):
+        alumnos = obtener_alumnos_activos(db, grado)
+
+        if not alumnos:
+            st.warning("Sin alumnos")
+            return
+
+        materias = MAPA_CURRICULAR.get(grado, [])
+
+        c1, c2 = st.columns(2)
+        sel_materias = c1.multiselect(
+            "Materias de la plantilla",
+            materias,
+            default=materias,
+            key=f"{clave}_imp_materias"
+        )
+        sel_meses = c2.multiselect(
+            "Meses de la plantilla",
+            LISTA_MESES,
+            key=f"{clave}_imp_meses"
+        )
+
+        if sel_materias and sel_meses:
+            st.download_button(
+                "⬇️ Descargar plantilla",
+                generar_plantilla(grado, sel_materias, sel_meses, alumnos),
+                file_name=f"Notas_{grado.replace(' ', '_')}.xlsx",
+                mime=(
+                    "application/vnd.openxmlformats-officedocument."
+                    "spreadsheetml.sheet"
+                ),
+                on_click="ignore",
+                key=f"{clave}_imp_plantilla"
+            )
+
+        archivo = st.file_uploader(
+            "Libro de notas (.xlsx)",
+            type=["xlsx"],
+            key=f"{clave}_imp_archivo"
+        )
+
+        if not archivo:
+            return
+
+        hojas, errores = leer_libro_notas(
+            archivo,
+            grado,
+            {a["nie"] for a in alumnos}
+        )
+
+        if errores:
+            st.error(
+                f"Se encontraron {len(errores)} errores. "
+                "Corrija el libro y vuelva a subirlo."
+            )
+
+            for error in errores[:50]:
+                st.write(f"- {error}")
+
+            return
+
+        if not hojas:
+            st.warning("El libro no contiene hojas de notas.")
+            return
+
+        resumen = []
+
+        for hoja in hojas:
+            df = hoja["df"]
+            columnas = hoja["columnas"]
+            promedios = (
+                df[columnas[0]]
+                if hoja["materia"] == "Conducta"
+                else calcular_promedios(df[columnas].fillna(0.0), columnas)
+            )
+
+            resumen.append(
+                {
+                    "Materia": hoja["materia"],
+                    "Mes": hoja["mes"],
+                    "Alumnos": len(df),
+                    "Promedio": round(float(promedios.mean()), 2) if len(df) else 0.0,
+                }
+            )
+
+        st.dataframe(
+            pd.DataFrame(resumen),
+            hide_index=True,
+            width="stretch"
+        )
+
+        st.caption(
+            "Las celdas vacías no se importan: conservan la nota ya "
+            "guardada. Cada hoja se guarda por separado; si la "
+            "importación se interrumpe, vuelva a subir el mismo libro "
+            "para completarla."
+        )
+
+        if st.button(
+            f"💾 Importar {len(hojas)} hojas",
+            type="primary",
+            key=f"{clave}_imp_guardar"
+        ):
+            with st.spinner("Importando notas..."):
+                resultados, error = importar_hojas(
+                    db,
+                    grado,
+                    hojas,
+                    id_documento,
+                    ciclo_lectivo
+                )
+
+            total = sum(guardados for _, _, guardados in resultados)
+
+            if error:
+                st.error(
+                    f"Importación incompleta: se guardaron {len(resultados)} "
+                    f"de {len(hojas)} hojas ({total} registros) y falló "
+                    f"{error}. Vuelva a importar el mismo libro para "
+                    "guardar las hojas restantes."
+                )
+            elif total:
+                st.success(
+                    f"Importación completa ({total} registros "
+                    f"actualizados en {len(resultados)} hojas)"
+                )
+                time.sleep(1)
+                st.rerun()
+            else:
+                st.info("No hay cambios por guardar.")
@@ -0,0 +1,190 @@
+import pandas as pd
+import streamlit as st
+
+from config import CICLO_LECTIVO, COLEGIO_NOMBRE
+from indicadores_service import indicadores_inicio
+from sesion_service import contexto_usuario, refrescar_contexto
+from utils import limpiar_nombre, obtener_fecha_hoy
+
+
+def _valor(valor, vacio="—"):
+    return vacio if valor is None else valor
+
+
+def mostrar_inicio(db):
+    """
+    Tablero de inicio: perfil del docente o
+    indicadores institucionales para la administración.
+    """
+
+    st.title("🍎 Tablero Institucional")
+
+    if st.session_state["user_role"] == "docente" and db:
+        # Perfil armado al iniciar sesión (sesion_service)
+        try:
+            contexto = contexto_usuario(db)
+        except Exception:
+            contexto = {}
+
+        nombre_limpio = limpiar_nombre(st.session_state.get("user_name", ""))
+        found_prof = contexto.get("perfil")
+
+        col_p1, col_p2 = st.columns([1, 4])
+
+        with col_p1:
+            if contexto.get("foto_url"):
+                st.image(contexto["foto_url"], width=150)
+            else:
+                st.markdown(
+                    "<h1 style='text-align: center;'>👤</h1>",
+                    unsafe_allow_html=True,
+                )
+
+        with col_p2:
+            st.subheader(f"Bienvenido, {nombre_limpio}")
+            st.info("Panel Docente - EduManager")
+
+            if found_prof:
+                st.write(
+                    f"📞 {found_prof.get('telefono', '')} | "
+                    f"📧 {found_prof.get('email', '')}"
+                )
+
+            if st.button("🔄 Actualizar mis datos"):
+                refrescar_contexto(db)
+                st.rerun()
+
+    else:
+        st.markdown(
+            f"""
+<div class="dashboard-header">
+    <div class="dashboard-eyebrow">PANEL ADMINISTRATIVO</div>
+    <div class="dashboard-title">
+        Bienvenido, {limpiar_nombre(st.session_state['user_name'])}
+    </div>
+    <div class="dashboard-subtitle">
+        {COLEGIO_NOMBRE} · Ciclo Lectivo {CICLO_LECTIVO}
+    </div>
+</div>
+""",
+            unsafe_allow_html=True,
+        )
+
+        # Agregaciones count() y resúmenes, en caché por un minuto
+        indicadores = indicadores_inicio(db, obtener_fecha_hoy())
+
+        kpi1, kpi2, kpi3, kpi4 = st.columns(4)
+
+        with kpi1:
+            st.metric(
+                label="👨‍🎓 Alumnos activos",
+                value=_valor(indicadores["alumnos_activos"]),
+            )
+
+        with kpi2:
+            st.metric(
+                label="👩‍🏫 Docentes activos",
+                value=_valor(indicadores["docentes_activos"]),
+            )
+
+        with kpi3:
+            st.metric(
+                label="📅 Ciclo lectivo",
+                value=CICLO_LECTIVO,
+            )
+
+        with kpi4:
+            st.metric(
+                label="🟢 Estado",
+                value="Operativo",
+            )
+
+        kpi5, kpi6, kpi7 = st.columns(3)
+
+        with kpi5:
+            ingresos = indicadores["ingresos_dia"]
+
+            st.metric(
+                label="💵 Ingresos de hoy",
+                value="—" if ingresos is None else f"${ingresos:,.2f}",
+            )
+
+        with kpi6:
+            asistencia = indicadores["asistencia_dia"]
+
+            if asistencia and asistencia["registros"]:
+                st.metric(
+                    label="🗓️ Asistencia de hoy",
+                    value=(
+                        f"{asistencia['presentes'] / asistencia['registros'] * 100:.0f}%"
+                    ),
+                    delta=(
+                        f"{asistencia['grados_tomados']} de "
+                        f"{asistencia['grados']} grados registrados"
+                    ),
+                    delta_color="off",
+                )
+            else:
+                st.metric(
+                    label="🗓️ Asistencia de hoy",
+                    value="—",
+                    delta="Sin registros hoy" if asistencia else None,
+                    delta_color="off",
+                )
+
+        with kpi7:
+            notas = indicadores["notas_pendientes"]
+
+            st.metric(
+                label=(
+                    f"📝 Materias sin notas ({notas['mes']})"
+                    if notas
+                    else "📝 Materias sin notas"
+                ),
+                value=_valor(notas and notas["pendientes"]),
+                delta=(
+                    f"de {notas['esperadas']} materias"
+                    if notas
+                    else None
+                ),
+                delta_color="off",
+            )
+
+    st.markdown("---")
+    st.subheader("📅 Agenda de Actividades")
+
+    col_izq, col_der = st.columns(2)
+
+    with col_izq:
+        st.info("**ESTADO: PERIODO DE INSCRIPCIÓN FINALIZADO**")
+        st.write("- Recepción de documentos.")
+        st.write("- Actualización de datos.")
+
+    with col_der:
+        st.success("**PRÓXIMO: INICIO DE EXÁMENES MENSUALES**")
+        st.metric("Fecha", "23 de Febrero", "2026")
+
+    cronograma = [
+        {
+            "Fecha": "16 Feb - 18 Feb",
+            "Actividad": "Matrícula Extraordinaria",
+            "Estado": "En Curso",
+        },
+        {
+            "Fecha": "20 Feb",
+            "Actividad": "Última fecha de Pagos",
+            "Estado": "En Curso",
+        },
+        {
+            "Fecha": "19 Feb",
+            "Actividad": "Entrega de Exámenes a Dirección",
+            "Estado": "Programado",
+        },
+        {
+            "Fecha": "23 Feb",
+            "Actividad": "Inicio de exámenes mensuales",
+            "Estado": "Pendiente",
+        },
+    ]
+
+    st.table(pd.DataFrame(cronograma))
@@ -1,6 +1,7 @@
 import streamlit as st
 from firebase_admin import firestore
 from config import CICLO_LECTIVO
+from roster_service import invalidar_alumnos_activos
 
 
 def mostrar_inscripcion(
@@ -185,6 +186,8 @@ def mostrar_inscripcion(
 
                 doc_ref.set(alumno)
 
+                invalidar_alumnos_activos(grado)
+
                 st.success(
                     f"✅ Alumno {nombres} {apellidos} "
                     f"inscrito correctamente."
@@ -0,0 +1,141 @@
+import pandas as pd
+import streamlit as st
+import streamlit.components.v1 as components
+
+from academic_config import LISTA_GRADOS_NOTAS, LISTA_MESES, MAPA_CURRICULAR
+from activos import LOGO, documento_impresion, etiqueta_imagen
+from boletas_pdf import empaquetar_zip, generar_pdfs_con_cache, generar_pdfs_grados
+from config import CICLO_LECTIVO
+from espejo_service import guias_por_grado, maestro_guia
+from notas_service import (
+    boletas_grado,
+    calcular_promedios,
+    cargar_cubo_grado,
+    columnas_materia,
+    filas_alumno,
+)
+from reportes_html import render_cuadro_anual
+from roster_service import obtener_alumnos_activos
+from views.editor_notas import mostrar_editor_notas
+from views.importar_notas import mostrar_importacion_notas
+
+
+def mostrar_notas(db):
+    """
+    Registro mensual de notas, cuadro anual por grado
+    e impresión de boletas por grado o de toda la institución.
+    """
+
+    st.title("📊 Gestión y Reportes de Notas")
+
+    tab_registro, tab_reporte_grado = st.tabs(["📝 Registro Mensual", "📜 Reporte por Grado (Cuadros)"])
+
+    with tab_registro:
+        c1, c2, c3 = st.columns(3)
+        g = c1.selectbox("Grado", ["Select..."] + LISTA_GRADOS_NOTAS, key="g_reg")
+        mp = MAPA_CURRICULAR.get(g, []) if g != "Select..." else []
+        m = c2.selectbox("Materia", ["Select..."] + mp, key="m_reg")
+        mes = c3.selectbox("Mes", LISTA_MESES, key="mes_reg")
+
+        if g != "Select...":
+            mostrar_importacion_notas(db, g, lambda materia, mes_imp: f"{g}_{materia}_{mes_imp}".replace(" ", "_"), "reg")
+
+        if g != "Select..." and m != "Select...":
+            lista = [{"NIE": a['nie'], "Nombre": a['nombre']} for a in obtener_alumnos_activos(db, g)]
+            if not lista: st.warning("Sin alumnos")
+            else:
+                df = pd.DataFrame(lista).sort_values("Nombre")
+                id_doc = f"{g}_{m}_{mes}".replace(" ", "_")
+                cols = columnas_materia(m)
+                doc_ref = db.collection("notas_mensuales").document(id_doc).get()
+
+                dd = doc_ref.to_dict().get('detalles', {}) if doc_ref.exists else {}
+                for c in cols: df[c] = df["NIE"].map(lambda x: dd.get(x, {}).get(c, 0.0))
+
+                if m == "Conducta":
+                    df["Promedio"] = df[cols[0]]
+                else:
+                    df["Promedio"] = calcular_promedios(df, cols)
+
+                mostrar_editor_notas(db, g, m, mes, id_doc, df, cols, set(dd), f"editor_{id_doc}", "Guardar Notas")
+    with tab_reporte_grado:
+        st.subheader("📜 Cuadro de Registro Anual y Promedios")
+        c1, _ = st.columns([2, 2])
+        g_rep = c1.selectbox("Seleccione Grado para el Cuadro Anual:", ["Select..."] + LISTA_GRADOS_NOTAS, key="g_rep_anual")
+
+        if g_rep != "Select...":
+            if st.button("Generar Reporte de Rendimiento Anual"):
+                with st.spinner("Calculando promedios anuales..."):
+                    # 1. Obtener Alumnos y Materias
+                    alumnos_docs = db.collection("alumnos").where("grado_actual", "==", g_rep).stream()
+                    alumnos_list = [{"nie": d.id, "nombre": f"{d.to_dict().get('apellidos', '')} {d.to_dict().get('nombres', '')}"} for d in alumnos_docs]
+                    alumnos_list.sort(key=lambda x: x["nombre"])
+                    materias = MAPA_CURRICULAR.get(g_rep, [])
+
+                    # 2. Cubo de notas del grado (una sola consulta, promedios vectorizados)
+                    cubo = cargar_cubo_grado(db, g_rep, [a['nie'] for a in alumnos_list], materias)
+
+                    # 3. Renderizado HTML (plantillas de reportes_html, unión lineal de filas)
+                    hi = etiqueta_imagen(LOGO, 50)
+                    html_reporte = render_cuadro_anual(g_rep, alumnos_list, lambda nie: filas_alumno(cubo, nie), logo=hi)
+                    components.html(documento_impresion(f"{html_reporte}<br><center><button onclick='window.print()'>🖨️ DESCARGAR REPORTE ANUAL</button></center>"), height=800, scrolling=True)
+    # --- SECCIÓN DE IMPRESIÓN MASIVA ACTUALIZADA ---
+    st.divider()
+    st.subheader("🖨️ Impresión Masiva de Boletas")
+    c_lote, c_mat = st.columns([1, 2])
+
+    g_lote = c_lote.selectbox("Grado:", ["Select..."] + LISTA_GRADOS_NOTAS, key="g_lote_v2")
+
+    # Selección dinámica de materias
+    materias_disponibles = MAPA_CURRICULAR.get(g_lote, []) if g_lote != "Select..." else []
+    materias_seleccionadas = c_mat.multiselect(
+        "Materias a incluir en la boleta:", 
+        options=materias_disponibles, 
+        default=materias_disponibles
+    )
+
+    if g_lote != "Select..." and st.button("Generar Lote Personalizado"):
+        if not materias_seleccionadas:
+            st.warning("Por favor seleccione al menos una materia.")
+        else:
+            with st.spinner("Preparando documentos..."):
+                # 1. Datos de alumnos y notas
+                alumnos_lote = obtener_alumnos_activos(db, g_lote)
+
+                guia_lote = maestro_guia(db, g_lote)
+
+                cubo = cargar_cubo_grado(db, g_lote, [a['nie'] for a in alumnos_lote], materias_seleccionadas)
+
+                # 2. PDF carta, dos boletas por página, generado en el servidor
+                pdf_lote = generar_pdfs_grados([{"grado": g_lote, "guia": guia_lote, "boletas": boletas_grado(cubo, alumnos_lote)}])[g_lote]
+
+            st.success(f"Lote listo: {len(alumnos_lote)} boletas.")
+            st.download_button("📥 DESCARGAR LOTE DE BOLETAS (PDF)", pdf_lote, file_name=f"Boletas_{g_lote.replace(' ', '_')}_{CICLO_LECTIVO}.pdf", mime="application/pdf", on_click="ignore", type="primary")
+
+    # --- LOTE DE TODA LA INSTITUCIÓN ---
+    st.divider()
+    st.subheader("🏫 Boletas de Toda la Institución")
+    st.caption("Un PDF por grado dentro de un archivo zip. Solo se vuelven a generar los grados cuyas notas, nómina o guía cambiaron desde el último lote.")
+    todas_materias = sorted({mat for g_inst in LISTA_GRADOS_NOTAS for mat in MAPA_CURRICULAR[g_inst]})
+    materias_excluidas = st.multiselect("Materias a excluir de todas las boletas:", options=todas_materias, key="mat_excl_inst")
+
+    if st.button("Generar Lote Institucional"):
+        with st.spinner("Preparando boletas de todos los grados..."):
+            # Un solo recorrido de los guías de todos los grados
+            guias = guias_por_grado(db)
+
+            trabajos = []
+            for g_inst in LISTA_GRADOS_NOTAS:
+                alumnos_inst = obtener_alumnos_activos(db, g_inst)
+                if not alumnos_inst: continue
+                materias_inst = [mat for mat in MAPA_CURRICULAR[g_inst] if mat not in materias_excluidas]
+                cubo = cargar_cubo_grado(db, g_inst, [a['nie'] for a in alumnos_inst], materias_inst)
+                trabajos.append({"grado": g_inst, "guia": guias.get(g_inst) or "No Asignado", "boletas": boletas_grado(cubo, alumnos_inst)})
+
+            pdfs, regenerados = generar_pdfs_con_cache(trabajos)
+            zip_inst = empaquetar_zip(pdfs)
+
+        if not pdfs: st.warning("No hay alumnos activos en los grados con notas.")
+        else:
+            st.success(f"Lote listo: {len(pdfs)} grados ({len(regenerados)} regenerados, {len(pdfs) - len(regenerados)} sin cambios).")
+            st.download_button("📥 DESCARGAR BOLETAS DE LA INSTITUCIÓN (ZIP)", zip_inst, file_name=f"Boletas_Institucion_{CICLO_LECTIVO}.zip", mime="application/zip", on_click="ignore", type="primary")
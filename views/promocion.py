@@ -1,6 +1,13 @@
 import time
 
+import pandas as pd
 import streamlit as st
+from firebase_admin import firestore
+
+from roster_service import (
+    invalidar_alumnos_activos,
+    obtener_alumnos_activos,
+)
 
 
 MAPA_PROMOCION = {
@@ -15,6 +22,192 @@ MAPA_PROMOCION = {
     "Noveno Grado": "Graduado",
 }
 
+# Un lote admite 500 escrituras; se reserva una para el checkpoint.
+TAM_BLOQUE_PROMOCION = 400
+
+
+def preparar_actualizacion(
+    grado_origen,
+    grado_destino,
+    ciclo_origen,
+    ciclo_destino,
+    fecha,
+    usuario,
+):
+    """
+    Devuelve los campos que se escribirán en el
+    documento del alumno al promoverlo o graduarlo.
+
+    La entrada del historial se agrega con ArrayUnion
+    sobre el documento en Firestore, no sobre la copia
+    de la nómina en caché, que puede estar desactualizada.
+    """
+
+    if grado_destino == "Graduado":
+        entrada = {
+            "ciclo": ciclo_origen,
+            "grado": grado_origen,
+            "resultado": "Graduado",
+            "fecha": fecha,
+        }
+
+        return {
+            "estado": "Graduado",
+            "activo": False,
+            "fecha_baja": fecha,
+            "motivo_baja": "Graduación",
+            "baja_realizada_por": usuario,
+            "ciclo_lectivo": ciclo_origen,
+            "historial_academico": firestore.ArrayUnion([entrada]),
+        }
+
+    entrada = {
+        "ciclo": ciclo_origen,
+        "grado": grado_origen,
+        "resultado": "Promovido",
+        "grado_destino": grado_destino,
+        "fecha": fecha,
+    }
+
+    return {
+        "grado_anterior": grado_origen,
+        "grado_actual": grado_destino,
+        "ciclo_lectivo": ciclo_destino,
+        "estado": "Activo",
+        "activo": True,
+        "fecha_promocion": fecha,
+        "promovido_por": usuario,
+        "historial_academico": firestore.ArrayUnion([entrada]),
+    }
+
+
+def sigue_pendiente(data, paso):
+    """
+    True si el documento actual del alumno todavía está
+    activo en el grado de origen y no pertenece ya al
+    ciclo destino, es decir, si nadie lo promovió desde
+    que se armó el plan.
+    """
+
+    return (
+        data.get("estado", "Activo") == "Activo"
+        and data.get("grado_actual") == paso["grado_origen"]
+        and data.get("ciclo_lectivo") != paso["ciclo_destino"]
+    )
+
+
+def ejecutar_plan_promocion(
+    db,
+    plan,
+    checkpoint_ref,
+    progreso=None,
+):
+    """
+    Aplica el plan en lotes de TAM_BLOQUE_PROMOCION.
+
+    Cada lote registra en el mismo commit los NIE que
+    procesó dentro del checkpoint, de modo que una nueva
+    ejecución continúa desde el primer lote pendiente.
+    Un lote fallido no detiene los siguientes.
+
+    Cada lote vuelve a leer sus alumnos: se omiten los
+    eliminados después de armar el plan (un update sobre un
+    documento inexistente haría fallar el lote completo) y
+    los que ya fueron promovidos o dados de baja, según su
+    documento actual y no la nómina en caché. Si no hubo
+    errores, el checkpoint queda marcado como finalizado.
+    """
+
+    promovidos = 0
+    graduados = 0
+    omitidos = []
+    errores = []
+
+    for inicio in range(0, len(plan), TAM_BLOQUE_PROMOCION):
+        bloque = plan[inicio:inicio + TAM_BLOQUE_PROMOCION]
+
+        referencias = [
+            db.collection("alumnos").document(paso["nie"])
+            for paso in bloque
+        ]
+
+        try:
+            actuales = {
+                snap.id: snap.to_dict()
+                for snap in db.get_all(referencias)
+                if snap.exists
+            }
+
+        except Exception as error:
+            errores.append(
+                f"Lote {inicio // TAM_BLOQUE_PROMOCION + 1} "
+                f"({len(bloque)} alumnos): {error}"
+            )
+            continue
+
+        pendientes = [
+            (paso, referencia)
+            for paso, referencia in zip(bloque, referencias)
+            if paso["nie"] in actuales
+            and sigue_pendiente(actuales[paso["nie"]], paso)
+        ]
+        aplicados = {paso["nie"] for paso, _ in pendientes}
+
+        batch = db.batch()
+
+        for paso, referencia in pendientes:
+            batch.update(referencia, paso["actualizacion"])
+
+        batch.set(
+            checkpoint_ref,
+            {
+                "nies_procesados": firestore.ArrayUnion(
+                    [paso["nie"] for paso in bloque]
+                ),
+                "procesados": firestore.Increment(len(pendientes)),
+                "finalizado": False,
+                "actualizado": firestore.SERVER_TIMESTAMP,
+            },
+            merge=True
+        )
+
+        try:
+            batch.commit()
+
+            for paso, _ in pendientes:
+                if paso["grado_destino"] == "Graduado":
+                    graduados += 1
+                else:
+                    promovidos += 1
+
+            omitidos.extend(
+                paso["nie"] for paso in bloque
+                if paso["nie"] not in aplicados
+            )
+
+        except Exception as error:
+            errores.append(
+                f"Lote {inicio // TAM_BLOQUE_PROMOCION + 1} "
+                f"({len(bloque)} alumnos): {error}"
+            )
+
+        if progreso:
+            progreso(
+                min(inicio + len(bloque), len(plan)),
+                len(plan)
+            )
+
+    if not errores:
+        checkpoint_ref.set(
+            {
+                "finalizado": True,
+                "finalizado_en": firestore.SERVER_TIMESTAMP,
+            },
+            merge=True
+        )
+
+    return promovidos, graduados, omitidos, errores
+
 
 def mostrar_promocion(
     db,
@@ -41,81 +234,133 @@ def mostrar_promocion(
         ciclo_destino,
     )
 
-    grados_disponibles = list(MAPA_PROMOCION.keys())
-
-    grado_origen = st.selectbox(
-        "Grado a promover",
-        grados_disponibles,
+    checkpoint_ref = (
+        db.collection("promociones")
+        .document(f"{ciclo_origen}_{ciclo_destino}")
     )
 
-    grado_destino = MAPA_PROMOCION[grado_origen]
+    checkpoint = checkpoint_ref.get()
 
-    if grado_destino == "Graduado":
-        st.warning(
-            "Los alumnos de Noveno Grado serán marcados "
-            "como GRADUADOS e inactivos."
-        )
-    else:
+    datos_checkpoint = checkpoint.to_dict() if checkpoint.exists else {}
+
+    ya_procesados = set(datos_checkpoint.get("nies_procesados", []))
+
+    if datos_checkpoint.get("finalizado"):
         st.success(
-            f"Destino automático: {grado_destino} - Ciclo {ciclo_destino}"
+            f"La última ejecución de esta promoción finalizó: "
+            f"{len(ya_procesados)} alumnos procesados. Los alumnos "
+            "pendientes que queden pueden promoverse igualmente."
         )
 
-    alumnos_docs = (
-        db.collection("alumnos")
-        .where("grado_actual", "==", grado_origen)
-        .where("estado", "==", "Activo")
-        .stream()
-    )
+    elif ya_procesados:
+        st.info(
+            f"Se encontró un avance previo: {len(ya_procesados)} "
+            "alumnos ya fueron procesados en esta promoción "
+            "y serán omitidos."
+        )
 
-    alumnos = []
+    alcance = st.radio(
+        "Alcance",
+        ["Un grado", "Toda la institución"],
+        horizontal=True,
+    )
 
-    for doc in alumnos_docs:
-        data = doc.to_dict()
+    # ------------------------------------------
+    # ALUMNOS CANDIDATOS
+    # ------------------------------------------
 
-        alumnos.append(
+    # Un alumno cuyo ciclo ya es el destino fue promovido antes.
+    def candidatos(grado):
+        return [
             {
-                "id": doc.id,
-                "nie": data.get("nie", doc.id),
-                "nombre": (
-                    f"{data.get('apellidos', '')} "
-                    f"{data.get('nombres', '')}"
-                ).strip(),
-                "data": data,
+                "nie": alumno["nie"],
+                "nombre": alumno["nombre"].strip(),
+                "data": alumno["data"],
+                "grado_origen": grado,
+                "grado_destino": MAPA_PROMOCION[grado],
             }
+            for alumno in obtener_alumnos_activos(db, grado)
+            if alumno["nie"] not in ya_procesados
+            and alumno["data"].get("ciclo_lectivo") != ciclo_destino
+        ]
+
+    if alcance == "Un grado":
+
+        grado_origen = st.selectbox(
+            "Grado a promover",
+            list(MAPA_PROMOCION.keys()),
         )
 
-    alumnos.sort(
-        key=lambda x: x["nombre"]
-    )
+        grado_destino = MAPA_PROMOCION[grado_origen]
 
-    if not alumnos:
-        st.warning(
-            "No hay alumnos activos en este grado."
+        if grado_destino == "Graduado":
+            st.warning(
+                "Los alumnos de Noveno Grado serán marcados "
+                "como GRADUADOS e inactivos."
+            )
+        else:
+            st.success(
+                f"Destino automático: {grado_destino} - Ciclo {ciclo_destino}"
+            )
+
+        alumnos = candidatos(grado_origen)
+
+        if not alumnos:
+            st.warning(
+                "No hay alumnos activos pendientes de promoción "
+                "en este grado."
+            )
+            return
+
+        st.write(
+            f"**Alumnos activos encontrados:** {len(alumnos)}"
         )
-        return
 
-    st.write(
-        f"**Alumnos activos encontrados:** {len(alumnos)}"
-    )
+        opciones = {
+            f"{a['nie']} - {a['nombre']}": a
+            for a in alumnos
+        }
 
-    opciones = {
-        f"{a['nie']} - {a['nombre']}": a
-        for a in alumnos
-    }
+        seleccionados = st.multiselect(
+            "Seleccione los alumnos a promover",
+            options=list(opciones.keys()),
+            default=list(opciones.keys()),
+        )
 
-    seleccionados = st.multiselect(
-        "Seleccione los alumnos a promover",
-        options=list(opciones.keys()),
-        default=list(opciones.keys()),
-    )
+        st.caption(
+            "Puede desmarcar cualquier alumno que no deba ser promovido."
+        )
 
-    st.caption(
-        "Puede desmarcar cualquier alumno que no deba ser promovido."
-    )
+        alumnos = [opciones[etiqueta] for etiqueta in seleccionados]
+
+    else:
+
+        # Las nóminas se leen antes de escribir: el orden de los
+        # grados no altera el resultado.
+        alumnos = []
+        resumen_grados = []
+
+        for grado in MAPA_PROMOCION:
+            alumnos_grado = candidatos(grado)
+            alumnos.extend(alumnos_grado)
+
+            resumen_grados.append(
+                {
+                    "Grado": grado,
+                    "Destino": MAPA_PROMOCION[grado],
+                    "Alumnos": len(alumnos_grado),
+                }
+            )
+
+        st.dataframe(
+            pd.DataFrame(resumen_grados),
+            hide_index=True,
+            width="stretch",
+        )
 
     st.divider()
 
-    cantidad = len(seleccionados)
+    cantidad = len(alumnos)
 
     if cantidad == 0:
         st.warning(
@@ -127,15 +372,80 @@ def mostrar_promocion(
         f"Se procesarán **{cantidad} alumnos**."
     )
 
-    if grado_destino == "Graduado":
+    graduandos = sum(
+        1 for a in alumnos
+        if a["grado_destino"] == "Graduado"
+    )
+
+    if graduandos:
         st.error(
-            "Los alumnos seleccionados quedarán con estado "
+            f"{graduandos} alumnos quedarán con estado "
             "'Graduado' y dejarán de aparecer en procesos operativos."
         )
-    else:
+
+    if cantidad > graduandos:
         st.warning(
-            f"Los alumnos seleccionados pasarán a "
-            f"**{grado_destino} - ciclo {ciclo_destino}**."
+            f"{cantidad - graduandos} alumnos pasarán al grado "
+            f"siguiente del **ciclo {ciclo_destino}**."
+        )
+
+    # ------------------------------------------
+    # PLAN Y VISTA PREVIA
+    # ------------------------------------------
+
+    fecha = obtener_fecha_hoy().strftime(
+        "%d/%m/%Y"
+    )
+
+    usuario = st.session_state.get(
+        "user_name",
+        "Administrador",
+    )
+
+    plan = [
+        {
+            "nie": a["nie"],
+            "nombre": a["nombre"],
+            "grado_origen": a["grado_origen"],
+            "grado_destino": a["grado_destino"],
+            "ciclo_destino": ciclo_destino,
+            "actualizacion": preparar_actualizacion(
+                a["grado_origen"],
+                a["grado_destino"],
+                ciclo_origen,
+                ciclo_destino,
+                fecha,
+                usuario,
+            ),
+        }
+        for a in alumnos
+    ]
+
+    with st.expander("👁️ Vista previa (simulación, no escribe datos)"):
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "NIE": paso["nie"],
+                        "Alumno": paso["nombre"],
+                        "Grado actual": paso["grado_origen"],
+                        "Nuevo grado": paso["actualizacion"].get(
+                            "grado_actual",
+                            "-"
+                        ),
+                        "Estado": paso["actualizacion"]["estado"],
+                        "Ciclo": paso["actualizacion"]["ciclo_lectivo"],
+                    }
+                    for paso in plan
+                ]
+            ),
+            hide_index=True,
+            width="stretch",
+        )
+
+        st.caption(
+            f"Se escribirán {len(plan)} documentos en "
+            f"{-(-len(plan) // TAM_BLOQUE_PROMOCION)} lotes."
         )
 
     confirmacion = st.text_input(
@@ -163,94 +473,33 @@ def mostrar_promocion(
             )
             return
 
-        promovidos = 0
-        graduados = 0
-        errores = []
-
-        fecha = obtener_fecha_hoy().strftime(
-            "%d/%m/%Y"
+        barra = st.progress(
+            0.0,
+            text="Procesando promoción..."
         )
 
-        usuario = st.session_state.get(
-            "user_name",
-            "Administrador",
-        )
+        def progreso(hechos, total):
+            barra.progress(
+                hechos / total,
+                text=f"Procesando promoción... {hechos}/{total}"
+            )
 
-        with st.spinner(
-            "Procesando promoción..."
-        ):
-            for etiqueta in seleccionados:
-                alumno = opciones[etiqueta]
-
-                nie = alumno["nie"]
-                data = alumno["data"]
-
-                try:
-                    historial = list(
-                        data.get(
-                            "historial_academico",
-                            []
-                        )
-                    )
-
-                    if grado_destino == "Graduado":
-                        historial.append(
-                            {
-                                "ciclo": ciclo_origen,
-                                "grado": grado_origen,
-                                "resultado": "Graduado",
-                                "fecha": fecha,
-                            }
-                        )
-
-                        update_data = {
-                            "estado": "Graduado",
-                            "activo": False,
-                            "fecha_baja": fecha,
-                            "motivo_baja": "Graduación",
-                            "baja_realizada_por": usuario,
-                            "ciclo_lectivo": ciclo_origen,
-                            "historial_academico": historial,
-                        }
-
-                        graduados += 1
-
-                    else:
-                        historial.append(
-                            {
-                                "ciclo": ciclo_origen,
-                                "grado": grado_origen,
-                                "resultado": "Promovido",
-                                "grado_destino": grado_destino,
-                                "fecha": fecha,
-                            }
-                        )
-
-                        update_data = {
-                            "grado_anterior": grado_origen,
-                            "grado_actual": grado_destino,
-                            "ciclo_lectivo": ciclo_destino,
-                            "estado": "Activo",
-                            "activo": True,
-                            "fecha_promocion": fecha,
-                            "promovido_por": usuario,
-                            "historial_academico": historial,
-                        }
-
-                        promovidos += 1
-
-                    db.collection(
-                        "alumnos"
-                    ).document(
-                        nie
-                    ).update(
-                        update_data
-                    )
-
-                except Exception as error:
-                    errores.append(
-                        f"{nie}: {error}"
-                    )
+        try:
+            promovidos, graduados, omitidos, errores = ejecutar_plan_promocion(
+                db,
+                plan,
+                checkpoint_ref,
+                progreso=progreso,
+            )
+
+        finally:
+            grados_afectados = set()
+
+            for paso in plan:
+                grados_afectados.add(paso["grado_origen"])
+                grados_afectados.add(paso["grado_destino"])
+
+            invalidar_alumnos_activos(*grados_afectados)
 
         st.success(
             "Proceso de promoción finalizado."
@@ -266,9 +515,18 @@ def mostrar_promocion(
                 f"🎓 Graduados: {graduados}"
             )
 
+        if omitidos:
+            st.warning(
+                f"{len(omitidos)} alumnos ya no existen o ya fueron "
+                f"promovidos o dados de baja, y se omitieron: "
+                f"{', '.join(omitidos)}"
+            )
+
         if errores:
             st.error(
-                f"Se encontraron {len(errores)} errores."
+                f"Se encontraron {len(errores)} errores. "
+                "Ejecute nuevamente la promoción para "
+                "continuar con los lotes pendientes."
             )
 
             for error in errores:
@@ -280,4 +538,4 @@ def mostrar_promocion(
             )
 
         time.sleep(2)
-        st.rerun()
\ No newline at end of file
+        st.rerun()